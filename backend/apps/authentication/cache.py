@@ -0,0 +1,69 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+DEFAULTS = {
+    "ALIAS": "default",
+    "TTL": 60,
+    "KEY_PREFIX": "jwt-user",
+}
+
+
+class TokenUserCache:
+    """
+    Short-TTL cache from an access token's ``jti`` to its authenticated user
+
+    Entries are stored in a Django cache alias (LocMemCache by default, which
+    is per process; point ALIAS at Redis/Memcached to share across workers).
+    Keys embed a per-user generation number, and saving or deleting a user
+    bumps it, so deactivations and password changes take effect immediately
+    instead of after TTL seconds.
+    """
+
+    def __init__(self, options=None):
+        self.configure(options)
+
+    def configure(self, options=None):
+        config = dict(DEFAULTS)
+        config.update(options or getattr(settings, "JWT_USER_CACHE", {}))
+        self.config = config
+
+    @property
+    def cache(self):
+        return caches[self.config["ALIAS"]]
+
+    def _generation_key(self, user_id):
+        return f"{self.config['KEY_PREFIX']}:gen:{user_id}"
+
+    def make_key(self, jti, user_id):
+        """
+        Build the cache key for a token; build it before loading the user so
+        that an invalidation in between orphans the loaded value
+        """
+        generation = self.cache.get(self._generation_key(user_id), 0)
+        return f"{self.config['KEY_PREFIX']}:{user_id}:{generation}:{jti}"
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, user, expires_at=None):
+        """Cache a user for at most TTL seconds and never past token expiry"""
+        ttl = self.config["TTL"]
+        if expires_at is not None:
+            ttl = min(ttl, int(expires_at - time.time()))
+        if ttl > 0:
+            self.cache.set(key, user, ttl)
+
+    def invalidate_user(self, user_id):
+        """Drop every cached token entry of a user"""
+        generation_key = self._generation_key(user_id)
+        self.cache.add(generation_key, 0, None)
+        try:
+            self.cache.incr(generation_key)
+        except ValueError:
+            self.cache.set(generation_key, 1, None)
+
+
+token_user_cache = TokenUserCache()
@@ -1,54 +1,109 @@
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
+from apps.core.log import get_logger
+from apps.core.timing import timing_phase
+from .cache import token_user_cache
 
 User = get_user_model()
 
+logger = get_logger("auth")
 
-class DebugJWTAuthentication(JWTAuthentication):
+# Attribute on the underlying HttpRequest holding the verified (user, token),
+# or the authentication error raised for the request's token
+VERIFIED_AUTH_ATTR = "_jwt_auth"
+
+
+def _http_request(request):
+    """Return the Django HttpRequest behind a DRF Request (or the request itself)"""
+    return getattr(request, "_request", request)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
     """
-    A custom JWT Authentication class for debugging purposes.
-    This extends the standard JWTAuthentication to add more debugging.
+    JWT authentication that verifies a bearer token once per request.
+
+    - The verified (user, token) pair is stored on the underlying
+      HttpRequest, so TenantMiddleware, DebugMiddleware and DRF share a
+      single verification
+    - Users are looked up through a short-TTL jti -> user cache, so an
+      authenticated request with a warm token runs no user query
     """
 
     def authenticate(self, request):
-        print("DEBUG JWT Auth: Attempting to authenticate")
+        http_request = _http_request(request)
+        verified = getattr(http_request, VERIFIED_AUTH_ATTR, None)
+        if isinstance(verified, Exception):
+            raise verified
+        if verified is not None:
+            return verified
 
+        with timing_phase("auth"):
+            return self._verify(request, http_request)
+
+    def _verify(self, request, http_request):
         header = self.get_header(request)
         if header is None:
-            print("DEBUG JWT Auth: No Auth header found")
             return None
 
         raw_token = self.get_raw_token(header)
         if raw_token is None:
-            print("DEBUG JWT Auth: No token found in header")
+            logger.debug("No token found in header")
             return None
 
-        print(f"DEBUG JWT Auth: Raw token found: {raw_token[:20]}...")
-
         try:
             validated_token = self.get_validated_token(raw_token)
-            print("DEBUG JWT Auth: Token validated successfully")
-            print(f"DEBUG JWT Auth: Token payload: {validated_token}")
-
             user = self.get_user(validated_token)
-            print(f"DEBUG JWT Auth: User retrieved: {user}, ID: {user.id}")
-
-            # Set user on request explicitly to ensure middleware can access it
-            request.auth_user = user
-
-            return (user, validated_token)
-        except InvalidToken as e:
-            print(f"DEBUG JWT Auth: Invalid token: {str(e)}")
+        except (InvalidToken, AuthenticationFailed) as e:
+            detail = e.detail.get("detail", e) if isinstance(e.detail, dict) else e
+            logger.info("JWT authentication failed: %s", detail)
+            # Remember the failure so later passes do not verify again
+            setattr(http_request, VERIFIED_AUTH_ATTR, e)
             raise
-        except AuthenticationFailed as e:
-            print(f"DEBUG JWT Auth: Authentication failed: {str(e)}")
-            raise
-        except Exception as e:
-            print(f"DEBUG JWT Auth: Other exception: {str(e)}")
+        except Exception:
+            logger.exception("Unexpected JWT authentication error")
             raise
 
-    def authenticate_header(self, request):
-        print("DEBUG JWT Auth: authenticate_header called")
-        return super().authenticate_header(request)
+        logger.debug(
+            "Token validated",
+            extra={"user_id": str(user.pk), "jti": validated_token.get("jti")},
+        )
+        verified = (user, validated_token)
+        setattr(http_request, VERIFIED_AUTH_ATTR, verified)
+        # Kept for code that reads the authenticated user off the request
+        http_request.auth_user = user
+        return verified
+
+    def get_user(self, validated_token):
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if jti is None or user_id is None:
+            return super().get_user(validated_token)
+
+        key = token_user_cache.make_key(jti, user_id)
+        user = token_user_cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            token_user_cache.set(key, user, validated_token.get("exp"))
+        return user
+
+
+# The former debugging backend; kept so existing settings keep working
+DebugJWTAuthentication = CachedJWTAuthentication
+
+
+def authenticate_request(request):
+    """
+    Authenticate a plain Django request from its bearer token
+
+    Returns the user, or None when the request carries no valid token.
+    The result is shared with DRF through the request, so the view does
+    not verify the token again.
+    """
+    try:
+        verified = CachedJWTAuthentication().authenticate(request)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    return verified[0] if verified else None
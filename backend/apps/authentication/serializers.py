@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from apps.tenants.models import Tenant, TenantUser
@@ -16,6 +18,55 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'is_active', 'date_joined']
 
 
+class TenantTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Token serializer that adds the user's details and tenants to the login
+    response and, optionally, a tenant/role snapshot to the token claims
+    """
+
+    @staticmethod
+    def get_memberships(user):
+        """Active tenant memberships of a user, loaded once per login"""
+        memberships = getattr(user, "_active_memberships", None)
+        if memberships is None:
+            memberships = list(
+                TenantUser.objects.filter(user=user, is_active=True).select_related(
+                    "tenant"
+                )
+            )
+            user._active_memberships = memberships
+        return memberships
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        if getattr(settings, "JWT_EMBED_TENANT_CLAIMS", False):
+            token["tenants"] = [
+                {
+                    "id": str(membership.tenant_id),
+                    "slug": membership.tenant.slug,
+                    "role": membership.role,
+                }
+                for membership in cls.get_memberships(user)
+            ]
+        return token
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+
+        from apps.tenants.serializers import TenantSerializer
+
+        # Add user details and tenant information to the response
+        data["user"] = UserSerializer(self.user).data
+        tenants_data = []
+        for membership in self.get_memberships(self.user):
+            tenant_data = TenantSerializer(membership.tenant).data
+            tenant_data["role"] = membership.role
+            tenants_data.append(tenant_data)
+        data["tenants"] = tenants_data
+        return data
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     """Serializer for user registration"""
     email = serializers.EmailField(
@@ -0,0 +1,14 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import token_user_cache
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_token_users(sender, instance, **kwargs):
+    """User changed (e.g. deactivated or new password): drop cached tokens"""
+    token_user_cache.invalidate_user(instance.pk)
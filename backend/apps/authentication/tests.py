@@ -1,3 +1,68 @@
 from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.core.cache import tenant_membership_cache
+from apps.tenants.models import Tenant, TenantUser
 
-# Create your tests here.
+User = get_user_model()
+
+
+class JWTAuthenticationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        tenant_membership_cache.clear()
+
+        self.user = User.objects.create_user(
+            email="test@example.com", password="password123"
+        )
+        self.tenant = Tenant.objects.create(
+            name="Test Restaurant", slug="test-restaurant", owner=self.user
+        )
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="owner")
+        self.client = APIClient()
+
+    def _authorize(self):
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_login_returns_user_tenants_and_claims(self):
+        """Test that login adds user details and a tenant snapshot"""
+        response = self.client.post(
+            "/api/auth/login/",
+            {"email": "test@example.com", "password": "password123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["user"]["email"], "test@example.com")
+        self.assertEqual(response.data["tenants"][0]["slug"], "test-restaurant")
+        self.assertEqual(response.data["tenants"][0]["role"], "owner")
+
+        claims = AccessToken(response.data["access"])
+        self.assertEqual(
+            claims["tenants"],
+            [{"id": str(self.tenant.id), "slug": "test-restaurant", "role": "owner"}],
+        )
+
+    def test_warm_request_runs_no_user_query(self):
+        """Test that a repeated token is verified once and served from cache"""
+        self._authorize()
+        response = self.client.get("/api/menu/categories/")
+        self.assertEqual(response.status_code, 200)
+
+        # Neither the user nor the (cached) category list hits the database
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/menu/categories/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_deactivated_user_is_rejected(self):
+        """Test that saving a user invalidates its cached tokens"""
+        self._authorize()
+        self.client.get("/api/menu/categories/")
+
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get("/api/menu/categories/")
+        self.assertEqual(response.status_code, 401)
@@ -13,50 +13,29 @@ import uuid
 from .serializers import (
     UserSerializer, 
     RegisterSerializer,
+    TenantTokenObtainPairSerializer,
     PasswordChangeSerializer,
     PasswordResetRequestSerializer,
     PasswordResetConfirmSerializer,
 )
 from .models import PasswordResetToken
+from apps.core.timing import TimedViewMixin
 
 User = get_user_model()
 
 
-class CustomTokenObtainPairView(TokenObtainPairView):
-    """Custom token obtain view to add user details to response"""
-    
-    def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        
-        if response.status_code == 200:
-            # Get user from request
-            email = request.data.get('email', '')
-            try:
-                user = User.objects.get(email=email)
-                # Add user details to the response
-                user_serializer = UserSerializer(user)
-                response.data['user'] = user_serializer.data
-                
-                # Add tenant information
-                from apps.tenants.models import TenantUser
-                from apps.tenants.serializers import TenantSerializer
-                
-                tenant_users = TenantUser.objects.filter(user=user, is_active=True)
-                tenants_data = []
-                
-                for tenant_user in tenant_users:
-                    tenant_data = TenantSerializer(tenant_user.tenant).data
-                    tenant_data['role'] = tenant_user.role
-                    tenants_data.append(tenant_data)
-                
-                response.data['tenants'] = tenants_data
-            except User.DoesNotExist:
-                pass
-                
-        return response
+class CustomTokenObtainPairView(TimedViewMixin, TokenObtainPairView):
+    """
+    Custom token obtain view to add user details to response
+
+    User and tenant details come from TenantTokenObtainPairSerializer, which
+    reuses the authenticated user and loads memberships in one query.
+    """
+
+    serializer_class = TenantTokenObtainPairSerializer
 
 
-class LogoutView(APIView):
+class LogoutView(TimedViewMixin, APIView):
     """Logout view to blacklist the refresh token"""
     permission_classes = [permissions.IsAuthenticated]
     
@@ -70,13 +49,13 @@ class LogoutView(APIView):
             return Response({"detail": "Error logging out."}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class RegisterView(generics.CreateAPIView):
+class RegisterView(TimedViewMixin, generics.CreateAPIView):
     """Register a new user"""
     permission_classes = [permissions.AllowAny]
     serializer_class = RegisterSerializer
 
 
-class UserDetailsView(generics.RetrieveUpdateAPIView):
+class UserDetailsView(TimedViewMixin, generics.RetrieveUpdateAPIView):
     """Get or update the authenticated user's details"""
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = UserSerializer
@@ -85,7 +64,7 @@ class UserDetailsView(generics.RetrieveUpdateAPIView):
         return self.request.user
 
 
-class PasswordChangeView(APIView):
+class PasswordChangeView(TimedViewMixin, APIView):
     """Change password for authenticated user"""
     permission_classes = [permissions.IsAuthenticated]
     
@@ -105,7 +84,7 @@ class PasswordChangeView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class PasswordResetRequestView(APIView):
+class PasswordResetRequestView(TimedViewMixin, APIView):
     """Request password reset via email"""
     permission_classes = [permissions.AllowAny]
     
@@ -140,7 +119,7 @@ class PasswordResetRequestView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class PasswordResetConfirmView(APIView):
+class PasswordResetConfirmView(TimedViewMixin, APIView):
     """Confirm password reset with token"""
     permission_classes = [permissions.AllowAny]
     
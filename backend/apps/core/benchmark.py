@@ -0,0 +1,681 @@
+"""
+Query-count and latency benchmarks of the API endpoints
+
+    python manage.py benchmark_api                    # compare with the baseline
+    python manage.py benchmark_api --update-baseline  # record a new baseline
+
+seed() creates synthetic tenants at a given Scale. run_benchmarks() sends
+every scenario's request through the full stack: the Django test client,
+all middleware (TenantMiddleware included) and JWT authentication with a
+real bearer token and X-Tenant-Slug header. Per endpoint it records:
+
+- queries: the most queries run by any measured request
+- p50_ms / p95_ms: latency of the measured requests
+- alloc_kb: peak memory allocated while handling one request (tracemalloc)
+
+Each scenario is sent once to warm caches before it is measured. Work a
+scenario does to prepare a request (e.g. creating the ticket a bump
+updates) happens before the clock starts and is not counted.
+
+compare() reports endpoints whose query count grew, or whose latency or
+allocations grew beyond a tolerance. Every named API route needs a
+scenario (or an entry in UNMEASURED), so a new endpoint without a
+benchmark fails the run.
+"""
+
+import math
+import time
+import tracemalloc
+import uuid
+from collections import namedtuple
+from datetime import timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.authentication.models import PasswordResetToken
+from apps.kitchen.models import KitchenTicket
+from apps.management.table.models import RestaurantTable
+from apps.menu.models import Category, MenuItem, MenuItemAddon, MenuItemVariant
+from apps.pos.models import POSSession
+from apps.sales.models import Order
+from apps.settings.counters.models import Counter
+from apps.settings.vat.models import VatTax
+from apps.staff.models import StaffProfile
+from apps.tenants.models import Tenant, TenantUser
+from .models import Notification, TenantSetting
+from .notifications import create_notifications
+from .testing import jwt_client
+
+User = get_user_model()
+
+PASSWORD = "Bench-pass-2024"
+
+# Rows seeded per tenant; variants are per menu item, orders are rung up
+# through the checkout endpoint so they carry lines, rollups and tickets
+Scale = namedtuple(
+    "Scale",
+    "tenants categories items variants counters tables staff orders notifications",
+    defaults=(2, 10, 200, 2, 4, 30, 10, 50, 50),
+)
+
+# A request to send: body is JSON unless format says otherwise
+Request = namedtuple("Request", "path body format", defaults=(None, "json"))
+
+# An endpoint benchmark: build(data) returns the Request to measure
+Scenario = namedtuple("Scenario", "method route build")
+
+# Named API routes deliberately left out of the benchmarks, with the reason
+UNMEASURED = {
+    "logout": "blacklisting needs rest_framework_simplejwt.token_blacklist, "
+    "which is not installed, so every logout is a 400",
+}
+
+# Absolute slack added to the relative tolerance, so that noise on very
+# fast or very small requests is not reported as a regression
+LATENCY_SLACK_MS = 2.0
+ALLOC_SLACK_KB = 64.0
+
+
+class BenchmarkError(Exception):
+    """A scenario's request did not succeed"""
+
+
+def scenario_key(scenario):
+    return f"{scenario.method.upper()} {scenario.route}"
+
+
+def _uid():
+    return uuid.uuid4().hex[:12]
+
+
+# Seeding
+
+
+def seed(scale=Scale()):
+    """
+    Create scale.tenants synthetic tenants; returns the first one's data
+    (tenant, owner and the rows scenarios address), the rest only add volume
+    """
+    tenants = [_seed_tenant(scale, index) for index in range(scale.tenants)]
+    return tenants[0]
+
+
+def _seed_tenant(scale, index):
+    user = User.objects.create_user(
+        email=f"owner{index}@bench.example.com",
+        password=PASSWORD,
+        first_name="Bench",
+        last_name=f"Owner {index}",
+        # Staff, so the process-wide metrics endpoint can be measured too
+        is_staff=index == 0,
+    )
+    tenant = Tenant.objects.create(
+        name=f"Bench Restaurant {index}", slug=f"bench-{index}", owner=user
+    )
+    TenantUser.objects.create(tenant=tenant, user=user, role="owner")
+    TenantSetting.objects.update_or_create(
+        tenant=tenant, defaults={"service_charge_percentage": 10}
+    )
+    vat = VatTax.objects.create(tenant=tenant, name="VAT", rate=5)
+
+    categories = Category.objects.bulk_create(
+        Category(tenant=tenant, name=f"Category {n}")
+        for n in range(max(scale.categories, 1))
+    )
+    items = MenuItem.objects.bulk_create(
+        MenuItem(
+            tenant=tenant,
+            category=categories[n % len(categories)],
+            name=f"Item {n}",
+            price=Decimal(5 + n % 20),
+            cost=Decimal(2 + n % 8),
+        )
+        for n in range(max(scale.items, 1))
+    )
+    variants = MenuItemVariant.objects.bulk_create(
+        MenuItemVariant(
+            menu_item=item,
+            name=f"Size {v}",
+            price=item.price + v,
+            cost=item.cost + v,
+        )
+        for item in items
+        for v in range(scale.variants)
+    )
+    addons = MenuItemAddon.objects.bulk_create(
+        MenuItemAddon(tenant=tenant, name=f"Addon {n}", price=Decimal("1.50"))
+        for n in range(3)
+    )
+    counters = Counter.objects.bulk_create(
+        Counter(tenant=tenant, name=f"Counter {n}")
+        for n in range(max(scale.counters, 1))
+    )
+    Counter.items.through.objects.bulk_create(
+        Counter.items.through(
+            counter_id=counters[n % len(counters)].pk, menuitem_id=item.pk
+        )
+        for n, item in enumerate(items)
+    )
+    tables = RestaurantTable.objects.bulk_create(
+        RestaurantTable(tenant=tenant, number=f"T{n}", capacity=2 + n % 6)
+        for n in range(max(scale.tables, 1))
+    )
+    staff = StaffProfile.objects.bulk_create(
+        StaffProfile(
+            tenant=tenant,
+            name=f"Staff {n}",
+            position=("waiter", "chef")[n % 2],
+            email=f"staff{n}.{index}@bench.example.com",
+            phone_number=f"555{n:07d}",
+        )
+        for n in range(max(scale.staff, 1))
+    )
+    create_notifications(
+        Notification(tenant=tenant, title=f"Notice {n}", message="Benchmark notice")
+        for n in range(scale.notifications)
+    )
+    session = POSSession.objects.create(
+        tenant=tenant, opened_by=user, opening_balance=Decimal("100.00")
+    )
+
+    data = SimpleNamespace(
+        user=user,
+        tenant=tenant,
+        vat=vat,
+        categories=categories,
+        items=items,
+        variants=variants,
+        addons=addons,
+        counters=counters,
+        tables=tables,
+        staff=staff,
+        session=session,
+    )
+    client = jwt_client(user, tenant.slug)
+    for n in range(max(scale.orders, 1)):
+        request = Request("/api/sales/orders/", _order_body(data, n))
+        _check(_call(client, "post", request), "seeding orders")
+    data.order = Order.objects.filter(tenant=tenant).latest("created_at")
+    return data
+
+
+def _order_body(data, n):
+    items = data.items
+    lines = [
+        {"menu_item": str(items[(n + offset) % len(items)].pk), "quantity": 1 + offset}
+        for offset in range(3)
+    ]
+    if data.variants:
+        variant = data.variants[n % len(data.variants)]
+        lines.append(
+            {
+                "menu_item": str(variant.menu_item_id),
+                "variant": str(variant.pk),
+                "addons": [str(data.addons[0].pk)],
+                "quantity": 1,
+            }
+        )
+    return {
+        "session": str(data.session.pk),
+        "counter": str(data.counters[n % len(data.counters)].pk),
+        "table": str(data.tables[n % len(data.tables)].pk),
+        "lines": lines,
+        "payments": [{"method": ("cash", "card")[n % 2], "amount": "0.00"}],
+    }
+
+
+# Scenarios
+
+SCENARIOS = []
+
+
+def scenario(method, route):
+    """Register a function building the Request of an endpoint benchmark"""
+
+    def register(build):
+        SCENARIOS.append(Scenario(method, route, build))
+        return build
+
+    return register
+
+
+@scenario("post", "token_obtain_pair")
+def _(data):
+    return Request("/api/auth/login/", {"email": data.user.email, "password": PASSWORD})
+
+
+@scenario("post", "token_refresh")
+def _(data):
+    return Request(
+        "/api/auth/login/refresh/", {"refresh": str(RefreshToken.for_user(data.user))}
+    )
+
+
+@scenario("post", "token_verify")
+def _(data):
+    token = RefreshToken.for_user(data.user).access_token
+    return Request("/api/token/verify/", {"token": str(token)})
+
+
+@scenario("post", "register")
+def _(data):
+    return Request(
+        "/api/auth/register/",
+        {
+            "email": f"{_uid()}@bench.example.com",
+            "password": PASSWORD,
+            "password_confirm": PASSWORD,
+            "first_name": "New",
+            "last_name": "User",
+        },
+    )
+
+
+@scenario("get", "user_details")
+def _(data):
+    return Request("/api/auth/user/")
+
+
+@scenario("post", "password_change")
+def _(data):
+    # Changes the password to itself, so later logins keep working
+    return Request(
+        "/api/auth/password/change/",
+        {
+            "old_password": PASSWORD,
+            "new_password": PASSWORD,
+            "confirm_password": PASSWORD,
+        },
+    )
+
+
+@scenario("post", "password_reset")
+def _(data):
+    return Request("/api/auth/password/reset/", {"email": data.user.email})
+
+
+@scenario("post", "password_reset_confirm")
+def _(data):
+    token = PasswordResetToken.objects.create(
+        user=data.user, expires_at=timezone.now() + timedelta(hours=1)
+    )
+    return Request(
+        "/api/auth/password/reset/confirm/",
+        {
+            "token": str(token.token),
+            "new_password": PASSWORD,
+            "confirm_password": PASSWORD,
+        },
+    )
+
+
+@scenario("get", "tenant-list")
+def _(data):
+    return Request("/api/tenants/")
+
+
+@scenario("get", "tenant-detail")
+def _(data):
+    return Request(f"/api/tenants/{data.tenant.pk}/")
+
+
+@scenario("get", "tenant-user-list")
+def _(data):
+    return Request(f"/api/tenants/{data.tenant.pk}/users/")
+
+
+@scenario("get", "tenant-user-detail")
+def _(data):
+    membership = TenantUser.objects.get(tenant=data.tenant, user=data.user)
+    return Request(f"/api/tenants/{data.tenant.pk}/users/{membership.pk}/")
+
+
+@scenario("get", "category-list")
+def _(data):
+    return Request("/api/menu/categories/")
+
+
+@scenario("get", "category-detail")
+def _(data):
+    return Request(f"/api/menu/categories/{data.categories[0].pk}/")
+
+
+@scenario("post", "category-bulk")
+def _(data):
+    return Request(
+        "/api/menu/categories/bulk/", [{"name": f"Bulk {_uid()}"} for _ in range(20)]
+    )
+
+
+@scenario("get", "menu-item-list")
+def _(data):
+    return Request("/api/menu/items/")
+
+
+@scenario("get", "menu-item-detail")
+def _(data):
+    return Request(f"/api/menu/items/{data.items[0].pk}/")
+
+
+@scenario("post", "menu-item-bulk")
+def _(data):
+    category = str(data.categories[0].pk)
+    return Request(
+        "/api/menu/items/bulk/",
+        [
+            {"name": f"Bulk {_uid()}", "price": "4.50", "category_id": category}
+            for _ in range(20)
+        ],
+    )
+
+
+@scenario("post", "menu-item-variant-bulk")
+def _(data):
+    item = str(data.items[0].pk)
+    return Request(
+        "/api/menu/variants/bulk/",
+        [{"menu_item": item, "name": f"Bulk {_uid()}", "price": "5.00"} for _ in range(20)],
+    )
+
+
+@scenario("post", "menu-item-import-menu")
+def _(data):
+    rows = "".join(f"Imported,Import {_uid()},6.00\n" for _ in range(20))
+    upload = SimpleUploadedFile(
+        "menu.csv", f"category,name,price\n{rows}".encode(), content_type="text/csv"
+    )
+    return Request("/api/menu/items/import/", {"file": upload}, "multipart")
+
+
+@scenario("get", "restaurant-table-list")
+def _(data):
+    return Request("/api/management/table/")
+
+
+@scenario("get", "restaurant-table-detail")
+def _(data):
+    return Request(f"/api/management/table/{data.tables[0].pk}/")
+
+
+@scenario("post", "restaurant-table-bulk")
+def _(data):
+    return Request(
+        "/api/management/table/bulk/", [{"number": f"B{_uid()}"} for _ in range(20)]
+    )
+
+
+@scenario("get", "counter-list")
+def _(data):
+    return Request("/api/settings/counters/")
+
+
+@scenario("get", "counter-detail")
+def _(data):
+    return Request(f"/api/settings/counters/{data.counters[0].pk}/")
+
+
+@scenario("get", "vat-tax-list")
+def _(data):
+    return Request("/api/settings/vat/")
+
+
+@scenario("get", "vat-tax-detail")
+def _(data):
+    return Request(f"/api/settings/vat/{data.vat.pk}/")
+
+
+@scenario("get", "staff-list")
+def _(data):
+    return Request("/api/staff/")
+
+
+@scenario("get", "staff-detail")
+def _(data):
+    return Request(f"/api/staff/{data.staff[0].pk}/")
+
+
+@scenario("get", "pos-bootstrap")
+def _(data):
+    return Request("/api/pos/bootstrap/")
+
+
+@scenario("get", "pos-session-summary")
+def _(data):
+    return Request(f"/api/pos/session-summary/{data.session.pk}/")
+
+
+@scenario("post", "pos-close-session")
+def _(data):
+    session = POSSession.objects.create(tenant=data.tenant, opened_by=data.user)
+    return Request(
+        "/api/pos/close-session/",
+        {"session": str(session.pk), "closing_balance": "0.00"},
+    )
+
+
+@scenario("get", "order-list")
+def _(data):
+    return Request("/api/sales/orders/")
+
+
+@scenario("post", "order-list")
+def _(data):
+    data.checkouts = getattr(data, "checkouts", 0) + 1
+    return Request("/api/sales/orders/", _order_body(data, data.checkouts))
+
+
+@scenario("get", "order-detail")
+def _(data):
+    return Request(f"/api/sales/orders/{data.order.pk}/")
+
+
+@scenario("get", "sync-changes")
+def _(data):
+    return Request("/api/sync/changes/")
+
+
+@scenario("get", "export-list")
+def _(data):
+    return Request("/api/exports/")
+
+
+@scenario("get", "export")
+def _(data):
+    return Request("/api/exports/menu_items.csv")
+
+
+@scenario("get", "kitchen-ticket-list")
+def _(data):
+    return Request("/api/kitchen/tickets/")
+
+
+@scenario("get", "kitchen-ticket-detail")
+def _(data):
+    ticket = KitchenTicket.objects.filter(order=data.order).first()
+    return Request(f"/api/kitchen/tickets/{ticket.pk}/")
+
+
+def _new_ticket(data):
+    return KitchenTicket.objects.create(
+        tenant=data.tenant, order=data.order, counter=data.counters[0], lines=[]
+    )
+
+
+@scenario("post", "kitchen-ticket-ack")
+def _(data):
+    return Request(f"/api/kitchen/tickets/{_new_ticket(data).pk}/ack/")
+
+
+@scenario("post", "kitchen-ticket-bump")
+def _(data):
+    return Request(f"/api/kitchen/tickets/{_new_ticket(data).pk}/bump/")
+
+
+@scenario("get", "notification-list")
+def _(data):
+    return Request("/api/notifications/")
+
+
+@scenario("get", "notification-unread-count")
+def _(data):
+    return Request("/api/notifications/unread-count/")
+
+
+@scenario("post", "notification-mark-read")
+def _(data):
+    return Request("/api/notifications/mark-read/", {"all": True})
+
+
+@scenario("get", "sales-report")
+def _(data):
+    return Request("/api/reports/sales/?dimension=item")
+
+
+@scenario("get", "margin-report")
+def _(data):
+    return Request("/api/reports/margins/?dimension=item")
+
+
+@scenario("get", "server-timing-metrics")
+def _(data):
+    return Request("/api/metrics/timing/")
+
+
+def api_routes():
+    """Names of the routes served under /api/ (DRF's api-root views aside)"""
+    names = set()
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns, route)
+            elif route.startswith("api/") and pattern.name not in (None, "api-root"):
+                names.add(pattern.name)
+
+    walk(get_resolver().url_patterns, "")
+    return names
+
+
+def unmeasured_routes(scenarios=None):
+    """API routes that have neither a scenario nor an UNMEASURED entry"""
+    measured = {s.route for s in (scenarios or SCENARIOS)}
+    return sorted(api_routes() - measured - set(UNMEASURED))
+
+
+# Measuring
+
+
+def _call(client, method, request):
+    response = getattr(client, method)(request.path, request.body, format=request.format)
+    if response.streaming:
+        # Streamed bodies (exports) are produced while they are read
+        b"".join(response.streaming_content)
+    return response
+
+
+def _check(response, what):
+    if response.status_code >= 400:
+        raise BenchmarkError(
+            f"{what}: HTTP {response.status_code} {response.content[:500]!r}"
+        )
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+def measure(client, data, scenario, iterations):
+    """Query count, latency percentiles and peak allocations of one scenario"""
+    key = scenario_key(scenario)
+    _check(_call(client, scenario.method, scenario.build(data)), key)
+
+    timings = []
+    queries = 0
+    for _ in range(iterations):
+        request = scenario.build(data)
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = _call(client, scenario.method, request)
+            elapsed = time.perf_counter() - started
+        _check(response, key)
+        timings.append(elapsed * 1000)
+        queries = max(queries, len(captured.captured_queries))
+
+    request = scenario.build(data)
+    tracemalloc.start()
+    try:
+        _check(_call(client, scenario.method, request), key)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "queries": queries,
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "alloc_kb": round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(data, iterations=20, scenarios=None, on_result=None):
+    """
+    Measure scenarios (default: all) against seeded data; returns
+    {"METHOD route": result}. on_result(key, result) is called as each
+    scenario finishes.
+    """
+    client = jwt_client(data.user, data.tenant.slug)
+    results = {}
+    for scenario in scenarios or SCENARIOS:
+        key = scenario_key(scenario)
+        results[key] = measure(client, data, scenario, max(iterations, 1))
+        if on_result:
+            on_result(key, results[key])
+    return results
+
+
+def compare(results, baseline, tolerance=0.5, latency=True):
+    """
+    Regressions of results against baseline endpoint results, as messages
+
+    Query counts are deterministic, so any increase is a regression.
+    Allocations, and latency unless latency is False, regress when they
+    exceed the baseline by more than `tolerance` (0.5 = 50%) plus a small
+    absolute slack; for latency both p50 and p95 must, so that one slow
+    outlier is not reported.
+    """
+    regressions = []
+    for key, result in results.items():
+        expected = baseline.get(key)
+        if expected is None:
+            continue
+        if result["queries"] > expected["queries"]:
+            regressions.append(
+                f"{key}: {result['queries']} queries (baseline {expected['queries']})"
+            )
+        slower = all(
+            result[p] > expected[p] * (1 + tolerance) + LATENCY_SLACK_MS
+            for p in ("p50_ms", "p95_ms")
+        )
+        if latency and slower:
+            regressions.append(
+                f"{key}: p50/p95 {result['p50_ms']}/{result['p95_ms']} ms "
+                f"(baseline {expected['p50_ms']}/{expected['p95_ms']} ms)"
+            )
+        limit = expected["alloc_kb"] * (1 + tolerance) + ALLOC_SLACK_KB
+        if result["alloc_kb"] > limit:
+            regressions.append(
+                f"{key}: {result['alloc_kb']} KB allocated "
+                f"(baseline {expected['alloc_kb']} KB)"
+            )
+    return regressions
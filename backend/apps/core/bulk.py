@@ -0,0 +1,333 @@
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+_current_batch = ContextVar("bulk_write_batch", default=None)
+
+
+class BulkWriteBatch:
+    """
+    Per-row work that signal receivers defer while a bulk write runs,
+    flushed once per key with all deferred items when the write ends
+    """
+
+    def __init__(self):
+        self._pending = {}
+
+    def defer(self, key, flush, item):
+        """Queue `item`; `flush(items)` is called once with every item of `key`"""
+        self._pending.setdefault(key, (flush, []))[1].append(item)
+
+    def flush(self):
+        for flush, items in self._pending.values():
+            flush(items)
+
+
+def current_bulk_batch():
+    """The bulk write in progress in this context, or None"""
+    return _current_batch.get()
+
+
+@contextmanager
+def bulk_write_batch():
+    """Collect deferred per-row work of the block and flush it at the end"""
+    batch = BulkWriteBatch()
+    token = _current_batch.set(batch)
+    try:
+        yield batch
+        batch.flush()
+    finally:
+        _current_batch.reset(token)
+
+
+class BulkActionsMixin:
+    """
+    Adds a `bulk/` list route to a tenant model viewset:
+
+    - POST: create an array of rows
+    - PATCH: update an array of rows, each identified by "id"
+    - DELETE: delete {"ids": [...]}
+
+    A batch is validated as a whole with set-based queries (one per related
+    model and unique field, never one per row) and applied in a single
+    transaction with bulk_create / bulk_update; if any row is invalid nothing
+    is written and the errors come back keyed by row position.
+
+    - bulk_serializer_class: row serializer; must not declare fields or
+      validators that query the database per row (use plain UUID fields
+      for relations and list them in bulk_tenant_relations instead)
+    - bulk_tenant_relations: {attribute: model} foreign key ids that must
+      belong to the request's tenant, e.g. {"category_id": Category}
+    - bulk_unique_fields: fields unique per tenant, e.g. ("name",), or
+      tuples of fields unique together, e.g. (("menu_item_id", "name"),)
+    """
+
+    bulk_serializer_class = None
+    bulk_tenant_relations = {}
+    bulk_unique_fields = ()
+    bulk_max_rows = 5000
+    bulk_batch_size = 500
+
+    @property
+    def bulk_model(self):
+        return self.bulk_serializer_class.Meta.model
+
+    def bulk_queryset(self):
+        """All rows of the bulk model belonging to the request's tenant"""
+        return self.bulk_model.objects.filter(tenant=self.request.tenant)
+
+    @action(detail=False, methods=["post", "patch", "delete"], url_path="bulk")
+    def bulk(self, request, *args, **kwargs):
+        if not hasattr(request, "tenant"):
+            raise ValidationError(
+                {"detail": "No active tenant found. Set X-Tenant-Slug header."}
+            )
+        if request.method == "POST":
+            return self.bulk_create(request)
+        if request.method == "PATCH":
+            return self.bulk_update(request)
+        return self.bulk_destroy(request)
+
+    # Hooks
+
+    def bulk_build(self, row):
+        """Build an unsaved instance from a validated create row"""
+        return self.bulk_model(tenant=self.request.tenant, **row)
+
+    def bulk_after_create(self, instances, rows):
+        """Create dependent rows once the batch has been inserted"""
+
+    def bulk_delete(self, queryset):
+        """Delete the rows of a batch"""
+        queryset.delete()
+
+    def bulk_applied(self):
+        """Called inside the transaction after any bulk write"""
+
+    # Actions
+
+    def bulk_create(self, request):
+        rows = self._bulk_rows(request.data)
+        valid, errors = self._validate_rows(rows)
+        self._check_relations(valid, errors)
+        self._check_unique(valid, errors)
+        self._raise_errors(errors)
+
+        validated = [row for _, row in valid]
+        instances = [self.bulk_build(dict(row)) for row in validated]
+        with self._bulk_transaction():
+            self.bulk_model.objects.bulk_create(
+                instances, batch_size=self.bulk_batch_size
+            )
+            self.bulk_after_create(instances, validated)
+            self.bulk_applied()
+
+        return Response(
+            {"created": len(instances), "ids": [str(obj.pk) for obj in instances]},
+            status=status.HTTP_201_CREATED,
+        )
+
+    def bulk_update(self, request):
+        rows = self._bulk_rows(request.data)
+        ids, errors = self._parse_ids(
+            [row.get("id") if isinstance(row, dict) else None for row in rows]
+        )
+        self._raise_errors(errors)
+
+        instances = self.bulk_queryset().in_bulk(ids)
+        valid, errors = self._validate_rows(rows, partial=True)
+        for index, row_id in enumerate(ids):
+            if row_id not in instances:
+                errors.setdefault(index, {})["id"] = ["Not found."]
+        for index in self._duplicates(ids):
+            errors.setdefault(index, {})["id"] = ["Duplicate id in batch."]
+
+        valid = [(index, row) for index, row in valid if index not in errors]
+        self._check_relations(valid, errors)
+        self._check_unique(valid, errors, row_ids=ids, instances=instances)
+        self._raise_errors(errors)
+
+        now = timezone.now()
+        fields = {"updated_at"}
+        changed = []
+        for index, row in valid:
+            instance = instances[ids[index]]
+            for field, value in row.items():
+                setattr(instance, field, value)
+                fields.add(field)
+            # bulk_update does not apply auto_now
+            instance.updated_at = now
+            changed.append(instance)
+
+        with self._bulk_transaction():
+            self.bulk_model.objects.bulk_update(
+                changed, sorted(fields), batch_size=self.bulk_batch_size
+            )
+            self.bulk_applied()
+
+        return Response({"updated": len(changed)})
+
+    def bulk_destroy(self, request):
+        ids = request.data.get("ids") if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not ids:
+            raise ValidationError({"ids": ["Provide a non-empty list of ids."]})
+        self._check_size(ids)
+        ids, errors = self._parse_ids(ids)
+        self._raise_errors(errors)
+
+        queryset = self.bulk_queryset().filter(pk__in=ids)
+        found = set(queryset.values_list("pk", flat=True))
+        errors = {
+            index: {"id": ["Not found."]}
+            for index, row_id in enumerate(ids)
+            if row_id not in found
+        }
+        self._raise_errors(errors)
+
+        # Delete signals still fire per row; receivers that see a bulk write
+        # batch defer their work to it instead of querying per row
+        with transaction.atomic():
+            with bulk_write_batch():
+                self.bulk_delete(queryset)
+            self.bulk_applied()
+
+        return Response({"deleted": len(found)})
+
+    @contextmanager
+    def _bulk_transaction(self):
+        """
+        Apply a batch atomically; a constraint violation that slipped past
+        validation (e.g. a concurrent write) rolls it back as a 400
+        """
+        try:
+            with transaction.atomic():
+                yield
+        except IntegrityError:
+            raise ValidationError(
+                {"detail": "The batch conflicts with existing rows; nothing was saved."}
+            )
+
+    # Validation helpers
+
+    def _check_size(self, rows):
+        if len(rows) > self.bulk_max_rows:
+            raise ValidationError(
+                {"detail": f"A batch may contain at most {self.bulk_max_rows} rows."}
+            )
+
+    def _bulk_rows(self, data):
+        if not isinstance(data, list) or not data:
+            raise ValidationError({"detail": "Expected a non-empty list of rows."})
+        self._check_size(data)
+        return data
+
+    def _parse_ids(self, values):
+        """UUIDs of a batch, with errors for missing or malformed ones"""
+        ids = []
+        errors = {}
+        for index, value in enumerate(values):
+            try:
+                ids.append(uuid.UUID(str(value)))
+            except ValueError:
+                ids.append(None)
+                errors[index] = {"id": ["A valid id is required."]}
+        return ids, errors
+
+    def _validate_rows(self, rows, partial=False):
+        """Field-level validation of every row; returns (index, row) pairs and errors"""
+        valid = []
+        errors = {}
+        for index, row in enumerate(rows):
+            serializer = self.bulk_serializer_class(
+                data=row, partial=partial, context=self.get_serializer_context()
+            )
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors[index] = serializer.errors
+        return valid, errors
+
+    def _check_relations(self, valid, errors):
+        """Foreign key ids must belong to the tenant: one query per relation"""
+        for field, model in self.bulk_tenant_relations.items():
+            ids = {row[field] for _, row in valid if row.get(field)}
+            if not ids:
+                continue
+            existing = set(
+                model.objects.filter(
+                    tenant=self.request.tenant, pk__in=ids
+                ).values_list("pk", flat=True)
+            )
+            for index, row in valid:
+                if row.get(field) and row[field] not in existing:
+                    errors.setdefault(index, {})[field.removesuffix("_id")] = [
+                        "Does not exist for this tenant."
+                    ]
+
+    def _check_unique(self, valid, errors, row_ids=None, instances=None):
+        """
+        Unique fields must not repeat in the batch nor clash with other rows;
+        rows being updated may keep their own value. Fields of a unique
+        tuple that an update leaves out keep the instance's value; errors
+        are reported on the tuple's last field.
+        """
+        for unique in self.bulk_unique_fields:
+            fields = unique if isinstance(unique, tuple) else (unique,)
+            rows = []
+            for index, row in valid:
+                if not any(field in row for field in fields):
+                    continue
+                instance = instances[row_ids[index]] if instances else None
+                if instance is None and not all(field in row for field in fields):
+                    continue
+                rows.append((index, tuple(
+                    row[field] if field in row else getattr(instance, field)
+                    for field in fields
+                )))
+            if not rows:
+                continue
+            exclude_ids = [row_ids[index] for index, _ in rows] if row_ids else []
+            for position in self._duplicates(value for _, value in rows):
+                errors.setdefault(rows[position][0], {})[fields[-1]] = [
+                    "Duplicate value in batch."
+                ]
+
+            # One query for the values of each field; the combinations are
+            # matched here
+            taken = set(
+                self.bulk_queryset()
+                .filter(**{
+                    f"{field}__in": {value[position] for _, value in rows}
+                    for position, field in enumerate(fields)
+                })
+                .exclude(pk__in=exclude_ids)
+                .values_list(*fields)
+            )
+            for index, value in rows:
+                if value in taken:
+                    errors.setdefault(index, {})[fields[-1]] = [
+                        "Already exists for this tenant."
+                    ]
+
+    @staticmethod
+    def _duplicates(values):
+        """Positions of values that already appeared earlier in the sequence"""
+        seen = set()
+        duplicates = []
+        for index, value in enumerate(values):
+            if value in seen:
+                duplicates.append(index)
+            seen.add(value)
+        return duplicates
+
+    def _raise_errors(self, errors):
+        if errors:
+            raise ValidationError({"errors": dict(sorted(errors.items()))})
@@ -0,0 +1,189 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from apps.tenants.models import TenantUser
+
+
+# Resolved tenant context for a (user, tenant slug) pair.
+# ``tenant`` and ``role`` are None when the slug did not select a tenant;
+# ``tenant_count`` lets the middleware tell "no tenants" from "ambiguous".
+TenantMembership = namedtuple("TenantMembership", ["tenant", "role", "tenant_count"])
+
+DEFAULTS = {
+    "LOCAL_MAXSIZE": 1024,
+    "LOCAL_TTL": 30,
+    "SHARED_ALIAS": None,
+    "SHARED_TTL": 300,
+    "KEY_PREFIX": "tenant-membership",
+}
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU cache with per-entry expiry
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TenantMembershipCache:
+    """
+    Two-tier cache of resolved tenant memberships keyed by (user_id, tenant_slug)
+
+    - Local tier: bounded in-process LRU, always enabled
+    - Shared tier: optional Django cache alias (e.g. Redis/Memcached) so that
+      every worker sees the same entries and invalidations
+
+    Invalidation is per user: each user has a generation number that is part
+    of every key, so bumping it orphans all of that user's entries at once.
+    Without a shared tier, invalidation only reaches the current process and
+    other workers converge after LOCAL_TTL seconds.
+    """
+
+    def __init__(self, options=None):
+        self.configure(options)
+
+    def configure(self, options=None):
+        config = dict(DEFAULTS)
+        config.update(options or getattr(settings, "TENANT_MEMBERSHIP_CACHE", {}))
+        self.config = config
+        self.local = LRUCache(config["LOCAL_MAXSIZE"], config["LOCAL_TTL"])
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self):
+        alias = self.config["SHARED_ALIAS"]
+        return caches[alias] if alias else None
+
+    def _generation_key(self, user_id):
+        return f"{self.config['KEY_PREFIX']}:gen:{user_id}"
+
+    def _generation(self, user_id):
+        shared = self.shared
+        if shared is not None:
+            return shared.get(self._generation_key(user_id), 0)
+        return self._generations.get(user_id, 0)
+
+    def make_key(self, user_id, tenant_slug):
+        """
+        Build the cache key for a lookup
+
+        The key embeds the user's current generation, so callers should build
+        it once *before* loading from the database; an invalidation that lands
+        in between then orphans the stale value instead of publishing it.
+        """
+        generation = self._generation(user_id)
+        return f"{self.config['KEY_PREFIX']}:{user_id}:{generation}:{tenant_slug or ''}"
+
+    def get(self, key):
+        membership = self.local.get(key)
+        if membership is not None:
+            return membership
+
+        shared = self.shared
+        if shared is not None:
+            membership = shared.get(key)
+            if membership is not None:
+                self.local.set(key, membership)
+        return membership
+
+    def set(self, key, membership):
+        self.local.set(key, membership)
+        shared = self.shared
+        if shared is not None:
+            shared.set(key, membership, self.config["SHARED_TTL"])
+
+    def invalidate_user(self, user_id):
+        """Drop every cached membership for a user"""
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+        shared = self.shared
+        if shared is not None:
+            generation_key = self._generation_key(user_id)
+            # Never expire the generation; an expired counter would restart
+            # at 0 and could resurrect entries still alive in the shared tier
+            shared.add(generation_key, 0, None)
+            try:
+                shared.incr(generation_key)
+            except ValueError:
+                shared.set(generation_key, 1, None)
+
+    def clear(self):
+        """Drop the local tier (used by tests and on configuration changes)"""
+        self.local.clear()
+        with self._lock:
+            self._generations.clear()
+
+
+tenant_membership_cache = TenantMembershipCache()
+
+
+def load_tenant_membership(user, tenant_slug=None):
+    """
+    Resolve the tenant a user is working in with a single query
+
+    Mirrors the rules of TenantMiddleware: a user with exactly one active
+    tenant always gets that tenant; a user with several must pick one by slug.
+    """
+    memberships = list(
+        TenantUser.objects.filter(user=user, is_active=True).select_related("tenant")
+    )
+    count = len(memberships)
+
+    if count == 1:
+        return TenantMembership(memberships[0].tenant, memberships[0].role, count)
+
+    if tenant_slug:
+        for membership in memberships:
+            if membership.tenant.slug == tenant_slug:
+                return TenantMembership(membership.tenant, membership.role, count)
+
+    return TenantMembership(None, None, count)
+
+
+def resolve_tenant_membership(user, tenant_slug=None):
+    """
+    Cached version of load_tenant_membership; a warm lookup runs no queries
+    """
+    key = tenant_membership_cache.make_key(user.pk, tenant_slug)
+    membership = tenant_membership_cache.get(key)
+    if membership is None:
+        membership = load_tenant_membership(user, tenant_slug)
+        tenant_membership_cache.set(key, membership)
+    return membership
@@ -1,87 +1,82 @@
-import json
 import logging
-import jwt
-from django.http import JsonResponse
-from django.conf import settings
-from apps.tenants.models import TenantUser
+from apps.authentication.jwt import authenticate_request
+from .log import get_logger
+from .roles import get_tenant_role
+
+logger = get_logger("debug")
 
-logger = logging.getLogger(__name__)
 
 class DebugMiddleware:
+    """
+    Logs authentication and tenant details for menu API requests.
+
+    Everything here is debug-only work (token decoding, extra user and
+    membership lookups), so it is skipped entirely unless the
+    "omnicore.debug" logger is enabled for DEBUG.
+    """
+
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
+        if not logger.isEnabledFor(logging.DEBUG) or "/api/menu/" not in request.path:
+            return self.get_response(request)
+
         # Process request before the view is called
-        if '/api/menu/' in request.path:
-            # Log authentication info
-            is_authenticated = hasattr(request, 'user') and request.user.is_authenticated
-            user_email = getattr(request.user, 'email', 'unknown') if is_authenticated else 'anonymous'
-            
-            # Log headers
-            tenant_slug = request.headers.get("X-Tenant-Workspace")
-            auth_header = request.headers.get("Authorization", "")
-            
-            print(f"DEBUG Path: {request.path}")
-            print(f"DEBUG Method: {request.method}")
-            print(f"DEBUG User: {user_email} (Authenticated: {is_authenticated})")
-            print(f"DEBUG X-Tenant-Workspace: {tenant_slug}")
-            
-            # Debug JWT token
-            if auth_header and auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
-                print(f"DEBUG Token: {token[:20]}...")
-                try:
-                    # Try to decode token
-                    decoded = jwt.decode(
-                        token, 
-                        settings.SECRET_KEY, 
-                        algorithms=["HS256"],
-                        options={"verify_signature": False}  # Just for debugging
-                    )
-                    print(f"DEBUG Token payload: {decoded}")
-                    if 'user_id' in decoded:
-                        print(f"DEBUG Token user_id: {decoded['user_id']}")
-                        
-                        # Manually validate if this is a valid user ID
-                        from django.contrib.auth import get_user_model
-                        User = get_user_model()
-                        try:
-                            user = User.objects.get(id=decoded['user_id'])
-                            print(f"DEBUG Found user for token: {user.email} (ID: {user.id})")
-                        except User.DoesNotExist:
-                            print(f"DEBUG No user found for ID: {decoded['user_id']}")
-                        except Exception as user_err:
-                            print(f"DEBUG Error checking user: {str(user_err)}")
-                except Exception as e:
-                    print(f"DEBUG Token decode error: {str(e)}")
-            else:
-                print("DEBUG No valid Authorization header")
-            
-            # Check tenant context
-            if hasattr(request, 'tenant'):
-                print(f"DEBUG Tenant set: {request.tenant.name} ({request.tenant.slug})")
-                
-                # Check user-tenant relationship
-                if is_authenticated:
-                    try:
-                        tenant_user = TenantUser.objects.get(
-                            tenant=request.tenant,
-                            user=request.user,
-                            is_active=True
-                        )
-                        print(f"DEBUG User-Tenant relationship: {tenant_user.role}")
-                    except TenantUser.DoesNotExist:
-                        print("DEBUG User-Tenant relationship: NONE")
-            else:
-                print("DEBUG Tenant not set on request")
-            
+        self._log_request(request)
+
         response = self.get_response(request)
-        
+
         # Process response after the view is called
-        if '/api/menu/' in request.path:
-            print(f"DEBUG Response status: {response.status_code}")
-            if response.status_code == 403:
-                print("DEBUG Permission denied in the view")
-            
+        logger.debug(
+            "Response status",
+            extra={"path": request.path, "status": response.status_code},
+        )
+        if response.status_code == 403:
+            logger.debug("Permission denied in the view", extra={"path": request.path})
+
         return response
+
+    def _log_request(self, request):
+        # Log authentication info
+        is_authenticated = hasattr(request, "user") and request.user.is_authenticated
+        user_email = getattr(request.user, "email", "unknown") if is_authenticated else "anonymous"
+
+        logger.debug(
+            "Request",
+            extra={
+                "path": request.path,
+                "method": request.method,
+                "user": user_email,
+                "authenticated": is_authenticated,
+                "tenant_header": request.headers.get("X-Tenant-Slug"),
+            },
+        )
+
+        # Debug JWT token
+        auth_header = request.headers.get("Authorization", "")
+        if auth_header.startswith("Bearer "):
+            self._log_token(request)
+        else:
+            logger.debug("No valid Authorization header")
+
+        # Check tenant context
+        if hasattr(request, "tenant"):
+            logger.debug(
+                "Tenant set",
+                extra={
+                    "tenant": request.tenant.slug,
+                    "role": get_tenant_role(request) if is_authenticated else None,
+                },
+            )
+        else:
+            logger.debug("Tenant not set on request")
+
+    def _log_token(self, request):
+        # Verified by the shared JWT backend, which TenantMiddleware and DRF
+        # then reuse instead of decoding the token again
+        user = authenticate_request(request)
+        if user is None:
+            logger.debug("Token did not authenticate a user")
+        else:
+            logger.debug("Found user for token", extra={"user": user.email})
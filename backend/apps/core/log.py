@@ -0,0 +1,41 @@
+import logging
+
+
+LOGGER_PREFIX = "omnicore"
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime"}
+
+
+def get_logger(subsystem):
+    """
+    Get the logger for an OmniCore subsystem (e.g. "tenancy", "auth")
+
+    All subsystem loggers live under the "omnicore" namespace so their levels
+    can be tuned individually from settings.LOGGING.
+    """
+    return logging.getLogger(f"{LOGGER_PREFIX}.{subsystem}")
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Formatter that appends ``extra`` fields to the message as key=value pairs
+
+    Fields are only rendered when a record is actually emitted, so callers can
+    pass context cheaply:
+
+        logger.debug("tenant selected", extra={"tenant": tenant.slug})
+    """
+
+    def format(self, record):
+        message = super().format(record)
+        fields = [
+            f"{key}={value!r}"
+            for key, value in record.__dict__.items()
+            if key not in _RECORD_ATTRS and not key.startswith("_")
+        ]
+        if fields:
+            message = f"{message} {' '.join(fields)}"
+        return message
@@ -0,0 +1,115 @@
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from apps.core.benchmark import (
+    SCENARIOS,
+    BenchmarkError,
+    Scale,
+    compare,
+    run_benchmarks,
+    scenario_key,
+    seed,
+    unmeasured_routes,
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks query counts, latency and allocations of every API endpoint against a baseline'
+
+    def add_arguments(self, parser):
+        for field, default in Scale._field_defaults.items():
+            parser.add_argument(f'--{field}', type=int, default=default, help=f'{field.capitalize()} to seed (default {default})')
+        parser.add_argument('--iterations', type=int, default=20, help='Measured requests per endpoint')
+        parser.add_argument('--baseline', type=str, default=str(settings.BASE_DIR / 'benchmarks' / 'baseline.json'), help='Baseline JSON file')
+        parser.add_argument('--update-baseline', action='store_true', help='Write the results as the new baseline instead of comparing (with --only, update those endpoints)')
+        parser.add_argument('--tolerance', type=float, default=0.5, help='Allowed relative growth of latency and allocations (0.5 = 50%%)')
+        parser.add_argument('--skip-latency', action='store_true', help='Only compare query counts and allocations')
+        parser.add_argument('--only', type=str, help='Only run endpoints whose "METHOD route" contains this text')
+
+    def handle(self, *args, **options):
+        missing = unmeasured_routes()
+        if missing:
+            raise CommandError(f'API routes without a benchmark scenario: {", ".join(missing)}')
+
+        scale = Scale(**{field: options[field] for field in Scale._fields})
+        scenarios = [s for s in SCENARIOS if not options.get('only') or options['only'] in scenario_key(s)]
+
+        baseline = None
+        if not options['update_baseline']:
+            baseline = self._load_baseline(options['baseline'], scale)
+
+        self.stdout.write(f'Seeding {scale.tenants} tenant(s) in a throwaway database...')
+        results = self._run(scale, scenarios, options['iterations'])
+
+        if options['update_baseline']:
+            endpoints = dict(results)
+            if options.get('only'):
+                # A partial run only replaces its own endpoints
+                endpoints = {**self._load_baseline(options['baseline'], scale)['endpoints'], **results}
+            with open(options['baseline'], 'w') as file:
+                json.dump({'scale': scale._asdict(), 'endpoints': endpoints}, file, indent=2, sort_keys=True)
+                file.write('\n')
+            self.stdout.write(self.style.SUCCESS(f'Baseline of {len(results)} endpoint(s) written to {options["baseline"]}'))
+            return
+
+        regressions = compare(
+            results, baseline['endpoints'], options['tolerance'], latency=not options['skip_latency']
+        )
+        for key in sorted(set(results) - set(baseline['endpoints'])):
+            self.stdout.write(self.style.WARNING(f'{key}: not in the baseline'))
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(regression))
+        if regressions:
+            raise CommandError(f'{len(regressions)} regression(s) against {options["baseline"]}')
+        self.stdout.write(self.style.SUCCESS(f'{len(results)} endpoint(s) within the baseline'))
+
+    def _load_baseline(self, path, scale):
+        try:
+            with open(path) as file:
+                baseline = json.load(file)
+        except FileNotFoundError:
+            raise CommandError(f'No baseline at {path}; record one with --update-baseline')
+        if baseline.get('scale') != scale._asdict():
+            raise CommandError(f'The baseline was recorded at scale {baseline.get("scale")}; run at the same scale or --update-baseline')
+        return baseline
+
+    def _run(self, scale, scenarios, iterations):
+        # Every configured cache alias is swapped for a private in-memory
+        # one, so the run neither reads nor clears shared caches
+        local_caches = {
+            alias: {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': f'benchmark-{alias}',
+            }
+            for alias in settings.CACHES
+        }
+        with override_settings(CACHES=local_caches):
+            return self._run_isolated(scale, scenarios, iterations)
+
+    def _run_isolated(self, scale, scenarios, iterations):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            for alias in settings.CACHES:
+                caches[alias].clear()
+            data = seed(scale)
+            self.stdout.write(f'{"endpoint":<42} {"queries":>7} {"p50 ms":>8} {"p95 ms":>8} {"alloc KB":>9}')
+            # Measure requests as production serves them, without the
+            # development-only query watch
+            with override_settings(QUERY_WATCH={'ENABLED': False}):
+                return run_benchmarks(data, iterations, scenarios, on_result=self._print_result)
+        except BenchmarkError as exc:
+            raise CommandError(str(exc))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def _print_result(self, key, result):
+        self.stdout.write(
+            f'{key:<42} {result["queries"]:>7} {result["p50_ms"]:>8} {result["p95_ms"]:>8} {result["alloc_kb"]:>9}'
+        )
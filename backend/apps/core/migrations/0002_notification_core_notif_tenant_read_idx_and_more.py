@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('tenants', '0002_tenantuser_tenant_user_tenant_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['tenant', 'is_read', '-created_at'], name='core_notif_tenant_read_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['tenant', '-created_at'], name='core_notif_tenant_created_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+class RelatedDataMixin:
+    """
+    Lets a viewset declare the related data its serializer reads, so list
+    and detail querysets load it up front instead of one query per row.
+
+    - select_related_fields: forward relations joined into the main query
+    - prefetch_related_lookups: lookups or Prefetch objects; callables are
+      called per request so each request gets a fresh Prefetch queryset
+    """
+
+    select_related_fields = ()
+    prefetch_related_lookups = ()
+
+    def with_related_data(self, queryset):
+        """Apply the declared select_related / prefetch_related to a queryset"""
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+
+        lookups = [
+            lookup() if callable(lookup) else lookup
+            for lookup in self.prefetch_related_lookups
+        ]
+        if lookups:
+            queryset = queryset.prefetch_related(*lookups)
+        return queryset
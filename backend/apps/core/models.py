@@ -100,6 +100,17 @@ class Notification(models.Model):
         verbose_name = 'Notification'
         verbose_name_plural = 'Notifications'
         ordering = ['-created_at']
+        indexes = [
+            # Unread lists and unread counts (apps.core.notifications)
+            models.Index(
+                fields=['tenant', 'is_read', '-created_at'],
+                name='core_notif_tenant_read_idx',
+            ),
+            # Cursor pagination over the default ordering
+            models.Index(
+                fields=['tenant', '-created_at'], name='core_notif_tenant_created_idx'
+            ),
+        ]
     
     def __str__(self):
         return self.title
@@ -0,0 +1,134 @@
+"""
+Notification delivery
+
+Notifications are written with bulk_create: notify() inserts at once, or,
+inside a bulk write batch (apps.core.bulk.bulk_write_batch), queues the
+notification so the whole batch is inserted with one statement when the
+block ends.
+
+Each tenant's unread count is kept in a cache counter that is adjusted by
+the number of rows created or marked read once the transaction commits, so
+the badge count poll is answered from the cache. A missing counter is
+recounted from the (tenant, is_read, created_at) index on the next read,
+and the counter expires after TTL seconds, which bounds the drift of a
+recount racing with a concurrent write.
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+from .bulk import current_bulk_batch
+from .models import Notification
+
+
+DEFAULTS = {
+    "ALIAS": "default",
+    "TTL": 5 * 60,
+    "KEY_PREFIX": "notifications-unread",
+    "BATCH_SIZE": 500,
+}
+
+
+class UnreadNotificationCounter:
+    """Per-tenant unread notification counts in a Django cache alias"""
+
+    def __init__(self, options=None):
+        self.configure(options)
+
+    def configure(self, options=None):
+        config = dict(DEFAULTS)
+        config.update(options or getattr(settings, "NOTIFICATIONS", {}))
+        self.config = config
+
+    @property
+    def cache(self):
+        return caches[self.config["ALIAS"]]
+
+    def _key(self, tenant_id):
+        return f"{self.config['KEY_PREFIX']}:{tenant_id}"
+
+    def get(self, tenant_id):
+        """Unread notifications of a tenant, counted only on a cache miss"""
+        key = self._key(tenant_id)
+        count = self.cache.get(key)
+        if count is None:
+            count = Notification.objects.filter(
+                tenant_id=tenant_id, is_read=False
+            ).count()
+            # add() never overwrites a counter another worker moved meanwhile
+            self.cache.add(key, count, self.config["TTL"])
+        return count
+
+    def add(self, tenant_id, delta):
+        """Move a tenant's counter by delta once the transaction commits"""
+        if not delta:
+            return
+        key = self._key(tenant_id)
+
+        def apply():
+            try:
+                if self.cache.incr(key, delta) < 0:
+                    self.cache.delete(key)
+            except ValueError:
+                # Not cached: the next read counts the committed rows
+                pass
+
+        transaction.on_commit(apply)
+
+
+unread_notifications = UnreadNotificationCounter()
+
+
+def create_notifications(notifications):
+    """Insert unsaved notifications in batches and count them as unread"""
+    notifications = list(notifications)
+    Notification.objects.bulk_create(
+        notifications, batch_size=unread_notifications.config["BATCH_SIZE"]
+    )
+    unread = defaultdict(int)
+    for notification in notifications:
+        if not notification.is_read:
+            unread[notification.tenant_id] += 1
+    for tenant_id, count in unread.items():
+        unread_notifications.add(tenant_id, count)
+    return notifications
+
+
+def notify(tenant, title, message, notification_type="system", reference_id=None):
+    """
+    Send a notification to a tenant
+
+    Inside a bulk write batch the insert is deferred and shared with every
+    other notification of the batch.
+    """
+    notification = Notification(
+        tenant=tenant,
+        title=title,
+        message=message,
+        notification_type=notification_type,
+        reference_id=reference_id,
+    )
+    batch = current_bulk_batch()
+    if batch is not None:
+        batch.defer("notifications", create_notifications, notification)
+    else:
+        create_notifications([notification])
+    return notification
+
+
+def mark_notifications_read(tenant, ids=None):
+    """
+    Mark a tenant's notifications read, all of them when ids is None
+
+    One UPDATE of the unread rows; returns how many changed.
+    """
+    queryset = Notification.objects.filter(tenant=tenant, is_read=False)
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+    updated = queryset.update(is_read=True, updated_at=timezone.now())
+    unread_notifications.add(tenant.pk, -updated)
+    return updated
@@ -0,0 +1,121 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class TenantCursorPagination(CursorPagination):
+    """
+    Opt-in cursor (keyset) pagination for tenant list endpoints
+
+    Lists stay unpaginated unless the client sends `page_size` or `cursor`,
+    so existing clients keep receiving plain arrays. Pages are ordered by the
+    view's `cursor_ordering` or the model's Meta.ordering, plus "id" as a
+    tie-breaker, backed by a composite (tenant, <ordering>) index.
+
+    DRF's cursor only records the first ordering field and falls back to an
+    OFFSET while that field has ties (e.g. categories sharing a
+    display_order). Here the cursor position holds the values of every
+    ordering field, so each page seeks past the last row with a keyset
+    filter and never uses an OFFSET. Ordering fields must not be nullable.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def is_requested(self, request):
+        return (
+            self.cursor_query_param in request.query_params
+            or self.page_size_query_param in request.query_params
+        )
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "cursor_ordering", None) or queryset.model._meta.ordering
+        ordering = tuple(ordering) or ("-created_at",)
+        # A unique last field makes every position unique
+        if "id" not in ordering and "-id" not in ordering:
+            ordering += ("id",)
+        return ordering
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            attr = field.lstrip("-")
+            value = instance[attr] if isinstance(instance, dict) else getattr(instance, attr)
+            values.append(str(value))
+        return json.dumps(values)
+
+    def keyset_filter(self, position, reverse):
+        """
+        Rows after `position` in the page direction:
+
+            (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND id > z)
+
+        plus a bound on the first field alone, which the index can seek to
+        """
+        values = json.loads(position)
+        fields = [
+            (field.lstrip("-"), field.startswith("-") != reverse)
+            for field in self.ordering
+        ]
+        after = Q()
+        equal = Q()
+        for (attr, descending), value in zip(fields, values):
+            after |= equal & Q(**{f"{attr}__{'lt' if descending else 'gt'}": value})
+            equal &= Q(**{attr: value})
+        attr, descending = fields[0]
+        return Q(**{f"{attr}__{'lte' if descending else 'gte'}": values[0]}) & after
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, current_position = False, None
+        else:
+            _, reverse, current_position = self.cursor
+            try:
+                queryset = queryset.filter(self.keyset_filter(current_position, reverse))
+            except (IndexError, TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        # One extra row tells whether a following page exists; as in DRF, its
+        # position marks the following page and the links point at the row
+        # before it
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        following_position = None
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
@@ -1,5 +1,5 @@
 from rest_framework import permissions
-from apps.tenants.models import TenantUser
+from .roles import OWNER_ROLES, ADMIN_ROLES, MANAGER_ROLES, get_tenant_role
 
 
 class HasActiveTenant(permissions.BasePermission):
@@ -11,63 +11,52 @@ class HasActiveTenant(permissions.BasePermission):
         return hasattr(request, "tenant") and request.tenant is not None
 
 
-class IsTenantOwner(HasActiveTenant):
+class HasTenantRole(HasActiveTenant):
     """
-    Custom permission to only allow owners of a tenant to access/modify it.
+    Base permission that checks the user's role in the active tenant.
+    The role is resolved once per request and shared by all subclasses.
     """
 
+    # Roles allowed through; None allows any active member of the tenant
+    allowed_roles = None
+
     def has_permission(self, request, view):
         if not super().has_permission(request, view):
             return False
 
-        return TenantUser.objects.filter(
-            tenant=request.tenant, user=request.user, role="owner", is_active=True
-        ).exists()
+        role = get_tenant_role(request)
+        if role is None:
+            return False
+        return self.allowed_roles is None or role in self.allowed_roles
 
 
-class IsTenantAdmin(HasActiveTenant):
+class IsTenantOwner(HasTenantRole):
     """
-    Custom permission to only allow admins and owners of a tenant to access/modify it.
+    Custom permission to only allow owners of a tenant to access/modify it.
     """
 
-    def has_permission(self, request, view):
-        if not super().has_permission(request, view):
-            return False
+    allowed_roles = OWNER_ROLES
 
-        return TenantUser.objects.filter(
-            tenant=request.tenant,
-            user=request.user,
-            role__in=["owner", "admin"],
-            is_active=True,
-        ).exists()
 
+class IsTenantAdmin(HasTenantRole):
+    """
+    Custom permission to only allow admins and owners of a tenant to access/modify it.
+    """
 
-class IsTenantManager(HasActiveTenant):
+    allowed_roles = ADMIN_ROLES
+
+
+class IsTenantManager(HasTenantRole):
     """
     Custom permission for tenant managers (including admins and owners).
     """
 
-    def has_permission(self, request, view):
-        if not super().has_permission(request, view):
-            return False
-
-        return TenantUser.objects.filter(
-            tenant=request.tenant,
-            user=request.user,
-            role__in=["owner", "admin", "manager"],
-            is_active=True,
-        ).exists()
+    allowed_roles = MANAGER_ROLES
 
 
-class IsTenantUser(HasActiveTenant):
+class IsTenantUser(HasTenantRole):
     """
     Custom permission to only allow users that belong to a specific tenant.
     """
 
-    def has_permission(self, request, view):
-        if not super().has_permission(request, view):
-            return False
-
-        return TenantUser.objects.filter(
-            tenant=request.tenant, user=request.user, is_active=True
-        ).exists()
+    allowed_roles = None
@@ -0,0 +1,213 @@
+"""
+Repeated (N+1) and slow query detection
+
+QueryWatch is a database execute wrapper. It fingerprints every statement
+(literals, parameters and IN lists stripped, so the same query for
+another row gets the same fingerprint) and counts the fingerprints of one
+unit of work. A fingerprint reaching the repeat threshold is an N+1
+suspect; a statement slower than slow_ms is a slow query. Both remember
+their call site: the innermost frame of project code, e.g.
+
+    apps/settings/counters/serializers.py:57 in get_vat_taxes
+
+QueryWatchMiddleware watches each request (QUERY_WATCH["ENABLED"]) and
+logs its findings under "omnicore.queries" with the view that served it.
+With QUERY_WATCH["RAISE"] a request with repeated queries raises
+RepeatedQueriesError, which fails any test that sends it. Tests can also
+check a block directly with QueryCountAssertionsMixin.assertNoRepeatedQueries.
+
+Batched multi-row INSERTs (bulk_create) and statements other than
+SELECT / INSERT / UPDATE / DELETE (savepoints) are not counted.
+"""
+
+import os
+import re
+import sys
+import sysconfig
+import time
+from collections import namedtuple
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+from .log import get_logger
+
+logger = get_logger("queries")
+
+DEFAULTS = {
+    "ENABLED": False,
+    "REPEAT_THRESHOLD": 5,
+    "SLOW_MS": 100,
+    "RAISE": False,
+}
+
+# A fingerprint run `count` times; call_site is where it hit the threshold
+RepeatedQuery = namedtuple("RepeatedQuery", "fingerprint count call_site")
+SlowQuery = namedtuple("SlowQuery", "fingerprint duration_ms call_site")
+
+_IN_LIST = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+_MULTI_ROW_INSERT = re.compile(r"^INSERT .* VALUES \(.*\), \(", re.IGNORECASE)
+_WATCHED = ("SELECT", "INSERT", "UPDATE", "DELETE")
+
+# Frames from these directories are never reported as the call site
+_LIBRARY_DIRS = tuple(
+    {
+        os.path.join(path, "")
+        for path in (
+            sysconfig.get_paths()["stdlib"],
+            sysconfig.get_paths()["purelib"],
+            sysconfig.get_paths()["platlib"],
+        )
+    }
+)
+
+
+class RepeatedQueriesError(Exception):
+    """A request ran the same query more often than the threshold allows"""
+
+
+def get_query_watch_settings():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "QUERY_WATCH", {}))
+    return config
+
+
+def fingerprint(sql):
+    """SQL with parameters, literals and IN lists replaced, whitespace collapsed"""
+    sql = _IN_LIST.sub("(...)", sql)
+    sql = _LITERALS.sub("?", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def call_site():
+    """file:line in function of the innermost project frame on the stack"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename != __file__ and not filename.startswith(_LIBRARY_DIRS):
+            if filename.startswith(str(settings.BASE_DIR)):
+                filename = os.path.relpath(filename, settings.BASE_DIR)
+            return f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class QueryWatch:
+    """Execute wrapper counting query fingerprints and timing statements"""
+
+    def __init__(self, threshold=None, slow_ms=None):
+        config = get_query_watch_settings()
+        self.threshold = threshold or config["REPEAT_THRESHOLD"]
+        self.slow_ms = config["SLOW_MS"] if slow_ms is None else slow_ms
+        self.counts = {}
+        self.call_sites = {}
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            self._record(sql, duration_ms)
+
+    def _record(self, sql, duration_ms):
+        statement = sql.lstrip()[:6].upper()
+        if statement not in _WATCHED:
+            return
+        key = fingerprint(sql)
+        if self.slow_ms and duration_ms >= self.slow_ms:
+            self.slow.append(SlowQuery(key, round(duration_ms, 1), call_site()))
+        if statement == "INSERT" and _MULTI_ROW_INSERT.match(key):
+            return
+        count = self.counts[key] = self.counts.get(key, 0) + 1
+        if count == self.threshold:
+            self.call_sites[key] = call_site()
+
+    @property
+    def repeated(self):
+        return [
+            RepeatedQuery(key, self.counts[key], site)
+            for key, site in self.call_sites.items()
+        ]
+
+    def describe(self):
+        """The repeated queries as readable lines"""
+        return "\n".join(
+            f"{query.count}x at {query.call_site}: {query.fingerprint[:300]}"
+            for query in self.repeated
+        )
+
+
+@contextmanager
+def watch_queries(threshold=None, slow_ms=None):
+    """Watch the queries of a block on every database connection"""
+    watch = QueryWatch(threshold, slow_ms)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(watch))
+        yield watch
+
+
+def view_label(view_func):
+    """Class name of a DRF / class-based view, or the view function's name"""
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    if view_class is not None:
+        return view_class.__name__
+    return getattr(view_func, "__qualname__", repr(view_func))
+
+
+class QueryWatchMiddleware:
+    """Logs the repeated and slow queries of each request (see module docstring)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = get_query_watch_settings()
+        self.enabled = config["ENABLED"]
+        self.threshold = config["REPEAT_THRESHOLD"]
+        self.slow_ms = config["SLOW_MS"]
+        self.raise_repeated = config["RAISE"]
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        with watch_queries(self.threshold, self.slow_ms) as watch:
+            response = self.get_response(request)
+
+        view = getattr(request, "_query_watch_view", None)
+        for query in watch.slow:
+            logger.warning(
+                "Slow query",
+                extra={
+                    "path": request.path,
+                    "view": view,
+                    "duration_ms": query.duration_ms,
+                    "call_site": query.call_site,
+                    "sql": query.fingerprint[:300],
+                },
+            )
+        for query in watch.repeated:
+            logger.warning(
+                "Repeated query (possible N+1)",
+                extra={
+                    "path": request.path,
+                    "view": view,
+                    "count": query.count,
+                    "call_site": query.call_site,
+                    "sql": query.fingerprint[:300],
+                },
+            )
+        if self.raise_repeated and watch.repeated:
+            raise RepeatedQueriesError(
+                f"{request.method} {request.path} ({view}) repeated queries:\n"
+                + watch.describe()
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.enabled:
+            request._query_watch_view = view_label(view_func)
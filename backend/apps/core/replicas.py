@@ -0,0 +1,173 @@
+"""
+Read replica routing
+
+With READ_REPLICAS["ALIASES"] set (DATABASE_REPLICA_URLS in settings),
+ReplicaRouter sends the reads of selected views to a replica and
+everything else to the primary ("default"). A view opts in with
+replica_actions, the viewset actions (or, for a plain APIView, the HTTP
+methods) whose reads may be slightly stale:
+
+    class CounterViewSet(viewsets.ModelViewSet):
+        replica_actions = ("list",)
+
+Reads go back to the primary:
+
+- for the rest of a request once it writes (read-your-writes), and for
+  the next PIN_SECONDS of requests by the same user, so a list fetched
+  right after a change shows it even if the replica lags behind
+- inside transaction.atomic blocks, so a transaction reads what it locks
+  and writes (e.g. StaffProfileViewSet.perform_create)
+- inside primary_reads() blocks, for data that is cached after reading
+  (the menu catalog), where a stale read would outlive the lag
+
+Outside requests (management commands, the shell, WebSocket consumers)
+all queries use the primary.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+DEFAULTS = {
+    "ALIASES": [],
+    "PIN_SECONDS": 5,
+    "CACHE_ALIAS": "default",
+    "KEY_PREFIX": "db-primary",
+}
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_routing = ContextVar("omnicore_db_routing", default=None)
+
+
+def get_replica_settings():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "READ_REPLICAS", {}))
+    return config
+
+
+class RoutingState:
+    """How the queries of the current request are routed"""
+
+    def __init__(self):
+        self.replica_reads = False
+        self.wrote = False
+
+
+@contextmanager
+def request_routing():
+    """Give the block its own routing state (one per request)"""
+    state = RoutingState()
+    token = _routing.set(state)
+    try:
+        yield state
+    finally:
+        _routing.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary inside the block"""
+    state = _routing.get()
+    if state is None:
+        yield
+        return
+    previous = state.replica_reads
+    state.replica_reads = False
+    try:
+        yield
+    finally:
+        state.replica_reads = previous
+
+
+class ReplicaRouter:
+    """Routes reads of replica-enabled requests to a replica (see module docstring)"""
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None:
+            return None
+        if not state.replica_reads or state.wrote:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        aliases = get_replica_settings()["ALIASES"]
+        if not aliases:
+            return DEFAULT_DB_ALIAS
+        return random.choice(aliases)
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        databases = {DEFAULT_DB_ALIAS, *get_replica_settings()["ALIASES"]}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in get_replica_settings()["ALIASES"]:
+            return False
+        return None
+
+
+def view_action(view_func, method):
+    """The viewset action a request runs, or the method name for an APIView"""
+    actions = getattr(view_func, "actions", None)
+    if actions:
+        return actions.get(method.lower())
+    return method.lower()
+
+
+class ReplicaMiddleware:
+    """Lets the views with replica_actions read from a replica (see module docstring)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = get_replica_settings()
+        self.enabled = bool(config["ALIASES"])
+        self.pin_seconds = config["PIN_SECONDS"]
+        self.cache_alias = config["CACHE_ALIAS"]
+        self.key_prefix = config["KEY_PREFIX"]
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        with request_routing() as state:
+            response = self.get_response(request)
+
+        if state.wrote and self.pin_seconds:
+            key = self._pin_key(request)
+            if key is not None:
+                caches[self.cache_alias].set(key, True, self.pin_seconds)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _routing.get()
+        if state is None or request.method not in SAFE_METHODS:
+            return None
+        view_class = getattr(view_func, "cls", None)
+        if view_action(view_func, request.method) not in getattr(
+            view_class, "replica_actions", ()
+        ):
+            return None
+        key = self._pin_key(request)
+        if key is not None and caches[self.cache_alias].get(key):
+            return None
+        state.replica_reads = True
+        return None
+
+    def _pin_key(self, request):
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            return None
+        return f"{self.key_prefix}:{user.pk}"
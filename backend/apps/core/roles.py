@@ -0,0 +1,60 @@
+from apps.tenants.models import TenantUser
+
+
+# Role groups used by the tenant permission classes
+OWNER_ROLES = ("owner",)
+ADMIN_ROLES = ("owner", "admin")
+MANAGER_ROLES = ("owner", "admin", "manager")
+
+# Attribute on the underlying HttpRequest holding ((tenant_id, user_id), role)
+REQUEST_ROLE_ATTR = "_tenant_role"
+
+
+def _http_request(request):
+    """Return the Django HttpRequest behind a DRF Request (or the request itself)"""
+    return getattr(request, "_request", request)
+
+
+def remember_tenant_role(request, tenant, user, role):
+    """
+    Memoize a user's role in a tenant on the request
+
+    Used by TenantMiddleware, which already knows the role from the
+    membership cache, so permission checks later in the request are free.
+    """
+    setattr(_http_request(request), REQUEST_ROLE_ATTR, ((tenant.pk, user.pk), role))
+
+
+def get_tenant_role(request, tenant=None, user=None):
+    """
+    Get the role of the request's user in the request's tenant
+
+    The TenantUser row is loaded at most once per request; any number of
+    permission checks afterwards reuse the memoized role.
+
+    Args:
+        request: The Django or DRF request
+        tenant: Optional tenant, defaults to request.tenant
+        user: Optional user, defaults to request.user
+
+    Returns:
+        Role string or None if the user is not an active member of the tenant
+    """
+    http_request = _http_request(request)
+    tenant = tenant if tenant is not None else getattr(http_request, "tenant", None)
+    user = user if user is not None else getattr(request, "user", None)
+    if tenant is None or user is None or not user.is_authenticated:
+        return None
+
+    key = (tenant.pk, user.pk)
+    cached = getattr(http_request, REQUEST_ROLE_ATTR, None)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    role = (
+        TenantUser.objects.filter(tenant=tenant, user=user, is_active=True)
+        .values_list("role", flat=True)
+        .first()
+    )
+    setattr(http_request, REQUEST_ROLE_ATTR, (key, role))
+    return role
@@ -0,0 +1,43 @@
+from rest_framework import serializers
+from .models import Notification, TenantSetting
+
+
+class TenantSettingSerializer(serializers.ModelSerializer):
+    """Serializer for TenantSetting model"""
+
+    class Meta:
+        model = TenantSetting
+        fields = [
+            "currency",
+            "default_tax_percentage",
+            "service_charge_percentage",
+            "working_hours_start",
+            "working_hours_end",
+            "timezone",
+            "enable_table_management",
+            "enable_kitchen_display",
+            "enable_customer_display",
+            "enable_mobile_ordering",
+            "enable_online_payments",
+            "receipt_header",
+            "receipt_footer",
+            "updated_at",
+        ]
+        read_only_fields = ["updated_at"]
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    """Serializer for Notification model"""
+
+    class Meta:
+        model = Notification
+        fields = [
+            "id",
+            "title",
+            "message",
+            "notification_type",
+            "is_read",
+            "reference_id",
+            "created_at",
+        ]
+        read_only_fields = ["id", "is_read", "created_at"]
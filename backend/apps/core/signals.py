@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.tenants.models import Tenant, TenantUser
+from .cache import tenant_membership_cache
+
+
+@receiver(post_save, sender=TenantUser)
+@receiver(post_delete, sender=TenantUser)
+def invalidate_tenant_user_membership(sender, instance, **kwargs):
+    """Role or active flag changed: drop the member's cached tenant context"""
+    tenant_membership_cache.invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(pre_delete, sender=Tenant)
+def invalidate_tenant_memberships(sender, instance, **kwargs):
+    """
+    Tenant changed: drop the cached context of all of its members
+
+    Cached memberships hold the Tenant instance itself, so a renamed or
+    re-slugged tenant must not keep being served from the cache.
+    """
+    user_ids = TenantUser.objects.filter(tenant=instance).values_list(
+        "user_id", flat=True
+    )
+    for user_id in user_ids:
+        tenant_membership_cache.invalidate_user(user_id)
@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .querywatch import watch_queries
+
+
+def jwt_client(user, tenant_slug=None):
+    """
+    APIClient that authenticates with a real bearer token
+
+    Unlike force_authenticate, requests go through TenantMiddleware, so
+    request.tenant is resolved exactly as in production.
+    """
+    client = APIClient()
+    credentials = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+    if tenant_slug:
+        credentials["HTTP_X_TENANT_SLUG"] = tenant_slug
+    client.credentials(**credentials)
+    return client
+
+
+class QueryCountAssertionsMixin:
+    """TestCase mixin with query count assertions for API endpoints"""
+
+    @contextmanager
+    def assertMaxQueries(self, maximum, using="default"):
+        """Fail if the block runs more than `maximum` queries"""
+        with CaptureQueriesContext(connections[using]) as context:
+            yield context
+        executed = len(context.captured_queries)
+        if executed > maximum:
+            queries = "\n".join(
+                f"{index}. {query['sql']}"
+                for index, query in enumerate(context.captured_queries, start=1)
+            )
+            self.fail(f"{executed} queries executed, {maximum} allowed\n{queries}")
+
+    def assertListQueries(self, client, url, maximum, **extra):
+        """GET a list endpoint and assert it stays within `maximum` queries"""
+        with self.assertMaxQueries(maximum):
+            response = client.get(url, **extra)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    @contextmanager
+    def assertNoRepeatedQueries(self, threshold=None):
+        """Fail if any query of the block repeats `threshold` times (N+1)"""
+        with watch_queries(threshold) as watch:
+            yield watch
+        if watch.repeated:
+            self.fail(f"Repeated queries\n{watch.describe()}")
@@ -0,0 +1,325 @@
+"""
+Per-request phase timing, reported in Server-Timing headers
+
+A sampled request (SERVER_TIMING["SAMPLE_RATE"]) records the time spent
+and the queries run in each phase:
+
+    auth         JWT verification (CachedJWTAuthentication)
+    tenant       tenant resolution in TenantMiddleware
+    permissions  DRF permission checks
+    queryset     get_queryset of DRF views
+    serialize    reading serializer.data, including the queries of the
+                 lazy querysets it evaluates
+    view         the rest of the view's own code
+    app          everything else (middleware, rendering)
+    db           time spent in the database, across all phases
+    total        the whole request
+
+The view phases are timed explicitly: project API views put
+TimedViewMixin first in their bases, and their get_queryset overrides
+carry @timed("queryset"). untimed_views() lists views missing either.
+Serializers are timed when they come from the view's get_serializer().
+
+Phase times are exclusive: a phase running inside another (auth inside
+tenant) is subtracted from the outer one, and a query counts towards the
+innermost phase. Results go out in a Server-Timing header, e.g.
+
+    Server-Timing: tenant;dur=0.41;desc="1 queries", serialize;dur=5.2;desc="1 queries", ...
+
+and into an in-process histogram per endpoint and phase, which staff
+users read at /api/metrics/timing/. A request that is not sampled costs a
+random draw; the phase hooks find no timing in the context and return.
+"""
+
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+
+DEFAULTS = {
+    "SAMPLE_RATE": 0.0,
+    "HEADER": True,
+}
+
+PHASES = (
+    "auth", "tenant", "permissions", "queryset", "serialize", "view", "app", "db", "total",
+)
+
+# Upper bounds (ms) of the histogram buckets; a last bucket holds the rest
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_current_timing = ContextVar("request_timing", default=None)
+
+
+def get_timing_settings():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "SERVER_TIMING", {}))
+    return config
+
+
+class RequestTiming:
+    """Exclusive time and query count per phase of one request"""
+
+    def __init__(self):
+        self.phases = {}
+        # Open phases: [name, start, time spent in phases nested in it]
+        self.stack = []
+        self.db_seconds = 0.0
+        self.queries = 0
+
+    def enter(self, name):
+        self.stack.append([name, time.perf_counter(), 0.0])
+
+    def exit(self):
+        name, started, nested = self.stack.pop()
+        elapsed = time.perf_counter() - started
+        self._phase(name)[0] += elapsed - nested
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+    def _phase(self, name):
+        return self.phases.setdefault(name, [0.0, 0])
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper: times queries and counts them per phase"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - started
+            self.queries += 1
+            self._phase(self.stack[-1][0] if self.stack else "app")[1] += 1
+
+    def summary(self, total_seconds):
+        """{phase: (milliseconds, queries)} in PHASES order"""
+        measured = {name: list(values) for name, values in self.phases.items()}
+        app = measured.setdefault("app", [0.0, 0])
+        app[0] = max(
+            total_seconds
+            - sum(seconds for name, (seconds, _) in measured.items() if name != "app"),
+            0.0,
+        )
+        measured["db"] = [self.db_seconds, self.queries]
+        measured["total"] = [total_seconds, self.queries]
+        return {
+            name: (round(measured[name][0] * 1000, 2), measured[name][1])
+            for name in PHASES
+            if name in measured
+        }
+
+
+class _Phase:
+    __slots__ = ("timing", "name")
+
+    def __init__(self, timing, name):
+        self.timing = timing
+        self.name = name
+
+    def __enter__(self):
+        self.timing.enter(self.name)
+
+    def __exit__(self, *exc_info):
+        self.timing.exit()
+
+
+def timing_phase(name):
+    """Context manager attributing its block to a phase of the sampled request"""
+    timing = _current_timing.get()
+    if timing is None:
+        return nullcontext()
+    return _Phase(timing, name)
+
+
+def timed(name):
+    """Decorator attributing a function's calls to a phase"""
+
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            timing = _current_timing.get()
+            if timing is None:
+                return function(*args, **kwargs)
+            timing.enter(name)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timing.exit()
+
+        wrapper.timed_phase = name
+        return wrapper
+
+    return decorate
+
+
+# Serializer classes whose .data is timed, by the class they extend
+_timed_serializer_classes = {}
+
+
+def timed_serializer_class(serializer_class):
+    """A subclass of serializer_class whose .data counts as the serialize phase"""
+    timed_class = _timed_serializer_classes.get(serializer_class)
+    if timed_class is None:
+        timed_class = _timed_serializer_classes[serializer_class] = type(
+            serializer_class.__name__,
+            (serializer_class,),
+            {
+                "__module__": serializer_class.__module__,
+                "data": property(timed("serialize")(serializer_class.data.fget)),
+            },
+        )
+    return timed_class
+
+
+class TimedViewMixin:
+    """
+    Times the phases of a DRF view for sampled requests
+
+    Goes first in the bases of project API views. Their get_queryset
+    overrides carry @timed("queryset") themselves.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with timing_phase("view"):
+            return super().dispatch(request, *args, **kwargs)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if _current_timing.get() is not None:
+            serializer.__class__ = timed_serializer_class(type(serializer))
+        return serializer
+
+    def check_permissions(self, request):
+        with timing_phase("permissions"):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with timing_phase("permissions"):
+            super().check_object_permissions(request, obj)
+
+
+def untimed_views():
+    """Project API views without TimedViewMixin or with an untimed get_queryset"""
+    from django.urls import URLResolver, get_resolver
+
+    untimed = set()
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns, route)
+                continue
+            view_class = getattr(pattern.callback, "cls", None)
+            if not route.startswith("api/") or view_class is None:
+                continue
+            if not view_class.__module__.startswith("apps."):
+                continue
+            if not issubclass(view_class, TimedViewMixin) or any(
+                not hasattr(cls.__dict__["get_queryset"], "timed_phase")
+                for cls in view_class.__mro__
+                if cls.__module__.startswith("apps.") and "get_queryset" in cls.__dict__
+            ):
+                untimed.add(view_class.__name__)
+
+    walk(get_resolver().url_patterns, "")
+    return sorted(untimed)
+
+
+class TimingHistogram:
+    """In-process latency histograms of sampled requests, per endpoint and phase"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, endpoint, phases):
+        with self._lock:
+            for name, (milliseconds, queries) in phases.items():
+                series = self._series.get((endpoint, name))
+                if series is None:
+                    series = self._series[(endpoint, name)] = {
+                        "count": 0,
+                        "sum_ms": 0.0,
+                        "queries": 0,
+                        "buckets": [0] * (len(BUCKETS_MS) + 1),
+                    }
+                series["count"] += 1
+                series["sum_ms"] += milliseconds
+                series["queries"] += queries
+                series["buckets"][bisect_left(BUCKETS_MS, milliseconds)] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                {
+                    "endpoint": endpoint,
+                    "phase": phase,
+                    "count": series["count"],
+                    "mean_ms": round(series["sum_ms"] / series["count"], 2),
+                    "queries": series["queries"],
+                    "buckets": list(series["buckets"]),
+                }
+                for (endpoint, phase), series in sorted(self._series.items())
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+timing_histogram = TimingHistogram()
+
+
+def endpoint_label(request):
+    """Endpoint of a request as METHOD and route name, e.g. GET menu-item-list"""
+    match = getattr(request, "resolver_match", None)
+    return f"{request.method} {match.view_name if match else 'unresolved'}"
+
+
+def server_timing_header(phases):
+    return ", ".join(
+        f'{name};dur={milliseconds};desc="{queries} queries"'
+        for name, (milliseconds, queries) in phases.items()
+    )
+
+
+class ServerTimingMiddleware:
+    """
+    Times a sample of requests per phase (see the module docstring)
+
+    Goes first in MIDDLEWARE so that "total" covers every other middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = get_timing_settings()
+        self.sample_rate = config["SAMPLE_RATE"]
+        self.header = config["HEADER"]
+
+    def __call__(self, request):
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timing))
+                response = self.get_response(request)
+        finally:
+            _current_timing.reset(token)
+
+        phases = timing.summary(time.perf_counter() - started)
+        timing_histogram.observe(endpoint_label(request), phases)
+        if self.header:
+            response["Server-Timing"] = server_timing_header(phases)
+        return response
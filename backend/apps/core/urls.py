@@ -0,0 +1,12 @@
+from django.urls import path, include
+from rest_framework.routers import SimpleRouter
+from .views import NotificationViewSet
+
+# Mounted at api/notifications/; SimpleRouter has no API root view to
+# clash with the list route at the empty prefix
+router = SimpleRouter()
+router.register(r"", NotificationViewSet, basename="notification")
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
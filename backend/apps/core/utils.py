@@ -1,5 +1,6 @@
 from django.conf import settings
 from apps.tenants.models import Tenant, TenantUser
+from .roles import get_tenant_role
 
 
 class TenantContextManager:
@@ -42,13 +43,15 @@ class TenantContextManager:
         return tenant_users.first().tenant
 
     @staticmethod
-    def get_user_role_in_tenant(user, tenant):
+    def get_user_role_in_tenant(user, tenant, request=None):
         """
         Get the user's role in a specific tenant
 
         Args:
             user: The user to check
             tenant: The tenant to check
+            request: Optional request; when given the role is memoized on it
+                and shared with the tenant permission classes
 
         Returns:
             Role string or None if user is not in the tenant
@@ -56,16 +59,17 @@ class TenantContextManager:
         if not user or not tenant:
             return None
 
-        try:
-            tenant_user = TenantUser.objects.get(
-                user=user, tenant=tenant, is_active=True
-            )
-            return tenant_user.role
-        except TenantUser.DoesNotExist:
-            return None
+        if request is not None:
+            return get_tenant_role(request, tenant=tenant, user=user)
+
+        return (
+            TenantUser.objects.filter(user=user, tenant=tenant, is_active=True)
+            .values_list("role", flat=True)
+            .first()
+        )
 
     @staticmethod
-    def is_user_in_tenant_role(user, tenant, roles):
+    def is_user_in_tenant_role(user, tenant, roles, request=None):
         """
         Check if a user has one of the specified roles in a tenant
 
@@ -73,6 +77,7 @@ class TenantContextManager:
             user: The user to check
             tenant: The tenant to check
             roles: List of roles to check for
+            request: Optional request used to memoize the role lookup
 
         Returns:
             Boolean indicating if user has any of the roles
@@ -80,13 +85,8 @@ class TenantContextManager:
         if not user or not tenant or not roles:
             return False
 
-        try:
-            tenant_user = TenantUser.objects.get(
-                user=user, tenant=tenant, is_active=True
-            )
-            return tenant_user.role in roles
-        except TenantUser.DoesNotExist:
-            return False
+        role = TenantContextManager.get_user_role_in_tenant(user, tenant, request)
+        return role in roles
 
     @staticmethod
     def filter_queryset_by_tenant(queryset, tenant):
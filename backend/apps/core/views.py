@@ -1,3 +1,119 @@
-from django.shortcuts import render
+from rest_framework import mixins, permissions, serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from .models import Notification
+from .notifications import (
+    create_notifications,
+    mark_notifications_read,
+    unread_notifications,
+)
+from .pagination import TenantCursorPagination
+from .permissions import IsTenantAdmin, IsTenantUser
+from .serializers import NotificationSerializer
+from .timing import (
+    BUCKETS_MS,
+    TimedViewMixin,
+    get_timing_settings,
+    timed,
+    timing_histogram,
+)
+
+
+class NotificationPagination(TenantCursorPagination):
+    """Cursor pagination that is always on: notification lists grow without bound"""
+
+    def is_requested(self, request):
+        return True
+
+
+class MarkReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, max_length=5000
+    )
+    all = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if not attrs["all"] and not attrs.get("ids"):
+            raise serializers.ValidationError('Provide "ids" or "all": true.')
+        return attrs
+
+
+class NotificationViewSet(
+    TimedViewMixin,
+    mixins.ListModelMixin, mixins.CreateModelMixin, viewsets.GenericViewSet
+):
+    """
+    ViewSet for the current tenant's notifications
+
+    - List: Notifications newest first, cursor paginated; ?is_read=true|false
+    - Create: Send one notification or an array of them (admins only),
+      inserted with one bulk INSERT
+    - unread-count: The badge count, served from the cache
+    - mark-read: Mark {"ids": [...]} or {"all": true} read with one UPDATE
+    """
+
+    serializer_class = NotificationSerializer
+    pagination_class = NotificationPagination
+
+    def get_permissions(self):
+        if self.action == "create":
+            permission_classes = [permissions.IsAuthenticated, IsTenantAdmin]
+        else:
+            permission_classes = [permissions.IsAuthenticated, IsTenantUser]
+        return [permission() for permission in permission_classes]
+
+    @timed("queryset")
+    def get_queryset(self):
+        if not hasattr(self.request, "tenant"):
+            return Notification.objects.none()
+        queryset = Notification.objects.filter(tenant=self.request.tenant)
+        is_read = self.request.query_params.get("is_read")
+        if is_read is not None:
+            queryset = queryset.filter(is_read=is_read.lower() == "true")
+        return queryset
+
+    def create(self, request, *args, **kwargs):
+        many = isinstance(request.data, list)
+        serializer = self.get_serializer(data=request.data, many=many)
+        serializer.is_valid(raise_exception=True)
+        rows = serializer.validated_data if many else [serializer.validated_data]
+        notifications = create_notifications(
+            Notification(tenant=request.tenant, **row) for row in rows
+        )
+        data = NotificationSerializer(notifications, many=True).data
+        return Response(data if many else data[0], status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["get"], url_path="unread-count")
+    def unread_count(self, request):
+        return Response({"unread": unread_notifications.get(request.tenant.pk)})
+
+    @action(detail=False, methods=["post"], url_path="mark-read")
+    def mark_read(self, request):
+        serializer = MarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = None if serializer.validated_data["all"] else serializer.validated_data["ids"]
+        updated = mark_notifications_read(request.tenant, ids)
+        return Response({"updated": updated})
+
+
+class ServerTimingMetricsView(TimedViewMixin, APIView):
+    """
+    Per-phase timing histograms of this process's sampled requests (staff only)
+
+    Counts are per (endpoint, phase); bucket i counts requests up to
+    buckets_ms[i] milliseconds, the last one the slower rest. They cover
+    the worker answering the request only, since the last restart.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(
+            {
+                "sample_rate": get_timing_settings()["SAMPLE_RATE"],
+                "buckets_ms": BUCKETS_MS,
+                "series": timing_histogram.snapshot(),
+            }
+        )
@@ -0,0 +1,101 @@
+"""
+WebSocket plumbing shared by the real-time feeds (Django Channels)
+
+Browsers cannot set headers on a WebSocket handshake, so sockets
+authenticate with the access token and tenant slug in the query string:
+
+    ws://host/ws/tables/?token=<access token>&tenant=<slug>
+
+TenantAuthMiddleware resolves them exactly like HTTP requests (cached JWT
+user, cached tenant membership) and puts user, tenant and role in the
+scope. Server code publishes to per-tenant groups with broadcast(), which
+sends after the current transaction commits.
+"""
+
+from urllib.parse import parse_qs
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.contrib.auth.models import AnonymousUser
+from django.db import transaction
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from apps.authentication.jwt import CachedJWTAuthentication
+from .cache import resolve_tenant_membership
+from .log import get_logger
+
+logger = get_logger("realtime")
+
+
+def tenant_group(tenant_id, topic):
+    """Channel layer group of a tenant's feed, e.g. tenant-<id>.tables"""
+    return f"tenant-{tenant_id}.{topic}"
+
+
+def broadcast(group, message_type, payload):
+    """
+    Send a message to a channel layer group once the transaction commits
+
+    Consumers receive it in the handler named after message_type (dots
+    become underscores). payload may be a callable, evaluated at send time
+    so it can read the committed state. A no-op when no channel layer is
+    configured.
+    """
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+
+    def send():
+        try:
+            message = payload() if callable(payload) else payload
+            async_to_sync(channel_layer.group_send)(
+                group, {"type": message_type, "payload": message}
+            )
+        except Exception:
+            # Live feeds are best effort; the write itself already committed
+            logger.exception("Broadcast failed", extra={"group": group})
+
+    transaction.on_commit(send)
+
+
+@database_sync_to_async
+def _resolve(raw_token, tenant_slug):
+    """(user, membership) for a raw access token, or (None, None)"""
+    authentication = CachedJWTAuthentication()
+    try:
+        user = authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None, None
+    return user, resolve_tenant_membership(user, tenant_slug)
+
+
+class TenantAuthMiddleware:
+    """
+    ASGI middleware setting scope["user"], scope["tenant"] and
+    scope["tenant_role"] from the token and tenant query parameters
+
+    tenant and tenant_role are None when the user has no access to the
+    requested (or, without a slug, to exactly one) tenant; consumers
+    reject such connections.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        params = parse_qs(scope.get("query_string", b"").decode())
+        raw_token = (params.get("token") or [None])[0]
+        tenant_slug = (params.get("tenant") or [None])[0]
+
+        user, membership = None, None
+        if raw_token:
+            user, membership = await _resolve(raw_token.encode(), tenant_slug)
+
+        scope = dict(
+            scope,
+            user=user or AnonymousUser(),
+            tenant=membership.tenant if membership else None,
+            tenant_role=membership.role if membership else None,
+        )
+        return await self.app(scope, receive, send)
@@ -0,0 +1,110 @@
+"""
+Tenant data sets available for export
+
+Each source selects a tenant's rows and names its columns; a column maps to
+a field lookup read with values_list(), so exports never build model
+instances and related names come from joins in the same query.
+"""
+
+from collections import namedtuple
+
+from apps.management.table.models import RestaurantTable
+from apps.menu.models import MenuItem
+from apps.pos.models import CashMovement, POSSession
+from apps.staff.models import StaffProfile
+
+
+# queryset(tenant) selects the rows in export order; columns maps column
+# names to field lookups
+ExportSource = namedtuple("ExportSource", "name queryset columns")
+
+
+SOURCES = [
+    ExportSource(
+        "menu_items",
+        lambda tenant: MenuItem.objects.filter(tenant=tenant).order_by("name", "id"),
+        {
+            "id": "id",
+            "name": "name",
+            "category_id": "category_id",
+            "category": "category__name",
+            "description": "description",
+            "price": "price",
+            "cost": "cost",
+            "is_active": "is_active",
+            "preparation_time": "preparation_time",
+            "created_at": "created_at",
+            "updated_at": "updated_at",
+        },
+    ),
+    ExportSource(
+        "tables",
+        lambda tenant: RestaurantTable.objects.filter(tenant=tenant).order_by("number"),
+        {
+            "id": "id",
+            "number": "number",
+            "name": "name",
+            "capacity": "capacity",
+            "status": "status",
+            "area": "area",
+            "is_active": "is_active",
+            "notes": "notes",
+            "created_at": "created_at",
+            "updated_at": "updated_at",
+        },
+    ),
+    ExportSource(
+        "staff",
+        lambda tenant: StaffProfile.objects.filter(tenant=tenant).order_by("name", "id"),
+        {
+            "id": "id",
+            "name": "name",
+            "position": "position",
+            "email": "email",
+            "phone_number": "phone_number",
+            "address": "address",
+            "gender": "gender",
+            "user_id": "user_id",
+            "is_active": "is_active",
+            "created_at": "created_at",
+            "updated_at": "updated_at",
+        },
+    ),
+    ExportSource(
+        "pos_sessions",
+        lambda tenant: POSSession.objects.filter(tenant=tenant).order_by("opened_at", "id"),
+        {
+            "id": "id",
+            "status": "status",
+            "opened_by": "opened_by__email",
+            "closed_by": "closed_by__email",
+            "opening_balance": "opening_balance",
+            "closing_balance": "closing_balance",
+            "expected_balance": "expected_balance",
+            "cash_sales": "cash_sales",
+            "card_sales": "card_sales",
+            "other_sales": "other_sales",
+            "notes": "notes",
+            "opened_at": "opened_at",
+            "closed_at": "closed_at",
+        },
+    ),
+    ExportSource(
+        "cash_movements",
+        lambda tenant: CashMovement.objects.filter(session__tenant=tenant).order_by(
+            "created_at", "id"
+        ),
+        {
+            "id": "id",
+            "session_id": "session_id",
+            "movement_type": "movement_type",
+            "amount": "amount",
+            "reason": "reason",
+            "notes": "notes",
+            "created_by": "created_by__email",
+            "created_at": "created_at",
+        },
+    ),
+]
+
+SOURCES_BY_NAME = {source.name: source for source in SOURCES}
@@ -0,0 +1,72 @@
+"""
+Streaming writers for exports
+
+Rows are read with QuerySet.iterator(), so the database driver fetches
+them in chunks (a server-side cursor on PostgreSQL), encoded one at a time
+and sent in buffers of about BUFFER_SIZE bytes; a worker holds one chunk of
+rows and one buffer, whatever the size of the export.
+"""
+
+import csv
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+
+
+def iter_rows(queryset, lookups):
+    """Value tuples of the given lookups, fetched CHUNK_SIZE rows at a time"""
+    return queryset.values_list(*lookups).iterator(chunk_size=CHUNK_SIZE)
+
+
+def ndjson_lines(names, rows):
+    """One JSON object per line"""
+    encoder = DjangoJSONEncoder()
+    for values in rows:
+        yield encoder.encode(dict(zip(names, values))) + "\n"
+
+
+class _Echo:
+    """File-like object whose write() returns the line, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def csv_lines(names, rows):
+    """Header line, then one CSV line per row"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(names)
+    for values in rows:
+        yield writer.writerow([_csv_value(value) for value in values])
+
+
+# file extension: (line writer, content type)
+WRITERS = {
+    "ndjson": (ndjson_lines, "application/x-ndjson"),
+    "csv": (csv_lines, "text/csv"),
+}
+
+
+def buffered(lines, size=BUFFER_SIZE):
+    """Join text lines into UTF-8 chunks of at least `size` bytes"""
+    buffer = []
+    length = 0
+    for line in lines:
+        buffer.append(line)
+        length += len(line)
+        if length >= size:
+            yield "".join(buffer).encode()
+            buffer = []
+            length = 0
+    if buffer:
+        yield "".join(buffer).encode()
@@ -0,0 +1,96 @@
+import csv
+import gzip
+import io
+import json
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from apps.core.cache import tenant_membership_cache
+from apps.core.testing import QueryCountAssertionsMixin, jwt_client
+from apps.tenants.models import Tenant, TenantUser
+from apps.menu.models import Category, MenuItem
+from apps.pos.models import CashMovement, POSSession
+
+User = get_user_model()
+
+
+class ExportViewTestCase(QueryCountAssertionsMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        tenant_membership_cache.clear()
+
+        self.user = User.objects.create_user(
+            email="owner@example.com", password="password123"
+        )
+        self.tenant = Tenant.objects.create(
+            name="Test Restaurant", slug="test-restaurant", owner=self.user
+        )
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="owner")
+        other = Tenant.objects.create(
+            name="Other Restaurant", slug="other-restaurant", owner=self.user
+        )
+
+        category = Category.objects.create(tenant=self.tenant, name="Pizza")
+        for index in range(30):
+            MenuItem.objects.create(
+                tenant=self.tenant, category=category, name=f"Item {index:02}", price=10
+            )
+        MenuItem.objects.create(tenant=other, name="Foreign", price=1)
+        session = POSSession.objects.create(
+            tenant=self.tenant, opened_by=self.user, opening_balance=100
+        )
+        CashMovement.objects.create(
+            session=session, movement_type="in", amount=20, reason="float",
+            created_by=self.user,
+        )
+
+        self.client = jwt_client(self.user)
+        # Warm the token and tenant membership caches
+        self.client.get("/api/exports/")
+
+    def _content(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = b"".join(response.streaming_content)
+        if response.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return body.decode()
+
+    def test_csv_export_with_selected_columns(self):
+        """Test that a CSV export streams the tenant's rows in the chosen columns"""
+        with self.assertMaxQueries(1):
+            response = self.client.get("/api/exports/menu_items.csv?fields=name,category,price")
+            content = self._content(response)
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(rows[0], ["name", "category", "price"])
+        self.assertEqual(len(rows), 31)
+        self.assertEqual(rows[1], ["Item 00", "Pizza", "10.00"])
+        self.assertIn("attachment;", response["Content-Disposition"])
+
+    def test_ndjson_export_is_gzipped_on_request(self):
+        """Test that NDJSON exports are compressed when the client accepts gzip"""
+        response = self.client.get(
+            "/api/exports/cash_movements.ndjson", HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        lines = self._content(response).splitlines()
+        self.assertEqual(len(lines), 1)
+        movement = json.loads(lines[0])
+        self.assertEqual(movement["amount"], "20.00")
+        self.assertEqual(movement["created_by"], "owner@example.com")
+
+    def test_unknown_columns_and_sources(self):
+        """Test that unknown columns are a 400 and unknown sources a 404"""
+        response = self.client.get("/api/exports/tables.csv?fields=number,secret")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get("/api/exports/orders.csv").status_code, 404)
+        self.assertEqual(self.client.get("/api/exports/tables.xml").status_code, 404)
+
+    def test_exports_require_an_admin(self):
+        """Test that cashiers cannot export tenant data"""
+        cashier = User.objects.create_user(
+            email="cashier@example.com", password="password123"
+        )
+        TenantUser.objects.create(tenant=self.tenant, user=cashier, role="cashier")
+        response = jwt_client(cashier).get("/api/exports/staff.csv")
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import ExportListView, ExportView
+
+urlpatterns = [
+    path("", ExportListView.as_view(), name="export-list"),
+    path("<slug:source>.<slug:file_format>", ExportView.as_view(), name="export"),
+]
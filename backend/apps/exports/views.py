@@ -0,0 +1,76 @@
+import re
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+from rest_framework import permissions
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.core.permissions import IsTenantAdmin
+from apps.core.timing import TimedViewMixin
+from .sources import SOURCES, SOURCES_BY_NAME
+from .streams import WRITERS, buffered, iter_rows
+
+accepts_gzip = re.compile(r"\bgzip\b")
+
+
+class ExportListView(TimedViewMixin, APIView):
+    """Export sources with their columns and file formats"""
+
+    permission_classes = [permissions.IsAuthenticated, IsTenantAdmin]
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            {
+                "formats": list(WRITERS),
+                "sources": {source.name: list(source.columns) for source in SOURCES},
+            }
+        )
+
+
+class ExportView(TimedViewMixin, APIView):
+    """
+    Stream a tenant data set as a file download
+
+    GET /api/exports/<source>.<ndjson|csv>?fields=a,b selects the columns
+    (all by default). The body is compressed on the fly when the client
+    accepts gzip.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsTenantAdmin]
+
+    def get(self, request, source, file_format, *args, **kwargs):
+        export = SOURCES_BY_NAME.get(source)
+        if export is None or file_format not in WRITERS:
+            raise NotFound("Unknown export.")
+
+        names = list(export.columns)
+        fields = request.query_params.get("fields")
+        if fields:
+            names = [name.strip() for name in fields.split(",") if name.strip()]
+            unknown = [name for name in names if name not in export.columns]
+            if unknown or not names:
+                raise ValidationError(
+                    {"fields": f"Unknown columns: {', '.join(unknown)}. Available: {', '.join(export.columns)}."}
+                )
+
+        write_lines, content_type = WRITERS[file_format]
+        rows = iter_rows(
+            export.queryset(request.tenant), [export.columns[name] for name in names]
+        )
+        stream = buffered(write_lines(names, rows))
+
+        gzip = accepts_gzip.search(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if gzip:
+            stream = compress_sequence(stream)
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        if gzip:
+            response.headers["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        filename = f"{request.tenant.slug}-{source}-{timezone.now():%Y%m%d}.{file_format}"
+        response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
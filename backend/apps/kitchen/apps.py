@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class KitchenConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.kitchen"
+    verbose_name = "Kitchen Display"
+
+    def ready(self):
+        from . import signals  # noqa: F401
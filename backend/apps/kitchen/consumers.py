@@ -0,0 +1,65 @@
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from apps.settings.counters.models import Counter
+from .fanout import TicketTransitionError, apply_ticket_action, kitchen_group, open_tickets
+
+
+class KitchenConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Kitchen screen of one counter (ws/kitchen/<counter id>/) or the expo
+    screen of all counters (ws/kitchen/)
+
+    Sends the open tickets on connect ({"event": "snapshot", "tickets":
+    [...]}), then {"event": "created"|"acknowledged"|"bumped", "ticket":
+    {...}} per change. Screens act on tickets by sending {"action":
+    "ack"|"bump", "ticket": <id>}; a refused action is answered with
+    {"event": "error", "ticket": <id>, "detail": "..."}.
+    """
+
+    async def connect(self):
+        tenant = self.scope.get("tenant")
+        if tenant is None:
+            # 4403: not authenticated or no access to the tenant
+            await self.close(code=4403)
+            return
+
+        self.tenant_id = tenant.pk
+        self.counter_id = self.scope["url_route"]["kwargs"].get("counter_id")
+        if self.counter_id is not None and not await self._counter_exists():
+            # 4404: no such counter in the tenant
+            await self.close(code=4404)
+            return
+
+        self.group = kitchen_group(self.tenant_id, self.counter_id)
+        await self.channel_layer.group_add(self.group, self.channel_name)
+        await self.accept()
+        tickets = await database_sync_to_async(open_tickets)(
+            self.tenant_id, self.counter_id
+        )
+        await self.send_json({"event": "snapshot", "tickets": tickets})
+
+    async def disconnect(self, code):
+        if hasattr(self, "group"):
+            await self.channel_layer.group_discard(self.group, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        if not isinstance(content, dict):
+            await self.send_json({"event": "error", "detail": "Invalid message."})
+            return
+        ticket_id = content.get("ticket")
+        try:
+            await database_sync_to_async(apply_ticket_action)(
+                self.tenant_id, ticket_id, content.get("action")
+            )
+        except TicketTransitionError as exc:
+            await self.send_json(
+                {"event": "error", "ticket": ticket_id, "detail": str(exc)}
+            )
+
+    async def kitchen_event(self, message):
+        await self.send_json(message["payload"])
+
+    @database_sync_to_async
+    def _counter_exists(self):
+        return Counter.objects.filter(tenant_id=self.tenant_id, pk=self.counter_id).exists()
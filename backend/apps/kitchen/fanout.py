@@ -0,0 +1,223 @@
+"""
+Kitchen display fan-out
+
+Every order checked out while a tenant has the kitchen display enabled is
+split into tickets, one per counter that makes any of its items (counters
+list the items they make in Counter.items). Each ticket is pushed to its
+counter's WebSocket group and to the expo group, which sees every ticket:
+
+    tenant-<id>.kitchen.<counter id>    one counter's screen
+    tenant-<id>.kitchen                 expo screen
+
+Routing reads a per-tenant map of menu item id -> active counter ids,
+built from the Counter.items table in one query and cached per version
+(apps.kitchen.signals bumps it when counters or their items change), so
+splitting an order costs one pass over its lines and one bulk INSERT,
+whatever its size.
+"""
+
+import time
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.websocket import broadcast, tenant_group
+from apps.settings.counters.models import Counter
+from .models import KitchenTicket
+from .serializers import KitchenTicketSerializer
+
+
+DEFAULTS = {
+    "ALIAS": "default",
+    "TTL": 24 * 60 * 60,
+    "KEY_PREFIX": "kitchen-routes",
+}
+
+KITCHEN_TOPIC = "kitchen"
+OPEN_STATUSES = ("new", "acknowledged")
+
+# action: (statuses it applies to, new status, timestamp field)
+TRANSITIONS = {
+    "ack": (("new",), "acknowledged", "acknowledged_at"),
+    "bump": (OPEN_STATUSES, "bumped", "bumped_at"),
+}
+
+
+class TicketTransitionError(Exception):
+    """A ticket cannot take the requested action"""
+
+
+def kitchen_group(tenant_id, counter_id=None):
+    """Group of one counter's screen, or of the expo screen without counter_id"""
+    if counter_id is None:
+        return tenant_group(tenant_id, KITCHEN_TOPIC)
+    return tenant_group(tenant_id, f"{KITCHEN_TOPIC}.{counter_id}")
+
+
+def build_routes(tenant_id):
+    """{menu item id: (counter ids)} of a tenant's active counters, in one query"""
+    routes = defaultdict(list)
+    for item_id, counter_id in Counter.items.through.objects.filter(
+        counter__tenant_id=tenant_id, counter__status="active"
+    ).values_list("menuitem_id", "counter_id"):
+        routes[item_id].append(counter_id)
+    return {item_id: tuple(counters) for item_id, counters in routes.items()}
+
+
+class KitchenRouteCache:
+    """
+    Per-tenant routing maps keyed by a version that is bumped on change
+
+    Like the menu catalog (apps.menu.catalog), the version is read before a
+    map is built, so a map built from data changed meanwhile is stored under
+    an already outdated key.
+    """
+
+    def __init__(self, options=None):
+        self.configure(options)
+
+    def configure(self, options=None):
+        config = dict(DEFAULTS)
+        config.update(options or getattr(settings, "KITCHEN_ROUTES_CACHE", {}))
+        self.config = config
+
+    @property
+    def cache(self):
+        return caches[self.config["ALIAS"]]
+
+    def _version_key(self, tenant_id):
+        return f"{self.config['KEY_PREFIX']}:version:{tenant_id}"
+
+    def get_version(self, tenant_id):
+        key = self._version_key(tenant_id)
+        version = self.cache.get(key)
+        if version is None:
+            # Seeded from the clock so a lost counter never revives old maps
+            self.cache.add(key, time.time_ns() // 1000, None)
+            version = self.cache.get(key)
+        return version
+
+    def bump(self, tenant_id):
+        try:
+            self.cache.incr(self._version_key(tenant_id))
+        except ValueError:
+            self.get_version(tenant_id)
+
+    def invalidate(self, tenant_id):
+        """Bump the version now and again on commit (see MenuCatalogCache)"""
+        self.bump(tenant_id)
+        transaction.on_commit(lambda: self.bump(tenant_id))
+
+    def get(self, tenant_id):
+        version = self.get_version(tenant_id)
+        key = f"{self.config['KEY_PREFIX']}:{tenant_id}:{version}"
+        routes = self.cache.get(key)
+        if routes is None:
+            routes = build_routes(tenant_id)
+            self.cache.set(key, routes, self.config["TTL"])
+        return routes
+
+
+kitchen_routes = KitchenRouteCache()
+
+
+def ticket_line(line):
+    """What a kitchen screen shows of an OrderLine"""
+    return {
+        "position": line.position,
+        "name": line.name,
+        "variant_name": line.variant_name,
+        "addons": [addon["name"] for addon in line.addons],
+        "quantity": line.quantity,
+        "notes": line.notes,
+    }
+
+
+def route_order(order, lines):
+    """
+    Create the kitchen tickets of a saved order and push them on commit
+
+    `lines` are the order's OrderLine objects. A line goes to every active
+    counter making its item; lines no counter makes share one ticket
+    without a counter. Returns the created tickets.
+    """
+    routes = kitchen_routes.get(order.tenant_id)
+    by_counter = defaultdict(list)
+    for line in lines:
+        for counter_id in routes.get(line.menu_item_id, (None,)):
+            by_counter[counter_id].append(ticket_line(line))
+
+    tickets = [
+        KitchenTicket(
+            tenant_id=order.tenant_id,
+            order=order,
+            counter_id=counter_id,
+            lines=counter_lines,
+        )
+        for counter_id, counter_lines in by_counter.items()
+    ]
+    KitchenTicket.objects.bulk_create(tickets)
+    for ticket in tickets:
+        publish_ticket(ticket, "created")
+    return tickets
+
+
+def publish_ticket(ticket, event):
+    """Push a ticket to its counter's screen and to expo once committed"""
+    message = {"event": event, "ticket": KitchenTicketSerializer(ticket).data}
+    groups = [kitchen_group(ticket.tenant_id)]
+    if ticket.counter_id is not None:
+        groups.append(kitchen_group(ticket.tenant_id, ticket.counter_id))
+    for group in groups:
+        broadcast(group, "kitchen.event", message)
+
+
+def ticket_queryset(tenant_id):
+    return KitchenTicket.objects.filter(tenant_id=tenant_id).select_related(
+        "order__table"
+    )
+
+
+def open_tickets(tenant_id, counter_id=None):
+    """
+    Serialized open tickets of a screen, oldest first
+
+    Sent when a screen connects. The expo screen (no counter_id) gets the
+    open tickets of every counter.
+    """
+    tickets = ticket_queryset(tenant_id).filter(status__in=OPEN_STATUSES)
+    if counter_id is not None:
+        tickets = tickets.filter(counter_id=counter_id)
+    return KitchenTicketSerializer(tickets, many=True).data
+
+
+def apply_ticket_action(tenant_id, ticket_id, action):
+    """
+    Acknowledge ("ack") or bump ("bump") a ticket and push the change
+
+    The status is changed with a conditional UPDATE, so of two screens
+    bumping the same ticket only one succeeds; the other gets a
+    TicketTransitionError, as do unknown tickets and actions.
+    """
+    if action not in TRANSITIONS:
+        raise TicketTransitionError(f"Unknown action: {action}.")
+    from_statuses, status, timestamp_field = TRANSITIONS[action]
+    try:
+        ticket_id = uuid.UUID(str(ticket_id))
+    except ValueError:
+        raise TicketTransitionError("A valid ticket id is required.")
+
+    now = timezone.now()
+    with transaction.atomic():
+        updated = ticket_queryset(tenant_id).filter(
+            pk=ticket_id, status__in=from_statuses
+        ).update(status=status, updated_at=now, **{timestamp_field: now})
+        if not updated:
+            raise TicketTransitionError(f"Ticket not found or cannot be {status}.")
+        ticket = ticket_queryset(tenant_id).get(pk=ticket_id)
+        publish_ticket(ticket, status)
+    return ticket
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:43
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('sales', '0001_initial'),
+        ('settings', '0005_counter_counter_tenant_updated_idx_and_more'),
+        ('tenants', '0002_tenantuser_tenant_user_tenant_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KitchenTicket',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('new', 'New'), ('acknowledged', 'Acknowledged'), ('bumped', 'Bumped')], default='new', max_length=15)),
+                ('lines', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('acknowledged_at', models.DateTimeField(blank=True, null=True)),
+                ('bumped_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('counter', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='kitchen_tickets', to='settings.counter')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='kitchen_tickets', to='sales.order')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='kitchen_tickets', to='tenants.tenant')),
+            ],
+            options={
+                'verbose_name': 'Kitchen Ticket',
+                'verbose_name_plural': 'Kitchen Tickets',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['tenant', 'counter', 'status', 'created_at'], name='kitchen_ticket_screen_idx')],
+            },
+        ),
+    ]
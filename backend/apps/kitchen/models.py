@@ -0,0 +1,59 @@
+from django.db import models
+from apps.tenants.models import Tenant
+from apps.sales.models import Order
+from apps.settings.counters.models import Counter
+import uuid
+
+
+class KitchenTicket(models.Model):
+    """
+    The lines of an order one counter has to prepare
+
+    Checkout creates one ticket per counter that makes any of the ordered
+    items (see apps.kitchen.fanout); lines no counter makes go on a ticket
+    without a counter, shown on the expo screen. Lines are copied from the
+    order, so a ticket is rendered without joining order lines.
+    """
+
+    STATUS_CHOICES = [
+        ("new", "New"),
+        ("acknowledged", "Acknowledged"),
+        ("bumped", "Bumped"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tenant = models.ForeignKey(
+        Tenant, on_delete=models.CASCADE, related_name="kitchen_tickets"
+    )
+    order = models.ForeignKey(
+        Order, on_delete=models.CASCADE, related_name="kitchen_tickets"
+    )
+    counter = models.ForeignKey(
+        Counter,
+        on_delete=models.CASCADE,
+        related_name="kitchen_tickets",
+        null=True,
+        blank=True,
+    )
+    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default="new")
+    # [{"position", "name", "variant_name", "addons", "quantity", "notes"}]
+    lines = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+    acknowledged_at = models.DateTimeField(null=True, blank=True)
+    bumped_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Kitchen Ticket"
+        verbose_name_plural = "Kitchen Tickets"
+        ordering = ["created_at"]
+        indexes = [
+            # Open tickets of a counter's screen, oldest first
+            models.Index(
+                fields=["tenant", "counter", "status", "created_at"],
+                name="kitchen_ticket_screen_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Ticket for order {self.order_id} ({self.status})"
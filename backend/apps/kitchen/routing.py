@@ -0,0 +1,7 @@
+from django.urls import path
+from .consumers import KitchenConsumer
+
+websocket_urlpatterns = [
+    path("ws/kitchen/", KitchenConsumer.as_asgi()),
+    path("ws/kitchen/<uuid:counter_id>/", KitchenConsumer.as_asgi()),
+]
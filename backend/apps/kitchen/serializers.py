@@ -0,0 +1,37 @@
+from rest_framework import serializers
+from .models import KitchenTicket
+
+
+class KitchenTicketSerializer(serializers.ModelSerializer):
+    """
+    Serializer for KitchenTicket model
+
+    Querysets should select_related("order__table"). Ids are rendered as
+    strings so the data can be sent over the channel layer as is.
+    """
+
+    order = serializers.UUIDField(source="order_id", read_only=True)
+    counter = serializers.UUIDField(source="counter_id", read_only=True, allow_null=True)
+
+    order_number = serializers.CharField(source="order.number", read_only=True)
+    order_type = serializers.CharField(source="order.order_type", read_only=True)
+    table = serializers.CharField(
+        source="order.table.number", read_only=True, allow_null=True
+    )
+
+    class Meta:
+        model = KitchenTicket
+        fields = [
+            "id",
+            "order",
+            "order_number",
+            "order_type",
+            "table",
+            "counter",
+            "status",
+            "lines",
+            "created_at",
+            "acknowledged_at",
+            "bumped_at",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,19 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.settings.counters.models import Counter
+from .fanout import kitchen_routes
+
+
+@receiver(post_save, sender=Counter)
+@receiver(post_delete, sender=Counter)
+def counter_changed(sender, instance, **kwargs):
+    kitchen_routes.invalidate(instance.tenant_id)
+
+
+@receiver(m2m_changed, sender=Counter.items.through)
+def counter_items_changed(sender, instance, action, **kwargs):
+    if not action.startswith("post_"):
+        return
+    # From MenuItem.counters the instance is an item; both carry the tenant
+    kitchen_routes.invalidate(instance.tenant_id)
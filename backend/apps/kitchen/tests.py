@@ -0,0 +1,202 @@
+from decimal import Decimal
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.test import TestCase, TransactionTestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.core.cache import tenant_membership_cache
+from apps.core.models import TenantSetting
+from apps.core.testing import QueryCountAssertionsMixin, jwt_client
+from apps.tenants.models import Tenant, TenantUser
+from apps.menu.models import MenuItem
+from apps.settings.counters.models import Counter
+from omnicore_backend.asgi import application
+from .fanout import build_routes, kitchen_routes
+from .models import KitchenTicket
+
+User = get_user_model()
+
+
+class KitchenFixtureMixin:
+    def create_fixture(self):
+        cache.clear()
+        tenant_membership_cache.clear()
+
+        self.user = User.objects.create_user(
+            email="cashier@example.com", password="password123"
+        )
+        self.tenant = Tenant.objects.create(
+            name="Test Restaurant", slug="test-restaurant", owner=self.user
+        )
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="cashier")
+        TenantSetting.objects.create(tenant=self.tenant)
+
+        self.pizza = MenuItem.objects.create(
+            tenant=self.tenant, name="Pizza", price=Decimal("10.00")
+        )
+        self.salad = MenuItem.objects.create(
+            tenant=self.tenant, name="Salad", price=Decimal("6.00")
+        )
+        self.soda = MenuItem.objects.create(
+            tenant=self.tenant, name="Soda", price=Decimal("2.00")
+        )
+        self.oven = Counter.objects.create(tenant=self.tenant, name="Oven")
+        self.cold = Counter.objects.create(tenant=self.tenant, name="Cold Kitchen")
+        self.oven.items.add(self.pizza)
+        self.cold.items.add(self.salad, self.pizza)
+
+    def checkout(self, client, lines):
+        return client.post(
+            "/api/sales/orders/",
+            {
+                "lines": [
+                    {"menu_item": str(item.id), "quantity": quantity}
+                    for item, quantity in lines
+                ]
+            },
+            format="json",
+        )
+
+
+class KitchenFanOutTestCase(KitchenFixtureMixin, QueryCountAssertionsMixin, TestCase):
+    def setUp(self):
+        self.create_fixture()
+        self.client = jwt_client(self.user)
+        # Warm the token, tenant membership, menu catalog and route caches
+        self.client.get("/api/kitchen/tickets/")
+        self.client.get("/api/menu/items/")
+        kitchen_routes.get(self.tenant.pk)
+
+    def test_order_is_split_per_counter(self):
+        """Test that each counter gets only the lines of items it makes"""
+        response = self.checkout(
+            self.client, [(self.pizza, 2), (self.salad, 1), (self.soda, 3)]
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+
+        tickets = {t.counter_id: t for t in KitchenTicket.objects.all()}
+        self.assertEqual(set(tickets), {self.oven.id, self.cold.id, None})
+        self.assertEqual(
+            [(l["name"], l["quantity"]) for l in tickets[self.oven.id].lines],
+            [("Pizza", 2)],
+        )
+        self.assertEqual(
+            [l["name"] for l in tickets[self.cold.id].lines], ["Pizza", "Salad"]
+        )
+        # Lines no counter makes go to expo
+        self.assertEqual([l["name"] for l in tickets[None].lines], ["Soda"])
+
+    def test_fan_out_queries_do_not_grow_with_lines(self):
+        """Test that routing a 40-line order adds a single INSERT"""
+        lines = [(self.pizza, 1), (self.salad, 1)] * 20
+        with self.assertMaxQueries(12):
+            response = self.checkout(self.client, lines)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(KitchenTicket.objects.count(), 2)
+
+    def test_routes_follow_counter_changes(self):
+        """Test that the cached map is rebuilt when counter items change"""
+        self.assertEqual(kitchen_routes.get(self.tenant.pk)[self.salad.id], (self.cold.id,))
+        self.oven.items.add(self.salad)
+        self.assertEqual(
+            set(kitchen_routes.get(self.tenant.pk)[self.salad.id]),
+            {self.oven.id, self.cold.id},
+        )
+        self.cold.status = "inactive"
+        self.cold.save()
+        self.assertEqual(kitchen_routes.get(self.tenant.pk), build_routes(self.tenant.pk))
+        self.assertEqual(kitchen_routes.get(self.tenant.pk)[self.salad.id], (self.oven.id,))
+
+    def test_disabled_kitchen_display_creates_no_tickets(self):
+        """Test that tenants without the kitchen display skip the fan-out"""
+        TenantSetting.objects.filter(tenant=self.tenant).update(
+            enable_kitchen_display=False
+        )
+        response = self.checkout(self.client, [(self.pizza, 1)])
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertFalse(KitchenTicket.objects.exists())
+
+    def test_ack_and_bump(self):
+        """Test the ticket status flow over the REST endpoints"""
+        self.checkout(self.client, [(self.salad, 1)])
+        ticket = KitchenTicket.objects.get()
+        url = f"/api/kitchen/tickets/{ticket.id}/"
+
+        response = self.client.post(url + "ack/")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["status"], "acknowledged")
+        self.assertEqual(self.client.post(url + "ack/").status_code, 400)
+
+        self.assertEqual(self.client.post(url + "bump/").json()["status"], "bumped")
+        response = self.client.get(
+            f"/api/kitchen/tickets/?counter={self.cold.id}&status=open"
+        )
+        self.assertEqual(response.json(), [])
+
+
+class KitchenConsumerTestCase(KitchenFixtureMixin, TransactionTestCase):
+    """Counter screens receive their own tickets and can bump them"""
+
+    def setUp(self):
+        self.create_fixture()
+
+    def _communicator(self, counter=None):
+        token = AccessToken.for_user(self.user)
+        path = f"/ws/kitchen/{counter.id}/" if counter else "/ws/kitchen/"
+        return WebsocketCommunicator(
+            application, f"{path}?token={token}&tenant={self.tenant.slug}"
+        )
+
+    async def _connect(self, counter=None):
+        communicator = self._communicator(counter)
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        snapshot = await communicator.receive_json_from()
+        self.assertEqual(snapshot["event"], "snapshot")
+        return communicator
+
+    async def test_screens_receive_only_their_tickets(self):
+        """Test the fan-out over WebSockets and a bump from a screen"""
+        oven = await self._connect(self.oven)
+        cold = await self._connect(self.cold)
+        expo = await self._connect()
+
+        client = jwt_client(self.user)
+        response = await database_sync_to_async(self.checkout)(
+            client, [(self.salad, 1), (self.soda, 1)]
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+
+        message = await cold.receive_json_from()
+        self.assertEqual(message["event"], "created")
+        self.assertEqual([l["name"] for l in message["ticket"]["lines"]], ["Salad"])
+        self.assertTrue(await oven.receive_nothing())
+        expo_tickets = [
+            (await expo.receive_json_from())["ticket"]["counter"] for _ in range(2)
+        ]
+        self.assertIn(None, expo_tickets)
+
+        ticket_id = message["ticket"]["id"]
+        await cold.send_json_to({"action": "bump", "ticket": ticket_id})
+        message = await cold.receive_json_from()
+        self.assertEqual(message["event"], "bumped")
+        self.assertEqual(message["ticket"]["id"], ticket_id)
+
+        await cold.send_json_to({"action": "bump", "ticket": ticket_id})
+        self.assertEqual((await cold.receive_json_from())["event"], "error")
+
+        for communicator in (oven, cold, expo):
+            await communicator.disconnect()
+
+    async def test_unknown_counter_is_rejected(self):
+        """Test that a screen of another tenant's counter is closed"""
+        other = await database_sync_to_async(Counter.objects.create)(
+            tenant=await database_sync_to_async(Tenant.objects.create)(
+                name="Other", slug="other", owner=self.user
+            ),
+            name="Oven",
+        )
+        connected, code = await self._communicator(other).connect()
+        self.assertFalse(connected)
+        self.assertEqual(code, 4404)
@@ -0,0 +1,72 @@
+import uuid
+
+from rest_framework import mixins, permissions, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from apps.core.permissions import IsTenantUser
+from apps.core.timing import TimedViewMixin, timed
+from .fanout import (
+    OPEN_STATUSES,
+    TicketTransitionError,
+    apply_ticket_action,
+    ticket_queryset,
+)
+from .models import KitchenTicket
+from .serializers import KitchenTicketSerializer
+
+
+class KitchenTicketViewSet(
+    TimedViewMixin,
+    mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
+):
+    """
+    ViewSet for the current tenant's kitchen tickets, for screens that
+    cannot hold a WebSocket (see apps.kitchen.consumers)
+
+    - List: Tickets oldest first; ?counter=<id> (or "none" for unrouted
+      lines) and ?status=new|acknowledged|bumped|open filter them
+    - Retrieve: Get a ticket
+    - ack / bump: Acknowledge or bump a ticket
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsTenantUser]
+    serializer_class = KitchenTicketSerializer
+
+    @timed("queryset")
+    def get_queryset(self):
+        if not hasattr(self.request, "tenant"):
+            return KitchenTicket.objects.none()
+        queryset = ticket_queryset(self.request.tenant.pk)
+
+        counter = self.request.query_params.get("counter")
+        if counter == "none":
+            queryset = queryset.filter(counter__isnull=True)
+        elif counter:
+            try:
+                queryset = queryset.filter(counter_id=uuid.UUID(counter))
+            except ValueError:
+                raise ValidationError({"counter": ["A valid counter id is required."]})
+
+        status = self.request.query_params.get("status")
+        if status == "open":
+            queryset = queryset.filter(status__in=OPEN_STATUSES)
+        elif status:
+            queryset = queryset.filter(status=status)
+        return queryset
+
+    def _apply(self, pk, name):
+        try:
+            ticket = apply_ticket_action(self.request.tenant.pk, pk, name)
+        except TicketTransitionError as exc:
+            raise ValidationError({"detail": str(exc)})
+        return Response(self.get_serializer(ticket).data)
+
+    @action(detail=True, methods=["post"])
+    def ack(self, request, pk=None):
+        return self._apply(pk, "ack")
+
+    @action(detail=True, methods=["post"])
+    def bump(self, request, pk=None):
+        return self._apply(pk, "bump")
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ManagementConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.management"
+
+    def ready(self):
+        from .table import signals  # noqa: F401
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0001_initial'),
+        ('tenants', '0002_tenantuser_tenant_user_tenant_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='restauranttable',
+            index=models.Index(fields=['tenant', 'updated_at'], name='table_tenant_updated_idx'),
+        ),
+    ]
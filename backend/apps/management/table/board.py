@@ -0,0 +1,66 @@
+"""
+Real-time table status board
+
+Every change to a tenant's tables is pushed to the tenant's "tables" group
+with the changed table and the board's status counts, so floor tablets
+keep a live board from one WebSocket (consumers.TableBoardConsumer)
+instead of polling the table list.
+"""
+
+from django.db.models import Count
+
+from apps.core.websocket import broadcast, tenant_group
+from .models import RestaurantTable
+from .serializers import RestaurantTableSerializer
+
+
+BOARD_TOPIC = "tables"
+STATUSES = [status for status, _ in RestaurantTable.STATUS_CHOICES]
+
+
+def table_counts(tenant_id):
+    """Number of tables per status plus the total, in one grouped query"""
+    counts = dict.fromkeys(STATUSES, 0)
+    for status, count in (
+        RestaurantTable.objects.filter(tenant_id=tenant_id)
+        .values_list("status")
+        .annotate(count=Count("id"))
+        .order_by()
+    ):
+        counts[status] = count
+    counts["total"] = sum(counts.values())
+    return counts
+
+
+def board_snapshot(tenant_id):
+    """All tables of a tenant with their counts, sent when a board connects"""
+    tables = RestaurantTable.objects.filter(tenant_id=tenant_id)
+    return {
+        "event": "snapshot",
+        "tables": RestaurantTableSerializer(tables, many=True).data,
+        "counts": table_counts(tenant_id),
+    }
+
+
+def publish_table_change(table, event):
+    """Push one table's change ("created", "updated" or "deleted") on commit"""
+    if event == "deleted":
+        data = {"id": str(table.pk)}
+    else:
+        data = RestaurantTableSerializer(table).data
+    tenant_id = table.tenant_id
+    broadcast(
+        tenant_group(tenant_id, BOARD_TOPIC),
+        "board.event",
+        # Counted when sent, so they include the committed change
+        lambda: {"event": event, "table": data, "counts": table_counts(tenant_id)},
+    )
+
+
+def publish_board_snapshot(tenant_id):
+    """Push the whole board, for bulk changes that bypass model signals"""
+    broadcast(
+        tenant_group(tenant_id, BOARD_TOPIC),
+        "board.event",
+        lambda: board_snapshot(tenant_id),
+    )
@@ -0,0 +1,34 @@
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from apps.core.websocket import tenant_group
+from .board import BOARD_TOPIC, board_snapshot
+
+
+class TableBoardConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Live table status board of the connection's tenant
+
+    Sends a snapshot (all tables and status counts) on connect, then one
+    message per table change: {"event": "created"|"updated"|"deleted",
+    "table": {...}, "counts": {...}}. Bulk changes send a new snapshot.
+    """
+
+    async def connect(self):
+        tenant = self.scope.get("tenant")
+        if tenant is None:
+            # 4403: not authenticated or no access to the tenant
+            await self.close(code=4403)
+            return
+
+        self.group = tenant_group(tenant.pk, BOARD_TOPIC)
+        await self.channel_layer.group_add(self.group, self.channel_name)
+        await self.accept()
+        await self.send_json(await database_sync_to_async(board_snapshot)(tenant.pk))
+
+    async def disconnect(self, code):
+        if hasattr(self, "group"):
+            await self.channel_layer.group_discard(self.group, self.channel_name)
+
+    async def board_event(self, message):
+        await self.send_json(message["payload"])
@@ -34,6 +34,12 @@ class RestaurantTable(models.Model):
         verbose_name_plural = 'Restaurant Tables'
         ordering = ['number']
         unique_together = ('tenant', 'number')
+        indexes = [
+            # Delta sync (apps.sync)
+            models.Index(
+                fields=['tenant', 'updated_at'], name='table_tenant_updated_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"Table {self.number} - {self.name} ({self.tenant.name})"
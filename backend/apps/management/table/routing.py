@@ -0,0 +1,6 @@
+from django.urls import path
+from .consumers import TableBoardConsumer
+
+websocket_urlpatterns = [
+    path("ws/tables/", TableBoardConsumer.as_asgi()),
+]
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.bulk import current_bulk_batch
+from .board import publish_table_change
+from .models import RestaurantTable
+
+
+@receiver(post_save, sender=RestaurantTable)
+def table_saved(sender, instance, created, **kwargs):
+    publish_table_change(instance, "created" if created else "updated")
+
+
+@receiver(post_delete, sender=RestaurantTable)
+def table_deleted(sender, instance, **kwargs):
+    if current_bulk_batch() is not None:
+        # Bulk deletes publish one snapshot (RestaurantTableViewSet.bulk_applied)
+        return
+    publish_table_change(instance, "deleted")
@@ -1,7 +1,13 @@
-from django.test import TestCase, RequestFactory
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.test import TestCase, TransactionTestCase, RequestFactory
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.core.cache import tenant_membership_cache
 from apps.tenants.models import Tenant, TenantUser
+from omnicore_backend.asgi import application
 from .models import RestaurantTable
 from .views import RestaurantTableViewSet
 
@@ -69,3 +75,59 @@ class RestaurantTableViewSetTestCase(TestCase):
         )
         self.assertEqual(response.status_code, 201)
         self.assertEqual(response.data["message"], "Table created successfully")
+
+
+class TableBoardTestCase(TransactionTestCase):
+    """The table board pushes a snapshot, then every table change"""
+
+    def setUp(self):
+        cache.clear()
+        tenant_membership_cache.clear()
+
+        self.user = User.objects.create_user(
+            email="test@example.com", password="password123"
+        )
+        self.tenant = Tenant.objects.create(
+            name="Test Restaurant", slug="test-restaurant", owner=self.user
+        )
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="waiter")
+        self.table = RestaurantTable.objects.create(tenant=self.tenant, number="T1")
+
+    def _communicator(self, token=None):
+        token = token or AccessToken.for_user(self.user)
+        return WebsocketCommunicator(
+            application, f"/ws/tables/?token={token}&tenant={self.tenant.slug}"
+        )
+
+    async def test_board_receives_snapshot_and_changes(self):
+        """Test that a board gets the snapshot and live deltas with counts"""
+        communicator = self._communicator()
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        snapshot = await communicator.receive_json_from()
+        self.assertEqual(snapshot["event"], "snapshot")
+        self.assertEqual([t["number"] for t in snapshot["tables"]], ["T1"])
+        self.assertEqual(snapshot["counts"]["available"], 1)
+
+        self.table.status = "occupied"
+        await database_sync_to_async(self.table.save)()
+        message = await communicator.receive_json_from()
+        self.assertEqual(message["event"], "updated")
+        self.assertEqual(message["table"]["status"], "occupied")
+        self.assertEqual(
+            message["counts"],
+            {"available": 0, "occupied": 1, "reserved": 0, "inactive": 0, "total": 1},
+        )
+
+        await database_sync_to_async(self.table.delete)()
+        message = await communicator.receive_json_from()
+        self.assertEqual(message["event"], "deleted")
+        self.assertEqual(message["counts"]["total"], 0)
+        await communicator.disconnect()
+
+    async def test_invalid_token_is_rejected(self):
+        """Test that a connection without a valid token is closed"""
+        connected, code = await self._communicator(token="invalid").connect()
+        self.assertFalse(connected)
+        self.assertEqual(code, 4403)
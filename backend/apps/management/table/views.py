@@ -3,11 +3,14 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from django.db.models import Count
 from .models import RestaurantTable
+from .board import publish_board_snapshot
 from .serializers import RestaurantTableSerializer
+from apps.core.bulk import BulkActionsMixin
 from apps.core.permissions import IsTenantUser, IsTenantAdmin, IsTenantOwner
+from apps.core.timing import TimedViewMixin, timed
 
 
-class RestaurantTableViewSet(viewsets.ModelViewSet):
+class RestaurantTableViewSet(TimedViewMixin, BulkActionsMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing restaurant tables
 
@@ -16,6 +19,7 @@ class RestaurantTableViewSet(viewsets.ModelViewSet):
     - Retrieve: Get details of a specific table
     - Update: Update a table
     - Delete: Delete a table
+    - Bulk: Create, update or delete many tables (bulk/)
 
     Access requires an authenticated user with access to the tenant.
     The tenant is determined from the authenticated user and X-Tenant-Workspace header.
@@ -24,6 +28,17 @@ class RestaurantTableViewSet(viewsets.ModelViewSet):
     serializer_class = RestaurantTableSerializer
     permission_classes = [permissions.IsAuthenticated, IsTenantUser]
 
+    # Lists may read from a replica (see apps.core.replicas)
+    replica_actions = ("list",)
+
+    bulk_serializer_class = RestaurantTableSerializer
+    bulk_unique_fields = ('number',)
+
+    def bulk_applied(self):
+        # Bulk writes send no per-row signals; refresh live boards at once
+        publish_board_snapshot(self.request.tenant.pk)
+
+    @timed("queryset")
     def get_queryset(self):
         """
         Get tables for the current tenant
@@ -88,7 +103,8 @@ class RestaurantTableViewSet(viewsets.ModelViewSet):
         List all tables with optional counts
         """
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page if page is not None else queryset, many=True)
         
         # Check if we should include counts
         include_counts = request.query_params.get('include_counts', '').lower() == 'true'
@@ -110,14 +126,21 @@ class RestaurantTableViewSet(viewsets.ModelViewSet):
                 if status not in counts:
                     counts[status] = 0
             
-            return Response({
+            return self._list_response({
                 "data": serializer.data,
                 "counts": counts
-            })
+            }, page)
         
-        return Response({
+        return self._list_response({
             "data": serializer.data
-        })
+        }, page)
+
+    def _list_response(self, body, page):
+        """Add cursor links to the list body when the client asked for a page"""
+        if page is not None:
+            body["next"] = self.paginator.get_next_link()
+            body["previous"] = self.paginator.get_previous_link()
+        return Response(body)
         
     def destroy(self, request, *args, **kwargs):
         """
@@ -0,0 +1,158 @@
+"""
+Versioned, cached menu catalog of a tenant
+
+The catalog is the serialized form of a tenant's categories, menu items
+(with active variants), addons and addon groups. It is built once per
+catalog version and stored in a Django cache alias; every menu model
+save/delete bumps the tenant's version (see apps.menu.signals), so the next
+read rebuilds it lazily. Menu list endpoints, the POS bootstrap and checkout
+pricing read from it instead of querying the menu tables.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Prefetch
+
+from apps.core.replicas import primary_reads
+from .models import (
+    Category,
+    MenuItem,
+    MenuItemAddon,
+    MenuItemAddonGroup,
+    MenuItemAddonGroupItem,
+)
+from .serializers import (
+    CategorySerializer,
+    MenuItemAddonGroupSerializer,
+    MenuItemAddonSerializer,
+    MenuItemSerializer,
+    active_variants_prefetch,
+)
+
+
+DEFAULTS = {
+    "ALIAS": "default",
+    "TTL": 24 * 60 * 60,
+    "KEY_PREFIX": "menu-catalog",
+}
+
+# Catalog fields holding uploaded images, stored as relative URLs
+IMAGE_FIELDS = ("image",)
+
+
+def build_catalog(tenant):
+    """Serialize the full menu of a tenant with a fixed number of queries"""
+    categories = Category.objects.filter(tenant=tenant)
+    items = (
+        MenuItem.objects.filter(tenant=tenant)
+        .select_related("category")
+        .prefetch_related(active_variants_prefetch())
+    )
+    addons = MenuItemAddon.objects.filter(tenant=tenant)
+    addon_groups = MenuItemAddonGroup.objects.filter(tenant=tenant).prefetch_related(
+        Prefetch(
+            "items",
+            queryset=MenuItemAddonGroupItem.objects.select_related("addon"),
+        )
+    )
+    # No request in the context: image URLs stay relative and are made
+    # absolute per request by absolute_image_urls()
+    return {
+        "categories": CategorySerializer(categories, many=True).data,
+        "items": MenuItemSerializer(items, many=True).data,
+        "addons": MenuItemAddonSerializer(addons, many=True).data,
+        "addon_groups": MenuItemAddonGroupSerializer(addon_groups, many=True).data,
+    }
+
+
+def absolute_image_urls(entries, request):
+    """Return catalog entries with image URLs made absolute for the request"""
+    if request is None:
+        return entries
+    result = []
+    for entry in entries:
+        if any(entry.get(field) for field in IMAGE_FIELDS):
+            entry = dict(entry)
+            for field in IMAGE_FIELDS:
+                if entry.get(field):
+                    entry[field] = request.build_absolute_uri(entry[field])
+        result.append(entry)
+    return result
+
+
+class MenuCatalogCache:
+    """
+    Per-tenant catalog blobs keyed by a monotonically increasing version
+
+    The version counter is seeded from the clock the first time it is read,
+    so a counter lost to eviction restarts above every version handed out
+    before and never revives a stale blob.
+    """
+
+    def __init__(self, options=None):
+        self.configure(options)
+
+    def configure(self, options=None):
+        config = dict(DEFAULTS)
+        config.update(options or getattr(settings, "MENU_CATALOG_CACHE", {}))
+        self.config = config
+
+    @property
+    def cache(self):
+        return caches[self.config["ALIAS"]]
+
+    def _version_key(self, tenant_id):
+        return f"{self.config['KEY_PREFIX']}:version:{tenant_id}"
+
+    def _catalog_key(self, tenant_id, version):
+        return f"{self.config['KEY_PREFIX']}:{tenant_id}:{version}"
+
+    def get_version(self, tenant_id):
+        """Current catalog version of a tenant"""
+        key = self._version_key(tenant_id)
+        version = self.cache.get(key)
+        if version is None:
+            self.cache.add(key, time.time_ns() // 1000, None)
+            version = self.cache.get(key)
+        return version
+
+    def bump(self, tenant_id):
+        """Move a tenant to a new catalog version"""
+        key = self._version_key(tenant_id)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.get_version(tenant_id)
+
+    def invalidate(self, tenant_id):
+        """
+        Menu data of a tenant is changing: bump the version now and again on
+        commit, so a catalog rebuilt from not yet committed data in between
+        is never served afterwards
+        """
+        self.bump(tenant_id)
+        transaction.on_commit(lambda: self.bump(tenant_id))
+
+    def get(self, tenant):
+        """
+        Return the tenant's catalog, building it if this version is not cached
+
+        The version is read before building, so a change committed while the
+        catalog is being built leaves it under an already outdated key.
+        """
+        version = self.get_version(tenant.pk)
+        key = self._catalog_key(tenant.pk, version)
+        catalog = self.cache.get(key)
+        if catalog is None:
+            # A catalog built from a lagging replica would be cached as
+            # the current version
+            with primary_reads():
+                catalog = {"version": version, **build_catalog(tenant)}
+            self.cache.set(key, catalog, self.config["TTL"])
+        return catalog
+
+
+menu_catalog = MenuCatalogCache()
@@ -0,0 +1,389 @@
+"""
+Streaming menu import from CSV or XLSX files
+
+A file has a header row and one row per item, or per variant: rows sharing
+an item name add variants to that item, whose columns are read from its
+first row. Columns (only "name" is required):
+
+    category, name, description, price, cost, is_active, preparation_time,
+    variant, variant_price, variant_cost
+
+Items are matched to the tenant's existing items by name, variants by item
+and name, categories by name; matches are updated, the rest created. Rows
+are read one at a time, validated with the menu serializers' field rules
+and written in chunks with bulk_create / bulk_update. Names resolve through
+lookup tables of ids loaded once per import; current values are only read
+per chunk to diff updates. Memory therefore depends on the size of the
+menu, never on the number of rows in the file.
+
+An import is all or nothing: if any row is invalid, nothing is saved and
+the first errors are reported by row number.
+"""
+
+import codecs
+import csv
+from collections import namedtuple
+from zipfile import BadZipFile
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .catalog import menu_catalog
+from .models import Category, MenuItem, MenuItemVariant
+from .serializers import (
+    CategorySerializer,
+    MenuItemImportSerializer,
+    MenuItemVariantBulkSerializer,
+)
+
+
+ITEM_COLUMNS = {
+    "name": "name",
+    "description": "description",
+    "price": "price",
+    "cost": "cost",
+    "is_active": "is_active",
+    "preparation_time": "preparation_time",
+}
+VARIANT_COLUMNS = {
+    "variant": "name",
+    "variant_price": "price",
+    "variant_cost": "cost",
+}
+
+# A planned write. kind: "categories", "items" or "variants"; action:
+# "create" or "update"; changes: {field: (old, new)} for updates
+Change = namedtuple("Change", "row kind action name changes")
+
+
+class MenuImportError(Exception):
+    """The file cannot be read as a menu import"""
+
+
+def read_rows(file, file_format):
+    """Yield the data rows of a binary CSV or XLSX file as {column: value}"""
+    if file_format == "csv":
+        return _read_csv(file)
+    if file_format == "xlsx":
+        return _read_xlsx(file)
+    raise MenuImportError(f"Unsupported file format: {file_format}.")
+
+
+def _header(values):
+    if values is None:
+        raise MenuImportError("The file is empty.")
+    header = [str(value or "").strip().lower() for value in values]
+    if "name" not in header:
+        raise MenuImportError('Missing required column "name".')
+    return header
+
+
+def _read_csv(file):
+    try:
+        reader = csv.reader(codecs.iterdecode(file, "utf-8-sig"))
+        header = _header(next(reader, None))
+        for values in reader:
+            yield dict(zip(header, values))
+    except UnicodeDecodeError:
+        raise MenuImportError("CSV files must be UTF-8 encoded.")
+    except csv.Error as exc:
+        raise MenuImportError(f"Invalid CSV file: {exc}.")
+
+
+def _read_xlsx(file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise MenuImportError("XLSX import requires the openpyxl package.")
+
+    try:
+        # Read-only mode streams rows instead of loading the whole sheet
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except (BadZipFile, OSError, KeyError):
+        raise MenuImportError("Invalid XLSX file.")
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = _header(next(rows, None))
+        for values in rows:
+            yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def _clean(row, columns):
+    """Non-blank values of the given columns, keyed by field name"""
+    values = {}
+    for column, field in columns.items():
+        value = row.get(column)
+        if isinstance(value, str):
+            value = value.strip()
+        if value is not None and value != "":
+            values[field] = value
+    return values
+
+
+class ImportResult:
+    """Outcome of an import: change counts and the first row errors"""
+
+    MAX_ERRORS = 100
+
+    def __init__(self, dry_run):
+        self.dry_run = dry_run
+        self.saved = False
+        self.rows = 0
+        self.counts = {
+            kind: {"created": 0, "updated": 0, "unchanged": 0}
+            for kind in ("categories", "items", "variants")
+        }
+        self.errors = []
+        self.error_count = 0
+
+    def add_error(self, row, errors):
+        self.error_count += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "dry_run": self.dry_run,
+            "saved": self.saved,
+            "rows": self.rows,
+            "counts": self.counts,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+
+class MenuImporter:
+    """
+    Imports menu rows into a tenant's menu
+
+        result = MenuImporter(tenant).run(read_rows(file, "csv"))
+
+    - chunk_size: rows written per round of bulk_create / bulk_update
+    - dry_run: plan the changes without saving anything
+    - on_change(change): called with every planned Change (the diff)
+    - on_progress(rows): called after each chunk with the rows read so far
+    """
+
+    def __init__(
+        self, tenant, chunk_size=500, dry_run=False, on_change=None, on_progress=None
+    ):
+        self.tenant = tenant
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.on_change = on_change
+        self.on_progress = on_progress
+        self.result = ImportResult(dry_run)
+
+        # Serializers are only used for validation, so one instance of each
+        # validates every row
+        self.category_serializer = CategorySerializer()
+        self.create_serializer = MenuItemImportSerializer()
+        self.update_serializer = MenuItemImportSerializer(partial=True)
+        self.variant_serializer = MenuItemVariantBulkSerializer()
+
+    def run(self, rows):
+        self._load_lookups()
+        self._reset_chunk()
+        try:
+            with transaction.atomic():
+                for number, row in enumerate(rows, start=2):
+                    self.result.rows += 1
+                    self._stage(number, row)
+                    if self.chunk_rows >= self.chunk_size:
+                        self._flush()
+                self._flush()
+
+                if self.result.error_count and not self.dry_run:
+                    raise _Rollback
+        except _Rollback:
+            return self.result
+
+        if not self.dry_run:
+            self.result.saved = True
+            menu_catalog.invalidate(self.tenant.pk)
+        return self.result
+
+    def _load_lookups(self):
+        """Ids of the tenant's categories, items and variants by name"""
+        self.categories = dict(
+            Category.objects.filter(tenant=self.tenant).values_list("name", "id")
+        )
+        self.items = {}
+        for name, item_id in (
+            MenuItem.objects.filter(tenant=self.tenant)
+            .order_by("created_at")
+            .values_list("name", "id")
+            .iterator()
+        ):
+            # With duplicate names the oldest item is the one updated
+            self.items.setdefault(name, item_id)
+        self.variants = {
+            (item_id, name): variant_id
+            for item_id, name, variant_id in MenuItemVariant.objects.filter(
+                menu_item__tenant=self.tenant
+            )
+            .values_list("menu_item_id", "name", "id")
+            .iterator()
+        }
+        # Ids already imported from an earlier row of the file
+        self.imported_items = set()
+        self.imported_variants = set()
+
+    def _reset_chunk(self):
+        self.chunk_rows = 0
+        self.new_categories = []
+        self.new_items = []
+        self.new_variants = []
+        self.item_updates = []
+        self.variant_updates = []
+
+    def _validate(self, serializer, values, columns=None):
+        """Validated values, or raise ValidationError keyed by file column"""
+        try:
+            return serializer.run_validation(values)
+        except ValidationError as exc:
+            detail = exc.detail
+            if columns and isinstance(detail, dict):
+                fields = {field: column for column, field in columns.items()}
+                detail = {fields.get(key, key): value for key, value in detail.items()}
+            raise ValidationError(detail)
+
+    def _stage(self, number, row):
+        """Validate a row and queue its writes for the current chunk"""
+        item_values = _clean(row, ITEM_COLUMNS)
+        variant_values = _clean(row, VARIANT_COLUMNS)
+        category_name = _clean(row, {"category": "name"}).get("name")
+
+        name = item_values.get("name")
+        item_id = self.items.get(name) if name else None
+        first_row = item_id is None or item_id not in self.imported_items
+
+        errors = {}
+        item = variant = None
+        if first_row:
+            serializer = self.update_serializer if item_id else self.create_serializer
+            try:
+                item = self._validate(serializer, item_values)
+            except ValidationError as exc:
+                errors.update(exc.detail)
+        if variant_values:
+            try:
+                variant = self._validate(
+                    self.variant_serializer, variant_values, VARIANT_COLUMNS
+                )
+            except ValidationError as exc:
+                errors.update(exc.detail)
+            else:
+                variant_id = self.variants.get((item_id, variant["name"]))
+                if variant_id in self.imported_variants:
+                    errors["variant"] = ["Duplicate variant of this item in the file."]
+        if category_name and first_row and category_name not in self.categories:
+            try:
+                self._validate(self.category_serializer, {"name": category_name})
+            except ValidationError as exc:
+                errors["category"] = exc.detail["name"]
+
+        if errors:
+            self.result.add_error(number, errors)
+            return
+
+        if first_row:
+            if category_name:
+                item["category_id"] = self._resolve_category(number, category_name)
+            if item_id is None:
+                instance = MenuItem(tenant=self.tenant, **item)
+                item_id = self.items[name] = instance.pk
+                self.new_items.append((number, instance))
+            else:
+                self.item_updates.append((number, item_id, item))
+            self.imported_items.add(item_id)
+
+        if variant:
+            variant_id = self.variants.get((item_id, variant["name"]))
+            if variant_id is None:
+                instance = MenuItemVariant(menu_item_id=item_id, **variant)
+                variant_id = self.variants[(item_id, variant["name"])] = instance.pk
+                self.new_variants.append((number, instance))
+            else:
+                self.variant_updates.append((number, variant_id, variant))
+            self.imported_variants.add(variant_id)
+
+        self.chunk_rows += 1
+
+    def _resolve_category(self, number, name):
+        category_id = self.categories.get(name)
+        if category_id is None:
+            category = Category(tenant=self.tenant, name=name)
+            category_id = self.categories[name] = category.pk
+            self.new_categories.append((number, category))
+        return category_id
+
+    def _diff(self, kind, model, updates):
+        """Apply queued updates to current rows; returns the changed rows and fields"""
+        current = model.objects.in_bulk([row_id for _, row_id, _ in updates])
+        changed = []
+        fields = set()
+        for number, row_id, values in updates:
+            instance = current[row_id]
+            changes = {
+                field: (getattr(instance, field), value)
+                for field, value in values.items()
+                if getattr(instance, field) != value
+            }
+            if not changes:
+                self.result.counts[kind]["unchanged"] += 1
+                continue
+            for field, (_, value) in changes.items():
+                setattr(instance, field, value)
+            fields.update(changes)
+            changed.append(instance)
+            self._report(Change(number, kind, "update", instance.name, changes))
+        return changed, fields
+
+    def _report(self, change):
+        action = "created" if change.action == "create" else "updated"
+        self.result.counts[change.kind][action] += 1
+        if self.on_change:
+            self.on_change(change)
+
+    def _flush(self):
+        """Write the current chunk (unless validating only) and report progress"""
+        if self.chunk_rows and not (self.result.error_count and not self.dry_run):
+            for kind, created in (
+                ("categories", self.new_categories),
+                ("items", self.new_items),
+                ("variants", self.new_variants),
+            ):
+                for number, instance in created:
+                    self._report(Change(number, kind, "create", instance.name, {}))
+            items, item_fields = self._diff("items", MenuItem, self.item_updates)
+            variants, variant_fields = self._diff(
+                "variants", MenuItemVariant, self.variant_updates
+            )
+
+            if not self.dry_run:
+                Category.objects.bulk_create(c for _, c in self.new_categories)
+                MenuItem.objects.bulk_create(i for _, i in self.new_items)
+                MenuItemVariant.objects.bulk_create(v for _, v in self.new_variants)
+                self._bulk_update(MenuItem, items, item_fields)
+                self._bulk_update(MenuItemVariant, variants, variant_fields)
+
+        self._reset_chunk()
+        if self.on_progress:
+            self.on_progress(self.result.rows)
+
+    def _bulk_update(self, model, instances, fields):
+        if not instances:
+            return
+        # bulk_update does not apply auto_now
+        now = timezone.now()
+        for instance in instances:
+            instance.updated_at = now
+        model.objects.bulk_update(instances, sorted(fields | {"updated_at"}))
+
+
+class _Rollback(Exception):
+    """Raised to roll back an import that had invalid rows"""
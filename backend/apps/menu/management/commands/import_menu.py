@@ -0,0 +1,68 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.menu.importer import MenuImporter, MenuImportError, read_rows
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Imports menu items, variants and categories from a CSV or XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='CSV or XLSX file to import')
+        parser.add_argument('--tenant', type=str, required=True, help='Slug of the tenant to import into')
+        parser.add_argument('--format', choices=['csv', 'xlsx'], help='File format (defaults to the file extension)')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Rows written per batch')
+        parser.add_argument('--dry-run', action='store_true', help='Print the changes without saving them')
+
+    def handle(self, *args, **options):
+        try:
+            tenant = Tenant.objects.get(slug=options['tenant'])
+        except Tenant.DoesNotExist:
+            raise CommandError(f'Tenant "{options["tenant"]}" does not exist')
+
+        path = options['path']
+        file_format = options.get('format') or os.path.splitext(path)[1].lstrip('.').lower()
+        dry_run = options.get('dry_run')
+
+        importer = MenuImporter(
+            tenant,
+            chunk_size=options['chunk_size'],
+            dry_run=dry_run,
+            on_change=self._print_change if dry_run else None,
+            on_progress=lambda rows: self.stderr.write(f'{rows} rows processed'),
+        )
+        try:
+            with open(path, 'rb') as file:
+                result = importer.run(read_rows(file, file_format))
+        except (OSError, MenuImportError) as exc:
+            raise CommandError(str(exc))
+
+        for error in result.errors:
+            details = '; '.join(
+                f'{column}: {" ".join(str(message) for message in messages)}'
+                for column, messages in error['errors'].items()
+            )
+            self.stdout.write(self.style.ERROR(f'Row {error["row"]}: {details}'))
+        if result.error_count > len(result.errors):
+            self.stdout.write(self.style.ERROR(f'... {result.error_count - len(result.errors)} more invalid row(s)'))
+
+        counts = ', '.join(
+            f'{kind}: {c["created"]} created, {c["updated"]} updated, {c["unchanged"]} unchanged'
+            for kind, c in result.counts.items()
+        )
+        if result.error_count:
+            raise CommandError(f'{result.error_count} invalid row(s) in {result.rows}; nothing was saved')
+        if dry_run:
+            self.stdout.write(f'Dry run of {result.rows} row(s), nothing was saved. {counts}')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Imported {result.rows} row(s). {counts}'))
+
+    def _print_change(self, change):
+        line = f'Row {change.row}: {change.action} {change.kind} "{change.name}"'
+        if change.changes:
+            line += ': ' + ', '.join(
+                f'{field} {old} -> {new}' for field, (old, new) in change.changes.items()
+            )
+        self.stdout.write(line)
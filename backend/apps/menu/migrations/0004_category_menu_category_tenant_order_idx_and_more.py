@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0003_alter_menuitem_options_remove_menuitem_calories_and_more'),
+        ('tenants', '0002_tenantuser_tenant_user_tenant_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['tenant', 'display_order', 'name'], name='menu_category_tenant_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='menuitem',
+            index=models.Index(fields=['tenant', 'name'], name='menu_item_tenant_name_idx'),
+        ),
+    ]
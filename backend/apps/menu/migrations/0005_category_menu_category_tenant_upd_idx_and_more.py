@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0004_category_menu_category_tenant_order_idx_and_more'),
+        ('tenants', '0002_tenantuser_tenant_user_tenant_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['tenant', 'updated_at'], name='menu_category_tenant_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='menuitem',
+            index=models.Index(fields=['tenant', 'updated_at'], name='menu_item_tenant_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='menuitemvariant',
+            index=models.Index(fields=['updated_at'], name='menu_variant_updated_idx'),
+        ),
+    ]
@@ -28,6 +28,17 @@ class Category(models.Model):
         verbose_name_plural = "Categories"
         ordering = ["display_order", "name"]
         unique_together = ["tenant", "name"]
+        indexes = [
+            # Keyset pagination over the default ordering
+            models.Index(
+                fields=["tenant", "display_order", "name"],
+                name="menu_category_tenant_order_idx",
+            ),
+            # Delta sync (apps.sync)
+            models.Index(
+                fields=["tenant", "updated_at"], name="menu_category_tenant_upd_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.tenant.name})"
@@ -59,6 +70,14 @@ class MenuItem(models.Model):
         verbose_name = "Menu Item"
         verbose_name_plural = "Menu Items"
         ordering = ["name"]
+        indexes = [
+            # Keyset pagination over the default ordering
+            models.Index(fields=["tenant", "name"], name="menu_item_tenant_name_idx"),
+            # Delta sync (apps.sync)
+            models.Index(
+                fields=["tenant", "updated_at"], name="menu_item_tenant_updated_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.tenant.name})"
@@ -86,6 +105,10 @@ class MenuItemVariant(models.Model):
         verbose_name_plural = "Menu Item Variants"
         ordering = ["display_order", "name"]
         unique_together = ["menu_item", "name"]
+        indexes = [
+            # Delta sync (apps.sync); variants reach their tenant via menu_item
+            models.Index(fields=["updated_at"], name="menu_variant_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.menu_item.name} - {self.name}"
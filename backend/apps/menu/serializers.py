@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 from .models import (
     Category,
@@ -95,8 +96,23 @@ class MenuItemAddonGroupSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
 
+def active_variants_prefetch():
+    """Prefetch of a menu item's active variants in display order"""
+    return Prefetch(
+        "variants",
+        queryset=MenuItemVariant.objects.filter(is_active=True).order_by(
+            "display_order", "name"
+        ),
+    )
+
+
 class MenuItemSerializer(serializers.ModelSerializer):
-    """Serializer for MenuItem model"""
+    """
+    Serializer for MenuItem model
+
+    Reads item.category and item.variants; querysets should use
+    select_related("category") and active_variants_prefetch().
+    """
 
     category_name = serializers.CharField(source="category.name", read_only=True)
     variants = MenuItemVariantSerializer(many=True, read_only=True)
@@ -126,3 +142,89 @@ class MenuItemDetailSerializer(MenuItemSerializer):
 
     class Meta(MenuItemSerializer.Meta):
         fields = MenuItemSerializer.Meta.fields + []
+
+
+class MenuItemVariantBulkSerializer(serializers.ModelSerializer):
+    """Variant row nested in a bulk menu item row"""
+
+    class Meta:
+        model = MenuItemVariant
+        fields = ["name", "price", "cost", "is_active", "display_order"]
+
+
+class MenuItemVariantRowSerializer(MenuItemVariantBulkSerializer):
+    """
+    Row of a bulk variant request (MenuItemVariantViewSet.bulk)
+
+    The menu item is a plain id checked per batch by the view; it is set
+    when creating variants and cannot be changed.
+    """
+
+    menu_item = serializers.UUIDField(source="menu_item_id")
+
+    class Meta(MenuItemVariantBulkSerializer.Meta):
+        fields = ["menu_item"] + MenuItemVariantBulkSerializer.Meta.fields
+
+    def validate_menu_item(self, value):
+        if self.partial:
+            raise serializers.ValidationError(
+                "Variants cannot be moved to another item."
+            )
+        return value
+
+
+class MenuItemBulkSerializer(serializers.ModelSerializer):
+    """
+    Row of a bulk menu item request (MenuItemViewSet.bulk)
+
+    The category is a plain id checked per batch by the view; variants may
+    be given when creating items.
+    """
+
+    category = serializers.UUIDField(
+        source="category_id", required=False, allow_null=True
+    )
+    variants = MenuItemVariantBulkSerializer(many=True, required=False)
+
+    class Meta:
+        model = MenuItem
+        fields = [
+            "category",
+            "name",
+            "description",
+            "price",
+            "cost",
+            "is_active",
+            "preparation_time",
+            "variants",
+        ]
+
+    def validate_variants(self, value):
+        if self.partial:
+            raise serializers.ValidationError(
+                "Variants can only be set when creating items."
+            )
+        names = [variant["name"] for variant in value]
+        if len(names) != len(set(names)):
+            raise serializers.ValidationError("Variant names must be unique.")
+        return value
+
+
+class MenuItemImportSerializer(serializers.ModelSerializer):
+    """
+    Item columns of a menu import row (apps.menu.importer)
+
+    Uses the field rules of MenuItemSerializer; the category is given by
+    name and resolved by the importer.
+    """
+
+    class Meta:
+        model = MenuItem
+        fields = [
+            "name",
+            "description",
+            "price",
+            "cost",
+            "is_active",
+            "preparation_time",
+        ]
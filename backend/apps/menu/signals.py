@@ -0,0 +1,99 @@
+from collections import defaultdict
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.bulk import current_bulk_batch
+from .catalog import menu_catalog
+from .models import (
+    Category,
+    MenuItem,
+    MenuItemAddon,
+    MenuItemAddonGroup,
+    MenuItemAddonGroupItem,
+    MenuItemVariant,
+)
+
+
+def get_menu_tenant_id(instance):
+    """Tenant of a tenant-owned row, following parents for menu child rows"""
+    if isinstance(instance, MenuItemVariant):
+        if MenuItemVariant.menu_item.is_cached(instance):
+            return instance.menu_item.tenant_id
+        return MenuItem.objects.filter(pk=instance.menu_item_id).values_list(
+            "tenant_id", flat=True
+        ).first()
+    if isinstance(instance, MenuItemAddonGroupItem):
+        if MenuItemAddonGroupItem.group.is_cached(instance):
+            return instance.group.tenant_id
+        return MenuItemAddonGroup.objects.filter(pk=instance.group_id).values_list(
+            "tenant_id", flat=True
+        ).first()
+    return instance.tenant_id
+
+
+# Menu child rows that reach their tenant through a parent: (parent, fk)
+PARENT_LINKS = {
+    MenuItemVariant: (MenuItem, "menu_item_id"),
+    MenuItemAddonGroupItem: (MenuItemAddonGroup, "group_id"),
+}
+
+
+def get_menu_tenant_ids(instances):
+    """get_menu_tenant_id() of many rows with one query per parent model"""
+    parent_ids = defaultdict(set)
+    for instance in instances:
+        if type(instance) in PARENT_LINKS:
+            parent, field = PARENT_LINKS[type(instance)]
+            parent_ids[parent].add(getattr(instance, field))
+    parent_tenants = {
+        parent: dict(
+            parent.objects.filter(pk__in=ids).values_list("pk", "tenant_id")
+        )
+        for parent, ids in parent_ids.items()
+    }
+
+    tenant_ids = []
+    for instance in instances:
+        if type(instance) in PARENT_LINKS:
+            parent, field = PARENT_LINKS[type(instance)]
+            tenant_ids.append(parent_tenants[parent].get(getattr(instance, field)))
+        else:
+            tenant_ids.append(instance.tenant_id)
+    return tenant_ids
+
+
+def invalidate_menu_catalogs(instances):
+    for tenant_id in set(get_menu_tenant_ids(instances)) - {None}:
+        menu_catalog.invalidate(tenant_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=MenuItem)
+@receiver(post_delete, sender=MenuItem)
+@receiver(post_save, sender=MenuItemVariant)
+@receiver(post_delete, sender=MenuItemVariant)
+@receiver(post_save, sender=MenuItemAddon)
+@receiver(post_delete, sender=MenuItemAddon)
+@receiver(post_save, sender=MenuItemAddonGroup)
+@receiver(post_delete, sender=MenuItemAddonGroup)
+@receiver(post_save, sender=MenuItemAddonGroupItem)
+@receiver(post_delete, sender=MenuItemAddonGroupItem)
+def bump_menu_catalog_version(sender, instance, **kwargs):
+    """
+    Menu changed: move the tenant to a new catalog version
+
+    Bulk queryset updates send no signals and must call
+    menu_catalog.invalidate() themselves.
+    """
+    batch = current_bulk_batch()
+    if batch is not None:
+        batch.defer("menu-catalog", invalidate_menu_catalogs, instance)
+        return
+
+    tenant_id = get_menu_tenant_id(instance)
+    if tenant_id is None:
+        # Parent already deleted; its own signal bumps the version
+        return
+    menu_catalog.invalidate(tenant_id)
@@ -1,11 +1,21 @@
+import io
+from decimal import Decimal
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from rest_framework.test import force_authenticate
 from apps.tenants.models import Tenant, TenantUser
-from apps.menu.models import Category, MenuItem
+from apps.menu.models import Category, MenuItem, MenuItemVariant
+from apps.menu.importer import MenuImporter, read_rows
 from apps.menu.views import MenuItemViewSet
+from apps.core.cache import tenant_membership_cache
 from apps.core.middleware import TenantMiddleware
+from apps.core.testing import QueryCountAssertionsMixin, jwt_client
+from apps.sync.models import Tombstone
 
 User = get_user_model()
 
@@ -121,3 +131,462 @@ class MenuItemViewSetTestCase(TestCase):
             f"/api/menu/items/{new_item_id}/", HTTP_X_TENANT_WORKSPACE=self.tenant2.slug
         )
         self.assertEqual(response.status_code, 404)
+
+
+class MenuListQueryCountTestCase(QueryCountAssertionsMixin, TestCase):
+    """List endpoints must not issue queries per row"""
+
+    def setUp(self):
+        cache.clear()
+        tenant_membership_cache.clear()
+
+        self.user = User.objects.create_user(
+            email="test@example.com", password="password123"
+        )
+        self.tenant = Tenant.objects.create(
+            name="Test Restaurant", slug="test-restaurant", owner=self.user
+        )
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="owner")
+
+        for category_index in range(3):
+            category = Category.objects.create(
+                tenant=self.tenant, name=f"Category {category_index}"
+            )
+            for item_index in range(5):
+                item = MenuItem.objects.create(
+                    tenant=self.tenant,
+                    category=category,
+                    name=f"Item {category_index}-{item_index}",
+                    price=10,
+                )
+                MenuItemVariant.objects.create(menu_item=item, name="Regular", price=10)
+                MenuItemVariant.objects.create(
+                    menu_item=item, name="Retired", price=9, is_active=False
+                )
+
+        self.client = jwt_client(self.user)
+        # Warm the token and tenant membership caches
+        self.client.get("/api/menu/categories/")
+
+    def test_menu_item_list_queries(self):
+        """Test that items, categories and variants load in constant queries"""
+        response = self.assertListQueries(self.client, "/api/menu/items/", 2)
+        data = response.json()
+        self.assertEqual(len(data), 15)
+        self.assertEqual(data[0]["category_name"], "Category 0")
+        self.assertEqual([v["name"] for v in data[0]["variants"]], ["Regular"])
+
+    def test_category_list_queries(self):
+        """Test that the category list is a single query"""
+        self.assertListQueries(self.client, "/api/menu/categories/", 1)
+
+    def test_menu_item_list_cursor_pagination(self):
+        """Test that page_size opts into cursor pages covering every item once"""
+        names = []
+        url = "/api/menu/items/?page_size=4"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+            self.assertLessEqual(len(page["results"]), 4)
+            names.extend(item["name"] for item in page["results"])
+            url = page["next"]
+        self.assertEqual(names, sorted(names))
+        self.assertEqual(len(set(names)), 15)
+
+    def test_cursor_pages_seek_past_ties_without_offset(self):
+        """Test that categories sharing a display_order page by keyset, not OFFSET"""
+        for index in range(9):
+            Category.objects.create(tenant=self.tenant, name=f"Section {index}")
+        pages = []
+        url = "/api/menu/categories/?page_size=4"
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            for query in queries.captured_queries:
+                self.assertNotIn("OFFSET", query["sql"])
+            page = response.json()
+            pages.append([category["name"] for category in page["results"]])
+            previous, url = page["previous"], page["next"]
+
+        names = [name for page in pages for name in page]
+        self.assertGreater(len(pages), 2)
+        self.assertEqual(
+            names,
+            list(Category.objects.filter(tenant=self.tenant).values_list("name", flat=True)),
+        )
+        # The previous link of the last page seeks backwards to the one before
+        response = self.client.get(previous)
+        self.assertEqual([c["name"] for c in response.json()["results"]], pages[-2])
+
+class MenuCatalogTestCase(QueryCountAssertionsMixin, TestCase):
+    """Menu lists are served from the versioned catalog cache"""
+
+    def setUp(self):
+        cache.clear()
+        tenant_membership_cache.clear()
+
+        self.user = User.objects.create_user(
+            email="test@example.com", password="password123"
+        )
+        self.tenant = Tenant.objects.create(
+            name="Test Restaurant", slug="test-restaurant", owner=self.user
+        )
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="owner")
+        self.category = Category.objects.create(tenant=self.tenant, name="Pizza")
+        self.item = MenuItem.objects.create(
+            tenant=self.tenant, category=self.category, name="Margherita", price=10
+        )
+        MenuItem.objects.create(
+            tenant=self.tenant, name="Retired Special", price=12, is_active=False
+        )
+
+        self.client = jwt_client(self.user)
+        # Warm the token, tenant membership and catalog caches
+        self.client.get("/api/menu/items/")
+
+    def test_warm_list_runs_no_queries(self):
+        """Test that a cached catalog is served without touching the database"""
+        response = self.assertListQueries(self.client, "/api/menu/items/", 0)
+        self.assertEqual(len(response.json()), 2)
+        self.assertIn("X-Catalog-Version", response)
+
+    def test_filters_apply_to_catalog(self):
+        """Test that the category and is_active filters still apply"""
+        response = self.client.get("/api/menu/items/?is_active=true")
+        self.assertEqual([i["name"] for i in response.json()], ["Margherita"])
+
+        response = self.client.get(f"/api/menu/items/?category={self.category.id}")
+        self.assertEqual([i["name"] for i in response.json()], ["Margherita"])
+
+    def test_menu_changes_bump_the_version(self):
+        """Test that saving or deleting menu rows rebuilds the catalog"""
+        version = int(self.client.get("/api/menu/items/")["X-Catalog-Version"])
+
+        self.item.price = 11
+        self.item.save()
+        response = self.client.get("/api/menu/items/")
+        self.assertGreater(int(response["X-Catalog-Version"]), version)
+        self.assertEqual(response.json()[0]["price"], "11.00")
+
+        variant = MenuItemVariant.objects.create(menu_item=self.item, name="Large", price=14)
+        self.assertEqual(
+            len(self.client.get("/api/menu/items/").json()[0]["variants"]), 1
+        )
+        variant.delete()
+        self.assertEqual(
+            self.client.get("/api/menu/items/").json()[0]["variants"], []
+        )
+
+
+class MenuBulkTestCase(QueryCountAssertionsMixin, TestCase):
+    """Bulk endpoints validate and write whole batches in constant queries"""
+
+    def setUp(self):
+        cache.clear()
+        tenant_membership_cache.clear()
+
+        self.user = User.objects.create_user(
+            email="test@example.com", password="password123"
+        )
+        self.tenant = Tenant.objects.create(
+            name="Test Restaurant", slug="test-restaurant", owner=self.user
+        )
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="owner")
+        other = Tenant.objects.create(
+            name="Other Restaurant", slug="other-restaurant", owner=self.user
+        )
+        self.category = Category.objects.create(tenant=self.tenant, name="Pizza")
+        self.foreign_category = Category.objects.create(tenant=other, name="Pizza")
+
+        self.client = jwt_client(self.user)
+        # Warm the token and tenant membership caches
+        self.client.get("/api/menu/categories/")
+
+    def _rows(self, count):
+        return [
+            {
+                "category": str(self.category.id),
+                "name": f"Item {index}",
+                "price": "9.50",
+                "variants": [
+                    {"name": "Regular", "price": "9.50"},
+                    {"name": "Large", "price": "12.00"},
+                ],
+            }
+            for index in range(count)
+        ]
+
+    def test_bulk_create_runs_constant_queries(self):
+        """Test that a 600 item menu with variants is created in a few queries"""
+        # One INSERT per batch; SQLite limits a batch to 999 parameters,
+        # i.e. about 80 items or 110 variants
+        with self.assertMaxQueries(25):
+            response = self.client.post(
+                "/api/menu/items/bulk/", self._rows(600), format="json"
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["created"], 600)
+        self.assertEqual(MenuItem.objects.filter(tenant=self.tenant).count(), 600)
+        self.assertEqual(
+            MenuItemVariant.objects.filter(menu_item__tenant=self.tenant).count(), 1200
+        )
+        # The catalog was invalidated and includes the new items
+        self.assertEqual(len(self.client.get("/api/menu/items/").json()), 600)
+
+    def test_bulk_create_reports_errors_by_row(self):
+        """Test that invalid rows are reported by index and nothing is written"""
+        rows = self._rows(4)
+        rows[1]["price"] = "free"
+        rows[2]["category"] = str(self.foreign_category.id)
+        rows[3]["variants"][1]["name"] = "Regular"
+
+        response = self.client.post("/api/menu/items/bulk/", rows, format="json")
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual(sorted(errors), ["1", "2", "3"])
+        self.assertIn("price", errors["1"])
+        self.assertIn("category", errors["2"])
+        self.assertIn("variants", errors["3"])
+        self.assertFalse(MenuItem.objects.exists())
+
+    def test_bulk_update_and_delete(self):
+        """Test that rows are updated and deleted by id within the tenant"""
+        items = [
+            MenuItem.objects.create(tenant=self.tenant, name=f"Item {i}", price=10)
+            for i in range(3)
+        ]
+        for item in items:
+            MenuItemVariant.objects.create(menu_item=item, name="Regular", price=10)
+        response = self.client.patch(
+            "/api/menu/items/bulk/",
+            [{"id": str(item.id), "price": "11.00"} for item in items],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            set(MenuItem.objects.values_list("price", flat=True)), {Decimal("11.00")}
+        )
+
+        # Per-row delete signals defer their work to the batch
+        with self.assertMaxQueries(15):
+            response = self.client.delete(
+                "/api/menu/items/bulk/",
+                {"ids": [str(items[0].id), str(items[1].id)]},
+                format="json",
+            )
+        self.assertEqual(response.json(), {"deleted": 2})
+        self.assertEqual(list(MenuItem.objects.all()), [items[2]])
+        self.assertEqual(
+            set(Tombstone.objects.values_list("object_id", flat=True)),
+            {items[0].id, items[1].id},
+        )
+
+    def test_bulk_unique_fields(self):
+        """Test that unique names are checked within the batch and the tenant"""
+        response = self.client.post(
+            "/api/menu/categories/bulk/",
+            [{"name": "Drinks"}, {"name": "Pizza"}, {"name": "Drinks"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(sorted(response.json()["errors"]), ["1", "2"])
+
+        pasta = Category.objects.create(tenant=self.tenant, name="Pasta")
+        response = self.client.patch(
+            "/api/menu/categories/bulk/",
+            [{"id": str(self.category.id), "name": "Pasta"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("name", response.json()["errors"]["0"])
+
+        # A row may keep its own value
+        response = self.client.patch(
+            "/api/menu/categories/bulk/",
+            [
+                {"id": str(self.category.id), "name": "Pizza", "display_order": 2},
+                {"id": str(pasta.id), "name": "Noodles"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+
+    def test_bulk_variants(self):
+        """Test that variants are created, updated and deleted in batches"""
+        items = [
+            MenuItem.objects.create(tenant=self.tenant, name=f"Item {i}", price=10)
+            for i in range(2)
+        ]
+        foreign_item = MenuItem.objects.create(
+            tenant=self.foreign_category.tenant, name="Item", price=10
+        )
+        response = self.client.post(
+            "/api/menu/variants/bulk/",
+            [
+                {"menu_item": str(item.id), "name": name, "price": "10.00"}
+                for item in items
+                for name in ("Regular", "Large")
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(MenuItemVariant.objects.count(), 4)
+        regular, large = (
+            MenuItemVariant.objects.get(menu_item=items[0], name=name)
+            for name in ("Regular", "Large")
+        )
+
+        # Names are unique per item, in the batch and against existing rows
+        response = self.client.post(
+            "/api/menu/variants/bulk/",
+            [
+                {"menu_item": str(items[0].id), "name": "Small", "price": "8.00"},
+                {"menu_item": str(items[0].id), "name": "Small", "price": "8.00"},
+                {"menu_item": str(items[1].id), "name": "Large", "price": "8.00"},
+                {"menu_item": str(foreign_item.id), "name": "Small", "price": "8.00"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual(sorted(errors), ["1", "2", "3"])
+        self.assertIn("name", errors["2"])
+        self.assertIn("menu_item", errors["3"])
+
+        response = self.client.patch(
+            "/api/menu/variants/bulk/",
+            [{"id": str(regular.id), "name": "Large"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("name", response.json()["errors"]["0"])
+
+        response = self.client.patch(
+            "/api/menu/variants/bulk/",
+            [
+                {"id": str(regular.id), "price": "9.00"},
+                {"id": str(large.id), "name": "Family", "price": "14.00"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        large.refresh_from_db()
+        self.assertEqual((large.name, large.price), ("Family", Decimal("14.00")))
+        # The catalog was invalidated
+        catalog_item = next(
+            item for item in self.client.get("/api/menu/items/").json()
+            if item["id"] == str(items[0].id)
+        )
+        self.assertIn("Family", {variant["name"] for variant in catalog_item["variants"]})
+
+        response = self.client.patch(
+            "/api/menu/variants/bulk/",
+            [{"id": str(regular.id), "menu_item": str(items[1].id)}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.delete(
+            "/api/menu/variants/bulk/",
+            {"ids": [str(regular.id), str(large.id)]},
+            format="json",
+        )
+        self.assertEqual(response.json(), {"deleted": 2})
+        self.assertFalse(MenuItemVariant.objects.filter(menu_item=items[0]).exists())
+        self.assertEqual(
+            set(Tombstone.objects.values_list("object_id", flat=True)),
+            {regular.id, large.id},
+        )
+
+
+class MenuImportTestCase(TestCase):
+    """Menu files are imported in chunks, all or nothing"""
+
+    CSV = (
+        "category,name,price,variant,variant_price\n"
+        "Pizza,Margherita,10.00,Regular,10.00\n"
+        "Pizza,Margherita,,Large,14.00\n"
+        "Drinks,Cola,2.50,,\n"
+        ",Bread,3.00,,\n"
+    )
+
+    def setUp(self):
+        cache.clear()
+        tenant_membership_cache.clear()
+
+        self.user = User.objects.create_user(
+            email="test@example.com", password="password123"
+        )
+        self.tenant = Tenant.objects.create(
+            name="Test Restaurant", slug="test-restaurant", owner=self.user
+        )
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="owner")
+        self.pizza = Category.objects.create(tenant=self.tenant, name="Pizza")
+        self.margherita = MenuItem.objects.create(
+            tenant=self.tenant, category=self.pizza, name="Margherita", price=9
+        )
+
+    def _import(self, content, **options):
+        rows = read_rows(io.BytesIO(content.encode()), "csv")
+        return MenuImporter(self.tenant, chunk_size=2, **options).run(rows)
+
+    def test_import_creates_and_updates(self):
+        """Test that rows upsert items, variants and categories by name"""
+        result = self._import(self.CSV)
+        self.assertTrue(result.saved, result.errors)
+        self.assertEqual(result.counts["items"], {"created": 2, "updated": 1, "unchanged": 0})
+        self.assertEqual(result.counts["variants"]["created"], 2)
+        self.assertEqual(result.counts["categories"]["created"], 1)
+
+        self.margherita.refresh_from_db()
+        self.assertEqual(self.margherita.price, Decimal("10.00"))
+        self.assertEqual(
+            sorted(self.margherita.variants.values_list("name", flat=True)),
+            ["Large", "Regular"],
+        )
+        cola = MenuItem.objects.get(tenant=self.tenant, name="Cola")
+        self.assertEqual(cola.category.name, "Drinks")
+        self.assertIsNone(MenuItem.objects.get(tenant=self.tenant, name="Bread").category)
+
+        # Importing the same file again changes nothing
+        result = self._import(self.CSV)
+        self.assertEqual(result.counts["items"], {"created": 0, "updated": 0, "unchanged": 3})
+        self.assertEqual(result.counts["variants"]["unchanged"], 2)
+
+    def test_dry_run_reports_the_diff(self):
+        """Test that a dry run lists the changes without saving them"""
+        changes = []
+        result = self._import(self.CSV, dry_run=True, on_change=changes.append)
+        self.assertFalse(result.saved)
+        self.assertEqual(MenuItem.objects.filter(tenant=self.tenant).count(), 1)
+
+        update = next(c for c in changes if c.action == "update")
+        self.assertEqual(update.name, "Margherita")
+        self.assertEqual(update.changes, {"price": (Decimal("9.00"), Decimal("10.00"))})
+        self.assertEqual(len([c for c in changes if c.action == "create"]), 5)
+
+    def test_invalid_rows_save_nothing(self):
+        """Test that an invalid row is reported by line and rolls back the file"""
+        content = self.CSV + "Drinks,Water,free,,\nDrinks,Juice,4.00,Large,\n"
+        result = self._import(content)
+        self.assertFalse(result.saved)
+        self.assertEqual([e["row"] for e in result.errors], [6, 7])
+        self.assertIn("price", result.errors[0]["errors"])
+        self.assertIn("variant_price", result.errors[1]["errors"])
+        self.assertFalse(MenuItem.objects.filter(name="Cola").exists())
+        self.margherita.refresh_from_db()
+        self.assertEqual(self.margherita.price, Decimal("9.00"))
+
+    def test_import_endpoint(self):
+        """Test that an uploaded file is imported and the catalog refreshed"""
+        client = jwt_client(self.user)
+        client.get("/api/menu/items/")
+        upload = SimpleUploadedFile("menu.csv", self.CSV.encode(), "text/csv")
+
+        response = client.post("/api/menu/items/import/", {"file": upload})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertTrue(response.json()["saved"])
+        self.assertEqual(len(client.get("/api/menu/items/").json()), 3)
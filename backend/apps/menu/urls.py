@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import CategoryViewSet, MenuItemViewSet
+from .views import CategoryViewSet, MenuItemVariantViewSet, MenuItemViewSet
 
 # Create a router for viewsets
 router = DefaultRouter()
 router.register(r"categories", CategoryViewSet, basename="category")
 router.register(r"items", MenuItemViewSet, basename="menu-item")
+router.register(r"variants", MenuItemVariantViewSet, basename="menu-item-variant")
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -1,12 +1,61 @@
+import logging
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
-from .models import Category, MenuItem
-from .serializers import CategorySerializer, MenuItemSerializer
+from .catalog import absolute_image_urls, menu_catalog
+from .importer import ImportResult, MenuImporter, MenuImportError, read_rows
+from .models import Category, MenuItem, MenuItemVariant
+from .serializers import (
+    CategorySerializer,
+    MenuItemBulkSerializer,
+    MenuItemSerializer,
+    MenuItemVariantRowSerializer,
+    active_variants_prefetch,
+)
+from apps.core.bulk import BulkActionsMixin
+from apps.core.mixins import RelatedDataMixin
 from apps.core.permissions import IsTenantUser, IsTenantAdmin, IsTenantOwner
-from apps.tenants.models import TenantUser
+from apps.core.log import get_logger
+from apps.core.roles import get_tenant_role
+from apps.core.timing import TimedViewMixin, timed
 
+logger = get_logger("menu")
 
-class CategoryViewSet(viewsets.ModelViewSet):
+
+class CatalogListMixin:
+    """
+    Serves unpaginated list requests from the tenant's cached menu catalog
+    (apps.menu.catalog) instead of querying the menu tables.
+
+    - catalog_section: key of the catalog holding the serialized rows
+    - filter_catalog(): applies the view's query param filters to them
+    """
+
+    catalog_section = None
+
+    def filter_catalog(self, entries):
+        return entries
+
+    def list(self, request, *args, **kwargs):
+        tenant = getattr(request, "tenant", None)
+        if tenant is None or (
+            self.paginator is not None and self.paginator.is_requested(request)
+        ):
+            return super().list(request, *args, **kwargs)
+
+        catalog = menu_catalog.get(tenant)
+        entries = self.filter_catalog(catalog[self.catalog_section])
+        return Response(
+            absolute_image_urls(entries, request),
+            headers={"X-Catalog-Version": str(catalog["version"])},
+        )
+
+
+class CategoryViewSet(
+    TimedViewMixin, CatalogListMixin, BulkActionsMixin, viewsets.ModelViewSet
+):
     """
     ViewSet for managing menu categories
 
@@ -15,6 +64,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
     - Retrieve: Get details of a specific category
     - Update: Update a category
     - Delete: Delete a category
+    - Bulk: Create, update or delete many categories (bulk/)
 
     Access requires an authenticated user with access to the tenant.
     The tenant is determined from the authenticated user and X-Tenant-Workspace header.
@@ -22,7 +72,18 @@ class CategoryViewSet(viewsets.ModelViewSet):
 
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated, IsTenantUser]
+    catalog_section = "categories"
+
+    # Lists may read from a replica (see apps.core.replicas)
+    replica_actions = ("list",)
+
+    bulk_serializer_class = CategorySerializer
+    bulk_unique_fields = ("name",)
+
+    def bulk_applied(self):
+        menu_catalog.invalidate(self.request.tenant.pk)
 
+    @timed("queryset")
     def get_queryset(self):
         """
         Get categories for the current tenant
@@ -69,7 +130,10 @@ class CategoryViewSet(viewsets.ModelViewSet):
         )
 
 
-class MenuItemViewSet(viewsets.ModelViewSet):
+class MenuItemViewSet(
+    TimedViewMixin,
+    CatalogListMixin, BulkActionsMixin, RelatedDataMixin, viewsets.ModelViewSet
+):
     """
     ViewSet for managing menu items
 
@@ -78,6 +142,8 @@ class MenuItemViewSet(viewsets.ModelViewSet):
     - Retrieve: Get details of a specific menu item
     - Update: Update a menu item
     - Delete: Delete a menu item
+    - Bulk: Create (with variants), update or delete many items (bulk/)
+    - Import: Import items, variants and categories from a CSV/XLSX file (import/)
 
     Access requires an authenticated user with access to the tenant.
     The tenant is determined from the authenticated user and X-Tenant-Workspace header.
@@ -86,6 +152,95 @@ class MenuItemViewSet(viewsets.ModelViewSet):
     serializer_class = MenuItemSerializer
     permission_classes = [permissions.IsAuthenticated, IsTenantUser]
 
+    catalog_section = "items"
+
+    # Lists may read from a replica (see apps.core.replicas)
+    replica_actions = ("list",)
+
+    # Related data read by MenuItemSerializer
+    select_related_fields = ("category",)
+    prefetch_related_lookups = (active_variants_prefetch,)
+
+    bulk_serializer_class = MenuItemBulkSerializer
+    bulk_tenant_relations = {"category_id": Category}
+
+    def bulk_build(self, row):
+        row.pop("variants", None)
+        return super().bulk_build(row)
+
+    def bulk_after_create(self, instances, rows):
+        """Insert the variants of all new items in one bulk_create"""
+        variants = [
+            MenuItemVariant(menu_item=item, **variant)
+            for item, row in zip(instances, rows)
+            for variant in row.get("variants", [])
+        ]
+        MenuItemVariant.objects.bulk_create(variants, batch_size=self.bulk_batch_size)
+
+    def bulk_applied(self):
+        menu_catalog.invalidate(self.request.tenant.pk)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser],
+    )
+    def import_menu(self, request, *args, **kwargs):
+        """
+        Import an uploaded menu file ("file" field, .csv or .xlsx)
+
+        With ?dry_run=true the planned changes are reported but not saved.
+        """
+        if not hasattr(request, "tenant"):
+            raise ValidationError(
+                {"detail": "No active tenant found. Set X-Tenant-Slug header."}
+            )
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": ["No file was submitted."]})
+
+        dry_run = request.query_params.get("dry_run", "").lower() == "true"
+        # The diff in the response is capped like the error list
+        changes = []
+
+        def collect_change(change):
+            if len(changes) < ImportResult.MAX_ERRORS:
+                changes.append(change)
+
+        importer = MenuImporter(
+            request.tenant,
+            dry_run=dry_run,
+            on_change=collect_change if dry_run else None,
+        )
+        file_format = upload.name.rsplit(".", 1)[-1].lower()
+        try:
+            result = importer.run(read_rows(upload, file_format))
+        except MenuImportError as exc:
+            raise ValidationError({"file": [str(exc)]})
+
+        body = result.as_dict()
+        if dry_run:
+            body["changes"] = [
+                {
+                    "row": change.row,
+                    "kind": change.kind,
+                    "action": change.action,
+                    "name": change.name,
+                    "changes": {
+                        field: [str(old), str(new)]
+                        for field, (old, new) in change.changes.items()
+                    },
+                }
+                for change in changes
+            ]
+        return Response(
+            body,
+            status=status.HTTP_400_BAD_REQUEST
+            if result.error_count
+            else status.HTTP_200_OK,
+        )
+
     def initial(self, request, *args, **kwargs):
         """
         Runs anything that needs to occur prior to calling the method handler.
@@ -93,20 +248,22 @@ class MenuItemViewSet(viewsets.ModelViewSet):
         """
         super().initial(request, *args, **kwargs)
 
-        # Debug information
-        print(f"DEBUG - User authenticated: {request.user.is_authenticated}")
-        print(f"DEBUG - User: {request.user}")
-        print(f"DEBUG - Tenant header: {request.headers.get('X-Tenant-Workspace')}")
-        print(f"DEBUG - Request tenant: {getattr(request, 'tenant', None)}")
-
-        if hasattr(request, "tenant"):
-            has_tenant_access = TenantUser.objects.filter(
-                tenant=request.tenant, user=request.user, is_active=True
-            ).exists()
-            print(f"DEBUG - Has tenant access: {has_tenant_access}")
-        else:
-            print("DEBUG - No tenant set on request")
+        # Debug information (skipped unless the menu logger is at DEBUG)
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
 
+        tenant = getattr(request, "tenant", None)
+        logger.debug(
+            "Menu item request",
+            extra={
+                "user": str(request.user),
+                "authenticated": request.user.is_authenticated,
+                "tenant": tenant.slug if tenant else None,
+                "has_tenant_access": get_tenant_role(request) is not None,
+            },
+        )
+
+    @timed("queryset")
     def get_queryset(self):
         """
         Get menu items for the current tenant
@@ -115,7 +272,9 @@ class MenuItemViewSet(viewsets.ModelViewSet):
         if not hasattr(self.request, "tenant"):
             return MenuItem.objects.none()
 
-        queryset = MenuItem.objects.filter(tenant=self.request.tenant)
+        queryset = self.with_related_data(
+            MenuItem.objects.filter(tenant=self.request.tenant)
+        )
 
         # Filter by category if specified in query params
         category_id = self.request.query_params.get("category")
@@ -130,6 +289,19 @@ class MenuItemViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def filter_catalog(self, entries):
+        """Apply the category and is_active filters of get_queryset to catalog rows"""
+        category_id = self.request.query_params.get("category")
+        if category_id:
+            entries = [e for e in entries if str(e["category"]) == category_id]
+
+        is_active = self.request.query_params.get("is_active")
+        if is_active:
+            is_active = is_active.lower() == "true"
+            entries = [e for e in entries if e["is_active"] == is_active]
+
+        return entries
+
     def perform_create(self, serializer):
         """
         Create a new menu item for the current tenant
@@ -166,3 +338,35 @@ class MenuItemViewSet(viewsets.ModelViewSet):
         return Response(
             {"message": "Menu item updated successfully", "data": serializer.data}
         )
+
+
+class MenuItemVariantViewSet(TimedViewMixin, BulkActionsMixin, viewsets.GenericViewSet):
+    """
+    Bulk writes of menu item variants
+
+    - Bulk: Create, update or delete many variants of the tenant's items (bulk/)
+
+    Variants are read with their items; single variants are edited through
+    the item.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsTenantUser]
+
+    bulk_serializer_class = MenuItemVariantRowSerializer
+    bulk_tenant_relations = {"menu_item_id": MenuItem}
+    bulk_unique_fields = (("menu_item_id", "name"),)
+
+    @timed("queryset")
+    def get_queryset(self):
+        if not hasattr(self.request, "tenant"):
+            return MenuItemVariant.objects.none()
+        return self.bulk_queryset()
+
+    def bulk_queryset(self):
+        return MenuItemVariant.objects.filter(menu_item__tenant=self.request.tenant)
+
+    def bulk_build(self, row):
+        return MenuItemVariant(**row)
+
+    def bulk_applied(self):
+        menu_catalog.invalidate(self.request.tenant.pk)
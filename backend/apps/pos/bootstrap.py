@@ -0,0 +1,123 @@
+"""
+Catalog bundle loaded by POS terminals at startup.
+
+Everything a terminal needs (menu, counters, taxes, tables and settings) is
+loaded with a fixed number of queries, independent of catalog size; the
+menu itself is served from the cached menu catalog. Its version plus a
+cheap fingerprint query of the other sources lets unchanged catalogs be
+answered with 304 Not Modified.
+"""
+
+import hashlib
+
+from django.db.models import CharField, Count, Max, Value
+from django.db.models.functions import Cast
+
+from apps.core.models import TenantSetting
+from apps.core.serializers import TenantSettingSerializer
+from apps.management.table.models import RestaurantTable
+from apps.management.table.serializers import RestaurantTableSerializer
+from apps.menu.catalog import absolute_image_urls, menu_catalog
+from apps.settings.counters.models import Counter
+from apps.settings.vat.models import VatTax
+from apps.settings.vat.serializers import VatTaxSerializer
+
+
+def _fingerprint_querysets(tenant):
+    """
+    Non-menu sources as (name, queryset, version field): their row count
+    and latest version field identify what the bundle holds of them
+    """
+    return [
+        ("counter", Counter.objects.filter(tenant=tenant), "updated_at"),
+        # Link rows are never updated; a new link gets a higher id
+        (
+            "counter_item",
+            Counter.items.through.objects.filter(counter__tenant=tenant),
+            "id",
+        ),
+        ("vat", VatTax.objects.filter(tenant=tenant, is_active=True), "updated_at"),
+        ("table", RestaurantTable.objects.filter(tenant=tenant), "updated_at"),
+        ("setting", TenantSetting.objects.filter(tenant=tenant), "updated_at"),
+    ]
+
+
+def get_catalog_etag(tenant):
+    """
+    Compute the ETag of a tenant's POS catalog with a single query
+
+    The menu sections are identified by the menu catalog version, which
+    every menu change bumps (apps.menu.signals). Every other source
+    contributes (row count, latest version field); additions, edits and
+    deletions all change at least one of the two.
+    """
+    querysets = [
+        queryset.order_by()
+        .annotate(source=Value(name, output_field=CharField()))
+        .values("source")
+        .annotate(rows=Count("pk"), last_update=Cast(Max(field), CharField()))
+        .values_list("source", "rows", "last_update")
+        for name, queryset, field in _fingerprint_querysets(tenant)
+    ]
+    rows = sorted(querysets[0].union(*querysets[1:], all=True), key=lambda row: row[0])
+    version = menu_catalog.get_version(tenant.pk)
+    digest = hashlib.sha1(repr((version, rows)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def serialize_counters(counters):
+    """
+    Serialize counters with the ids of their menu items in two queries
+
+    Item ids are read straight from the M2M table, without loading items.
+    """
+    counters = list(counters)
+    counter_items = {}
+    for counter_id, item_id in Counter.items.through.objects.filter(
+        counter_id__in=[counter.id for counter in counters]
+    ).values_list("counter_id", "menuitem_id"):
+        counter_items.setdefault(counter_id, []).append(str(item_id))
+    return [
+        {
+            "id": str(counter.id),
+            "name": counter.name,
+            "description": counter.description,
+            "location": counter.location,
+            "status": counter.status,
+            "item_ids": counter_items.get(counter.id, []),
+        }
+        for counter in counters
+    ]
+
+
+def load_bootstrap_data(tenant, context=None):
+    """
+    Load and serialize the full POS catalog of a tenant
+
+    Menu sections come from the cached menu catalog (apps.menu.catalog);
+    the rest runs a fixed number of queries, one per source.
+    """
+    context = context or {}
+    request = context.get("request")
+    catalog = menu_catalog.get(tenant)
+
+    vat_taxes = VatTax.objects.filter(tenant=tenant, is_active=True)
+    tables = RestaurantTable.objects.filter(tenant=tenant)
+    setting = TenantSetting.objects.filter(tenant=tenant).first()
+
+    return {
+        "catalog_version": catalog["version"],
+        "categories": absolute_image_urls(catalog["categories"], request),
+        "items": absolute_image_urls(
+            [item for item in catalog["items"] if item["is_active"]], request
+        ),
+        "addon_groups": [
+            group for group in catalog["addon_groups"] if group["is_active"]
+        ],
+        "counters": serialize_counters(Counter.objects.filter(tenant=tenant)),
+        "vat_taxes": VatTaxSerializer(vat_taxes, many=True, context=context).data,
+        "tables": RestaurantTableSerializer(tables, many=True, context=context).data,
+        "settings": (
+            TenantSettingSerializer(setting, context=context).data if setting else None
+        ),
+    }
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.pos.models import POSSession
+from apps.pos.totals import TOTAL_FIELDS, compute_session_totals
+
+
+class Command(BaseCommand):
+    help = 'Recomputes POS session totals from payments and cash movements and reports drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=str, help='Only check sessions of this tenant slug')
+        parser.add_argument('--session', type=str, help='Only check this session id')
+        parser.add_argument('--open-only', action='store_true', help='Only check open sessions')
+        parser.add_argument('--fix', action='store_true', help='Overwrite drifted totals with the recomputed values')
+
+    def handle(self, *args, **options):
+        sessions = POSSession.objects.all()
+        if options.get('tenant'):
+            sessions = sessions.filter(tenant__slug=options['tenant'])
+        if options.get('session'):
+            sessions = sessions.filter(pk=options['session'])
+        if options.get('open_only'):
+            sessions = sessions.filter(status='open')
+
+        stored = {
+            row['id']: row for row in sessions.values('id', *TOTAL_FIELDS)
+        }
+        recomputed = compute_session_totals(list(stored))
+
+        drifted = 0
+        for session_id, expected in recomputed.items():
+            current = stored[session_id]
+            drift = {
+                field: (current[field], value)
+                for field, value in expected.items()
+                if (current[field] or 0) != value
+            }
+            if not drift:
+                continue
+
+            drifted += 1
+            details = ', '.join(
+                f'{field}: stored {stored_value} != recomputed {value}'
+                for field, (stored_value, value) in drift.items()
+            )
+            self.stdout.write(self.style.WARNING(f'Session {session_id}: {details}'))
+
+            if options.get('fix'):
+                self._fix(session_id)
+
+        summary = f'Checked {len(stored)} session(s), {drifted} with drift'
+        if drifted and options.get('fix'):
+            summary += ' (fixed)'
+        self.stdout.write(self.style.SUCCESS(summary) if not drifted else summary)
+
+    def _fix(self, session_id):
+        """
+        Rewrite a session's totals while holding its row lock
+
+        Checkouts and cash movements update the same row, so they wait for
+        the lock and then apply their increments on top of the fixed values.
+        """
+        with transaction.atomic():
+            POSSession.objects.select_for_update().only("id").get(pk=session_id)
+            totals = compute_session_totals([session_id])[session_id]
+            POSSession.objects.filter(pk=session_id).update(**totals)
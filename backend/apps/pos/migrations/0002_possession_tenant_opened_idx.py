@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pos', '0001_initial'),
+        ('tenants', '0002_tenantuser_tenant_user_tenant_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='possession',
+            index=models.Index(fields=['tenant', 'opened_at'], name='pos_session_tenant_opened_idx'),
+        ),
+    ]
@@ -37,6 +37,17 @@ class POSSession(models.Model):
     class Meta:
         verbose_name = 'POS Session'
         verbose_name_plural = 'POS Sessions'
+        indexes = [
+            # Exports stream a tenant's sessions in opening order
+            models.Index(fields=['tenant', 'opened_at'], name='pos_session_tenant_opened_idx'),
+        ]
+    
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.expected_balance:
+            # The drawer starts with the opening float; payments and cash
+            # movements then keep the running totals up to date (see totals.py)
+            self.expected_balance = self.opening_balance
+        super().save(*args, **kwargs)
     
     def __str__(self):
         return f"Session {self.id[:8]} - {self.get_status_display()}"
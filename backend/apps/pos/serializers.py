@@ -0,0 +1,47 @@
+from rest_framework import serializers
+from .models import POSSession
+
+
+class POSSessionSummarySerializer(serializers.ModelSerializer):
+    """
+    Financial summary of a POS session
+
+    Every figure is a stored running total (see apps.pos.totals), so the
+    summary costs one row read however many sales the session has.
+    """
+
+    difference = serializers.SerializerMethodField()
+
+    def get_difference(self, obj):
+        """Counted cash minus expected cash, once the session is closed"""
+        if obj.status != "closed" or obj.closing_balance is None:
+            return None
+        return str(obj.closing_balance - (obj.expected_balance or 0))
+
+    class Meta:
+        model = POSSession
+        fields = [
+            "id",
+            "status",
+            "opened_by",
+            "closed_by",
+            "opening_balance",
+            "cash_sales",
+            "card_sales",
+            "other_sales",
+            "expected_balance",
+            "closing_balance",
+            "difference",
+            "notes",
+            "opened_at",
+            "closed_at",
+        ]
+        read_only_fields = fields
+
+
+class ClosePOSSessionSerializer(serializers.Serializer):
+    """Input of the close-session endpoint"""
+
+    session = serializers.UUIDField()
+    closing_balance = serializers.DecimalField(max_digits=10, decimal_places=2)
+    notes = serializers.CharField(required=False, allow_blank=True)
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CashMovement
+from .totals import apply_session_deltas, cash_movement_delta
+
+
+@receiver(post_save, sender=CashMovement)
+def add_cash_movement_to_session(sender, instance, created, **kwargs):
+    """Apply a new cash movement to its session's expected drawer balance"""
+    if created:
+        apply_session_deltas(
+            instance.session_id, {"expected_balance": cash_movement_delta(instance)}
+        )
+
+
+@receiver(post_delete, sender=CashMovement)
+def remove_cash_movement_from_session(sender, instance, **kwargs):
+    """Take a deleted cash movement back out of the expected drawer balance"""
+    apply_session_deltas(
+        instance.session_id, {"expected_balance": -cash_movement_delta(instance)}
+    )
@@ -1,3 +1,228 @@
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.core.cache import tenant_membership_cache
+from apps.core.models import TenantSetting
+from apps.core.testing import QueryCountAssertionsMixin, jwt_client
+from apps.tenants.models import Tenant, TenantUser
+from apps.menu.models import (
+    Category,
+    MenuItem,
+    MenuItemAddon,
+    MenuItemAddonGroup,
+    MenuItemAddonGroupItem,
+    MenuItemVariant,
+)
+from apps.management.table.models import RestaurantTable
+from apps.settings.counters.models import Counter
+from apps.settings.vat.models import VatTax
+from .models import CashMovement, POSSession
 
-# Create your tests here.
+User = get_user_model()
+
+
+class POSBootstrapViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        tenant_membership_cache.clear()
+
+        self.user = User.objects.create_user(
+            email="cashier@example.com", password="password123"
+        )
+        self.tenant = Tenant.objects.create(
+            name="Test Restaurant", slug="test-restaurant", owner=self.user
+        )
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="cashier")
+        TenantSetting.objects.create(tenant=self.tenant, currency="EUR")
+        VatTax.objects.create(tenant=self.tenant, name="Standard VAT", rate=15)
+        RestaurantTable.objects.create(tenant=self.tenant, number="T1")
+        self.category = Category.objects.create(tenant=self.tenant, name="Pizza")
+        self.counter = Counter.objects.create(tenant=self.tenant, name="Main Counter")
+        self._add_items(2)
+
+        self.client = APIClient()
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def _add_items(self, count):
+        start = MenuItem.objects.count()
+        for index in range(start, start + count):
+            item = MenuItem.objects.create(
+                tenant=self.tenant,
+                category=self.category,
+                name=f"Item {index}",
+                price=10,
+            )
+            MenuItemVariant.objects.create(menu_item=item, name="Small", price=8)
+            MenuItemVariant.objects.create(menu_item=item, name="Large", price=12)
+            self.counter.items.add(item)
+
+    def _query_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/pos/bootstrap/")
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_bootstrap_returns_catalog(self):
+        """Test that the bundle contains every catalog section"""
+        response = self.client.get("/api/pos/bootstrap/")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data["categories"]), 1)
+        self.assertEqual(len(data["items"]), 2)
+        self.assertEqual(len(data["items"][0]["variants"]), 2)
+        self.assertEqual(len(data["counters"][0]["item_ids"]), 2)
+        self.assertEqual(data["vat_taxes"][0]["name"], "Standard VAT")
+        self.assertEqual(data["tables"][0]["number"], "T1")
+        self.assertEqual(data["settings"]["currency"], "EUR")
+
+    def test_query_count_does_not_grow_with_catalog(self):
+        """Test that the bundle is loaded with a fixed number of queries"""
+        self._query_count()  # warm the token and tenant caches
+        small_catalog_queries, _ = self._query_count()
+        self._add_items(10)
+        self._query_count()  # rebuild the menu catalog for its new version
+        large_catalog_queries, response = self._query_count()
+        self.assertEqual(len(response.json()["items"]), 12)
+        self.assertEqual(small_catalog_queries, large_catalog_queries)
+
+    def test_unchanged_catalog_returns_not_modified(self):
+        """Test ETag / If-None-Match handling"""
+        response = self.client.get("/api/pos/bootstrap/")
+        etag = response["ETag"]
+
+        response = self.client.get("/api/pos/bootstrap/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.category.name = "Pizzas"
+        self.category.save()
+        response = self.client.get("/api/pos/bootstrap/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_addon_and_counter_item_changes_change_etag(self):
+        """Test that every source of the bundle is part of its ETag"""
+        addon = MenuItemAddon.objects.create(
+            tenant=self.tenant, name="Extra Cheese", price=Decimal("1.50")
+        )
+        group = MenuItemAddonGroup.objects.create(tenant=self.tenant, name="Toppings")
+        MenuItemAddonGroupItem.objects.create(group=group, addon=addon)
+        etag = self.client.get("/api/pos/bootstrap/")["ETag"]
+
+        addon.price = Decimal("2.00")
+        addon.save()
+        response = self.client.get("/api/pos/bootstrap/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["addon_groups"][0]["items"][0]["addon"]["price"], "2.00"
+        )
+
+        # Swap an item of the counter: same number of links
+        etag = response["ETag"]
+        first = MenuItem.objects.order_by("name").first()
+        self.counter.items.remove(first)
+        self.counter.items.add(first)
+        response = self.client.get("/api/pos/bootstrap/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class POSSessionTotalsTestCase(QueryCountAssertionsMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        tenant_membership_cache.clear()
+
+        self.user = User.objects.create_user(
+            email="cashier@example.com", password="password123"
+        )
+        self.tenant = Tenant.objects.create(
+            name="Test Restaurant", slug="test-restaurant", owner=self.user
+        )
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="cashier")
+        self.item = MenuItem.objects.create(tenant=self.tenant, name="Soup", price=5)
+        self.session = POSSession.objects.create(
+            tenant=self.tenant, opened_by=self.user, opening_balance=Decimal("100.00")
+        )
+        self.client = jwt_client(self.user)
+
+    def _sell(self, method, amount):
+        response = self.client.post(
+            "/api/sales/orders/",
+            {
+                "session": str(self.session.id),
+                "lines": [{"menu_item": str(self.item.id), "quantity": 1}],
+                "payments": [{"method": method, "amount": amount}],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_totals_follow_payments_and_cash_movements(self):
+        """Test that running totals are updated as rows are recorded"""
+        self._sell("cash", "5.00")
+        self._sell("card", "5.00")
+        CashMovement.objects.create(
+            session=self.session, movement_type="out", amount=20, reason="petty_cash"
+        )
+        movement = CashMovement.objects.create(
+            session=self.session, movement_type="in", amount=7, reason="deposit"
+        )
+        movement.delete()
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.cash_sales, Decimal("5.00"))
+        self.assertEqual(self.session.card_sales, Decimal("5.00"))
+        self.assertEqual(self.session.expected_balance, Decimal("85.00"))
+
+    def test_change_is_not_counted_as_sales(self):
+        """Test that an overtendered cash sale adds only the order total"""
+        self._sell("cash", "20.00")
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.cash_sales, Decimal("5.00"))
+        self.assertEqual(self.session.expected_balance, Decimal("105.00"))
+
+        out = StringIO()
+        call_command("reconcile_pos_sessions", stdout=out)
+        self.assertIn("0 with drift", out.getvalue())
+
+    def test_summary_reads_one_row_and_close_reports_difference(self):
+        """Test that the live summary is O(1) and closing reports the count"""
+        self._sell("cash", "5.00")
+        self.client.get(f"/api/pos/session-summary/{self.session.id}/")
+
+        with self.assertMaxQueries(1):
+            response = self.client.get(f"/api/pos/session-summary/{self.session.id}/")
+        self.assertEqual(response.json()["expected_balance"], "105.00")
+
+        response = self.client.post(
+            "/api/pos/close-session/",
+            {"session": str(self.session.id), "closing_balance": "103.00"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "closed")
+        self.assertEqual(response.json()["difference"], "-2.00")
+
+    def test_reconcile_reports_and_fixes_drift(self):
+        """Test that the reconciliation command recomputes totals from rows"""
+        self._sell("cash", "5.00")
+        POSSession.objects.filter(pk=self.session.pk).update(cash_sales=0)
+
+        out = StringIO()
+        call_command("reconcile_pos_sessions", stdout=out)
+        self.assertIn("cash_sales: stored 0.00 != recomputed 5.00", out.getvalue())
+
+        call_command("reconcile_pos_sessions", "--fix", stdout=StringIO())
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.cash_sales, Decimal("5.00"))
+
+        out = StringIO()
+        call_command("reconcile_pos_sessions", stdout=out)
+        self.assertIn("0 with drift", out.getvalue())
@@ -0,0 +1,124 @@
+"""
+Running totals of POS sessions
+
+POSSession.cash_sales, card_sales, other_sales and expected_balance are
+maintained incrementally: every recorded payment and cash movement applies
+its amount with a single atomic F() UPDATE, so reading a live drawer balance
+or closing a session never scans the session's rows. A payment's amount is
+what was applied to the order; cash given back as change (change_given)
+never reaches the totals.
+
+Cash movements are treated as append-only: creating or deleting one updates
+the drawer, editing its amount in place does not.
+
+compute_session_totals() recomputes the same figures from the raw rows; the
+reconcile_pos_sessions command uses it to report and repair drift.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import DecimalField, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from apps.sales.models import Payment
+from .models import CashMovement, POSSession
+
+ZERO = Decimal("0.00")
+
+# Session field holding the sales of each payment method
+SALES_FIELDS = {
+    "cash": "cash_sales",
+    "card": "card_sales",
+    "other": "other_sales",
+}
+
+TOTAL_FIELDS = ("cash_sales", "card_sales", "other_sales", "expected_balance")
+
+
+def _increment(field, amount):
+    """F() expression adding amount to a nullable money field"""
+    return Coalesce(
+        F(field), Value(ZERO), output_field=DecimalField(max_digits=10, decimal_places=2)
+    ) + Value(amount)
+
+
+def apply_session_deltas(session_id, deltas):
+    """Atomically add {field: amount} to a session's totals in one UPDATE"""
+    updates = {
+        field: _increment(field, amount) for field, amount in deltas.items() if amount
+    }
+    if updates:
+        POSSession.objects.filter(pk=session_id).update(**updates)
+
+
+def record_payments(session_id, payments):
+    """
+    Add payments to their session's sales totals
+
+    Cash payments also raise the expected drawer balance. Used by checkout,
+    whose bulk_create does not send model signals.
+    """
+    if session_id is None:
+        return
+    deltas = defaultdict(lambda: ZERO)
+    for payment in payments:
+        deltas[SALES_FIELDS[payment.method]] += payment.amount
+    deltas["expected_balance"] = deltas.get("cash_sales", ZERO)
+    apply_session_deltas(session_id, deltas)
+
+
+def cash_movement_delta(movement):
+    """Signed effect of a cash movement on the drawer"""
+    return movement.amount if movement.movement_type == "in" else -movement.amount
+
+
+def compute_session_totals(session_ids=None):
+    """
+    Recompute totals of sessions from their payments and cash movements
+
+    Returns {session_id: {field: amount}} with two grouped aggregate
+    queries plus one for the opening balances, whatever the number of
+    sessions.
+    """
+    sessions = POSSession.objects.all()
+    payments = Payment.objects.filter(session__isnull=False)
+    movements = CashMovement.objects.all()
+    if session_ids is not None:
+        sessions = sessions.filter(pk__in=session_ids)
+        payments = payments.filter(session_id__in=session_ids)
+        movements = movements.filter(session_id__in=session_ids)
+
+    totals = {
+        session_id: {
+            "cash_sales": ZERO,
+            "card_sales": ZERO,
+            "other_sales": ZERO,
+            "expected_balance": opening_balance,
+        }
+        for session_id, opening_balance in sessions.values_list("id", "opening_balance")
+    }
+
+    for session_id, method, amount in (
+        payments.values("session_id", "method")
+        .annotate(amount=Sum("amount"))
+        .values_list("session_id", "method", "amount")
+    ):
+        if session_id not in totals:
+            continue
+        totals[session_id][SALES_FIELDS[method]] += amount
+        if method == "cash":
+            totals[session_id]["expected_balance"] += amount
+
+    for session_id, movement_type, amount in (
+        movements.values("session_id", "movement_type")
+        .annotate(amount=Sum("amount"))
+        .values_list("session_id", "movement_type", "amount")
+    ):
+        if session_id not in totals:
+            continue
+        totals[session_id]["expected_balance"] += (
+            amount if movement_type == "in" else -amount
+        )
+
+    return totals
@@ -0,0 +1,12 @@
+from django.urls import path
+from .views import ClosePOSSessionView, POSBootstrapView, POSSessionSummaryView
+
+urlpatterns = [
+    path("bootstrap/", POSBootstrapView.as_view(), name="pos-bootstrap"),
+    path(
+        "session-summary/<uuid:pk>/",
+        POSSessionSummaryView.as_view(),
+        name="pos-session-summary",
+    ),
+    path("close-session/", ClosePOSSessionView.as_view(), name="pos-close-session"),
+]
@@ -1,3 +1,83 @@
-from django.shortcuts import render
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from apps.core.permissions import IsTenantUser
+from apps.core.timing import TimedViewMixin
+from .bootstrap import get_catalog_etag, load_bootstrap_data
+from .models import POSSession
+from .serializers import ClosePOSSessionSerializer, POSSessionSummarySerializer
+
+
+class POSBootstrapView(TimedViewMixin, APIView):
+    """
+    Everything a POS terminal needs at startup in a single response
+
+    Returns the tenant's categories, active menu items with variants, addon
+    groups, counters with their item ids, active VAT taxes, restaurant
+    tables and tenant settings.
+
+    Responses carry an ETag; send it back in If-None-Match to get a 304
+    when the catalog has not changed since the terminal last loaded it.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsTenantUser]
+
+    def get(self, request, *args, **kwargs):
+        etag = get_catalog_etag(request.tenant)
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        data = load_bootstrap_data(request.tenant, {"request": request})
+        return Response(data, headers={"ETag": etag})
+
+
+class POSSessionSummaryView(TimedViewMixin, APIView):
+    """Live drawer balance and sales totals of a POS session"""
+
+    permission_classes = [permissions.IsAuthenticated, IsTenantUser]
+
+    def get(self, request, pk, *args, **kwargs):
+        session = get_object_or_404(POSSession, pk=pk, tenant=request.tenant)
+        return Response(POSSessionSummarySerializer(session).data)
+
+
+class ClosePOSSessionView(TimedViewMixin, APIView):
+    """
+    Close an open POS session with the counted cash
+
+    The expected balance is already maintained while the session is open,
+    so closing only records the count and reports the difference.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsTenantUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = ClosePOSSessionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        # Checkouts lock the session too, so closing waits for those in
+        # flight and the summary includes their payments
+        with transaction.atomic():
+            session = get_object_or_404(
+                POSSession.objects.select_for_update(),
+                pk=data["session"],
+                tenant=request.tenant,
+                status="open",
+            )
+            session.status = "closed"
+            session.closed_by = request.user
+            session.closed_at = timezone.now()
+            session.closing_balance = data["closing_balance"]
+            update_fields = ["status", "closed_by", "closed_at", "closing_balance"]
+            if "notes" in data:
+                session.notes = data["notes"]
+                update_fields.append("notes")
+            # Only write the closing fields; running totals belong to F() updates
+            session.save(update_fields=update_fields)
+        return Response(POSSessionSummarySerializer(session).data)
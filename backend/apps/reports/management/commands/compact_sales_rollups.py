@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from apps.reports.rollups import compact_rollups
+
+
+class Command(BaseCommand):
+    help = 'Merges sales rollup deltas into hourly rows and old hours into daily rows (run nightly)'
+
+    def handle(self, *args, **options):
+        merged_deltas, merged_hours = compact_rollups()
+        self.stdout.write(self.style.SUCCESS(
+            f'Merged {merged_deltas} delta row(s) into hours and {merged_hours} hour row(s) into days'
+        ))
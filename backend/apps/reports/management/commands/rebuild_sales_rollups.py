@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.reports.rollups import compact_rollups, rebuild_rollups
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds sales rollups from orders and cash movements (backfill or repair), then compacts them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=str, help='Only rebuild this tenant slug')
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.all()
+        if options.get('tenant'):
+            tenants = tenants.filter(slug=options['tenant'])
+            if not tenants.exists():
+                raise CommandError(f'Tenant "{options["tenant"]}" not found')
+
+        for tenant in tenants.iterator():
+            written = rebuild_rollups(tenant)
+            self.stdout.write(f'{tenant.slug}: {written} hourly row(s)')
+
+        merged_deltas, merged_hours = compact_rollups()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt; compacted {merged_hours} hour row(s) into days'
+        ))
@@ -0,0 +1,103 @@
+"""
+Menu margin analytics
+
+Margins are computed by the database from the sales rollups, which carry
+the cost recorded on every sold line (item or variant cost plus addons)
+next to its sales: one aggregate query per report, whatever the number of
+lines sold, with margin and margin percentage calculated in SQL.
+
+Reports are cached per tenant and local day. A range that ends before
+today no longer changes and is kept for CLOSED_TTL; one that includes
+today is kept for OPEN_TTL, so new orders show up within that delay.
+"""
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Case, DecimalField, ExpressionWrapper, F, Max, Sum, When
+from django.db.models.functions import Round
+
+from .models import SalesRollup
+from .rollups import NO_KEY
+
+
+DEFAULTS = {
+    "ALIAS": "default",
+    "OPEN_TTL": 60,
+    "CLOSED_TTL": 24 * 60 * 60,
+    "KEY_PREFIX": "menu-margins",
+}
+
+DIMENSIONS = ("item", "category", "counter")
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+
+def get_margin_settings():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "MARGIN_ANALYTICS", {}))
+    return config
+
+
+def margin_report(tenant, dimension, start, end):
+    """
+    Sales, cost and margin per key of a dimension between two datetimes,
+    largest margin first, plus the totals of the range
+    """
+    rows = list(
+        SalesRollup.objects.filter(
+            tenant=tenant, dimension=dimension, bucket__gte=start, bucket__lt=end
+        )
+        .values("key")
+        .annotate(
+            label=Max("label"),
+            quantity=Sum("quantity"),
+            sales=Sum("sales"),
+            cost=Sum("cost"),
+        )
+        .annotate(
+            margin=ExpressionWrapper(F("sales") - F("cost"), output_field=MONEY),
+            margin_percent=Case(
+                When(sales=0, then=None),
+                default=Round(
+                    (F("sales") - F("cost")) * 100 / F("sales"), 2, output_field=MONEY
+                ),
+            ),
+        )
+        .order_by("-margin", "key")
+    )
+    totals = SalesRollup.objects.filter(
+        tenant=tenant, dimension="total", bucket__gte=start, bucket__lt=end
+    ).aggregate(sales=Sum("sales"), cost=Sum("cost"))
+    sales = totals["sales"] or Decimal("0")
+    cost = totals["cost"] or Decimal("0")
+
+    for row in rows:
+        row["key"] = None if row["key"] == NO_KEY else str(row["key"])
+    return {
+        "rows": rows,
+        "totals": {
+            "sales": sales,
+            "cost": cost,
+            "margin": sales - cost,
+            "margin_percent": round((sales - cost) * 100 / sales, 2) if sales else None,
+        },
+    }
+
+
+def cached_margin_report(tenant, dimension, start, end, today, closed):
+    """
+    margin_report() through the cache; `today` is the tenant's local date
+    and `closed` tells whether the range ends before it
+    """
+    config = get_margin_settings()
+    cache = caches[config["ALIAS"]]
+    key = (
+        f"{config['KEY_PREFIX']}:{tenant.pk}:{today}:{dimension}:"
+        f"{start.isoformat()}:{end.isoformat()}"
+    )
+    report = cache.get(key)
+    if report is None:
+        report = margin_report(tenant, dimension, start, end)
+        cache.set(key, report, config["CLOSED_TTL" if closed else "OPEN_TTL"])
+    return report
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:50
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('tenants', '0002_tenantuser_tenant_user_tenant_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('granularity', models.CharField(choices=[('delta', 'Delta'), ('hour', 'Hour'), ('day', 'Day')], default='delta', max_length=5)),
+                ('bucket', models.DateTimeField()),
+                ('dimension', models.CharField(choices=[('total', 'Total'), ('item', 'Menu Item'), ('category', 'Category'), ('counter', 'Counter'), ('staff', 'Staff'), ('session', 'POS Session')], max_length=10)),
+                ('key', models.UUIDField()),
+                ('label', models.CharField(blank=True, max_length=255)),
+                ('order_count', models.IntegerField(default=0)),
+                ('quantity', models.IntegerField(default=0)),
+                ('sales', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cash_in', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cash_out', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_rollups', to='tenants.tenant')),
+            ],
+            options={
+                'verbose_name': 'Sales Rollup',
+                'verbose_name_plural': 'Sales Rollups',
+                'indexes': [models.Index(fields=['tenant', 'dimension', 'bucket'], name='reports_rollup_range_idx'), models.Index(fields=['granularity', 'bucket'], name='reports_rollup_compact_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salesrollup',
+            name='cost',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+    ]
@@ -0,0 +1,70 @@
+from django.db import models
+from apps.tenants.models import Tenant
+import uuid
+
+
+class SalesRollup(models.Model):
+    """
+    Pre-aggregated sales figures of one dimension key over a time bucket
+
+    Writes append "delta" rows (one per key touched by an order or cash
+    movement); compaction merges them into "hour" rows and old hours into
+    "day" rows (see apps.reports.rollups). Reports always SUM the rows of a
+    range, so a key may have several rows per bucket.
+    """
+
+    GRANULARITY_CHOICES = [
+        ("delta", "Delta"),
+        ("hour", "Hour"),
+        ("day", "Day"),
+    ]
+
+    DIMENSION_CHOICES = [
+        ("total", "Total"),
+        ("item", "Menu Item"),
+        ("category", "Category"),
+        ("counter", "Counter"),
+        ("staff", "Staff"),
+        ("session", "POS Session"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tenant = models.ForeignKey(
+        Tenant, on_delete=models.CASCADE, related_name="sales_rollups"
+    )
+    granularity = models.CharField(
+        max_length=5, choices=GRANULARITY_CHOICES, default="delta"
+    )
+    # Start of the hour (delta and hour rows) or of the tenant's local day
+    bucket = models.DateTimeField()
+    dimension = models.CharField(max_length=10, choices=DIMENSION_CHOICES)
+    # Id of the item, category, counter, user or session; NO_KEY for totals
+    # and for sales without one (e.g. uncategorized items)
+    key = models.UUIDField()
+    label = models.CharField(max_length=255, blank=True)
+
+    order_count = models.IntegerField(default=0)
+    quantity = models.IntegerField(default=0)
+    sales = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    # Cost of the goods sold, from the costs recorded on order lines
+    cost = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cash_in = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cash_out = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = "Sales Rollup"
+        verbose_name_plural = "Sales Rollups"
+        indexes = [
+            # Report ranges of one dimension
+            models.Index(
+                fields=["tenant", "dimension", "bucket"],
+                name="reports_rollup_range_idx",
+            ),
+            # Compaction of old deltas and hours
+            models.Index(
+                fields=["granularity", "bucket"], name="reports_rollup_compact_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension} {self.label or self.key} @ {self.bucket}"
@@ -0,0 +1,396 @@
+"""
+Sales rollups
+
+Reports never read orders or cash movements. Every write instead appends
+pre-aggregated "delta" rows to SalesRollup, one per dimension key it
+touches (the order total, each item and category, the counter, the cashier
+and the POS session) in the hour it happened, with a single bulk INSERT.
+
+Reports SUM the rows of a date range, grouped by key and optionally by
+hour, day or month, through the (tenant, dimension, bucket) index. The
+nightly compact_sales_rollups command keeps that range small: deltas of
+closed hours are merged into one "hour" row per key, and hours older than
+HOURLY_RETENTION_DAYS into one "day" row per key and tenant-local day.
+Hourly reports are therefore exact within the retention window only.
+"""
+
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Count,
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    Max,
+    Q,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce, Trunc
+from django.utils import timezone
+
+from apps.core.models import TenantSetting
+from apps.pos.models import CashMovement
+from apps.sales.models import OrderLine
+from apps.staff.models import StaffProfile
+from .models import SalesRollup
+
+
+DEFAULTS = {
+    "HOURLY_RETENTION_DAYS": 35,
+    "BATCH_SIZE": 1000,
+}
+
+# Key of totals, and of sales without an item category, counter or cashier
+NO_KEY = uuid.UUID(int=0)
+MEASURES = ("order_count", "quantity", "sales", "cost", "cash_in", "cash_out")
+PERIODS = ("hour", "day", "month")
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+# How rebuild_rollups() groups order lines per dimension: the key lookup,
+# the lookups the label is made from, and the label of rows without a key
+LINE_DIMENSIONS = {
+    "total": (None, (), ""),
+    "item": ("menu_item_id", ("name",), ""),
+    "category": ("menu_item__category_id", ("menu_item__category__name",), "Uncategorized"),
+    "counter": ("order__counter_id", ("order__counter__name",), "No counter"),
+    "staff": (
+        "order__created_by_id",
+        ("order__created_by__first_name", "order__created_by__last_name", "order__created_by__email"),
+        "Unknown",
+    ),
+    "session": ("order__session_id", ("order__session__opened_at",), ""),
+}
+CASH_DIMENSIONS = {
+    "total": None,
+    "session": "session_id",
+    "staff": "created_by_id",
+}
+
+
+def get_rollup_settings():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "SALES_ROLLUPS", {}))
+    return config
+
+
+def hour_bucket(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def tenant_timezone(name):
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def session_label(opened_at):
+    return f"Session {opened_at:%Y-%m-%d %H:%M}" if opened_at else ""
+
+
+def staff_label(first_name, last_name, email):
+    """A cashier's full name, else their email (as User.get_full_name())"""
+    return " ".join(name for name in (first_name, last_name) if name) or email or ""
+
+
+# Labels made from several lookups, or formatted (rebuild_rollups())
+LINE_LABELS = {"session": session_label, "staff": staff_label}
+
+
+class RollupBuilder:
+    """Sums the measures of one write per (dimension, key)"""
+
+    def __init__(self, tenant_id, moment):
+        self.tenant_id = tenant_id
+        self.bucket = hour_bucket(moment)
+        self.rows = {}
+
+    def add(self, dimension, key, label="", **measures):
+        row = self.rows.get((dimension, key or NO_KEY))
+        if row is None:
+            row = self.rows[(dimension, key or NO_KEY)] = SalesRollup(
+                tenant_id=self.tenant_id,
+                bucket=self.bucket,
+                dimension=dimension,
+                key=key or NO_KEY,
+                label=label[:255],
+            )
+        for measure, value in measures.items():
+            setattr(row, measure, getattr(row, measure) + value)
+        return row
+
+    def save(self):
+        SalesRollup.objects.bulk_create(self.rows.values())
+
+
+def record_order(order, lines, snapshot):
+    """
+    Append the rollup deltas of a checked out order (one bulk INSERT)
+
+    Categories come from the pricing snapshot, the counter, cashier and
+    session from the order's already loaded relations, so no query is
+    needed to label them.
+    """
+    builder = RollupBuilder(order.tenant_id, order.created_at)
+    quantity = sum(line.quantity for line in lines)
+    cost = sum((line.unit_cost * line.quantity for line in lines), Decimal("0"))
+    order_measures = {"quantity": quantity, "sales": order.subtotal, "cost": cost}
+    builder.add("total", NO_KEY, **order_measures)
+
+    for line in lines:
+        measures = {
+            "quantity": line.quantity,
+            "sales": line.line_total,
+            "cost": line.unit_cost * line.quantity,
+        }
+        builder.add("item", line.menu_item_id, line.name, **measures)
+        item = snapshot.items.get(line.menu_item_id)
+        if item and item.category_id:
+            builder.add("category", item.category_id, item.category_name, **measures)
+        else:
+            builder.add("category", NO_KEY, "Uncategorized", **measures)
+
+    counter = order.counter
+    builder.add(
+        "counter", counter and counter.pk, counter.name if counter else "No counter",
+        **order_measures,
+    )
+    user = order.created_by
+    builder.add(
+        "staff",
+        user and user.pk,
+        staff_label(user.first_name, user.last_name, user.email) if user else "Unknown",
+        **order_measures,
+    )
+    if order.session_id:
+        builder.add(
+            "session", order.session_id, session_label(order.session.opened_at),
+            **order_measures,
+        )
+
+    # Each key counts the order once, however many of its lines it has
+    for row in builder.rows.values():
+        row.order_count = 1
+    builder.save()
+
+
+def record_cash_movement(movement, sign=1):
+    """Append the rollup deltas of a created (sign 1) or deleted (-1) cash movement"""
+    amount = sign * movement.amount
+    measures = {"cash_in": amount} if movement.movement_type == "in" else {"cash_out": amount}
+    session = movement.session
+    builder = RollupBuilder(session.tenant_id, timezone.now())
+    builder.add("total", NO_KEY, **measures)
+    builder.add(
+        "session", session.pk, session_label(session.opened_at), **measures
+    )
+    builder.add("staff", movement.created_by_id, **measures)
+    builder.save()
+
+
+def sales_report(tenant, dimension, start, end, period=None, tz=None):
+    """
+    Summed rollups of one dimension between two datetimes, largest sales first
+
+    With a period ("hour", "day" or "month") rows are also grouped by that
+    period in the tenant's timezone. One aggregate query over the rollups,
+    plus one to name staff from their profiles.
+    """
+    rows = SalesRollup.objects.filter(
+        tenant=tenant, dimension=dimension, bucket__gte=start, bucket__lt=end
+    )
+    group = ["key"]
+    ordering = ["-sales", "key"]
+    if period:
+        rows = rows.annotate(period=Trunc("bucket", period, tzinfo=tz))
+        group = ["period", "key"]
+        ordering = ["period", *ordering]
+    rows = list(
+        rows.values(*group)
+        .annotate(label=Max("label"), **{measure: Sum(measure) for measure in MEASURES})
+        .order_by(*ordering)
+    )
+
+    if dimension == "staff":
+        profiles = dict(
+            StaffProfile.objects.filter(
+                tenant=tenant, user_id__in={row["key"] for row in rows}
+            ).values_list("user_id", "name")
+        )
+        for row in rows:
+            row["label"] = profiles.get(row["key"], row["label"])
+
+    for row in rows:
+        row["key"] = None if row["key"] == NO_KEY else str(row["key"])
+    return rows
+
+
+def rebuild_rollups(tenant, before=None):
+    """
+    Replace a tenant's rollups before a point in time (by default the
+    current hour) with hour rows aggregated from its orders and cash
+    movements
+
+    For backfilling history and repairing drift. Every dimension is one
+    grouped query computed by the database, whatever the number of lines.
+    Lines sold before costs were recorded are costed at the current menu
+    cost. Returns the number of rows written.
+    """
+    config = get_rollup_settings()
+    before = before or hour_bucket(timezone.now())
+    unit_cost = Coalesce(
+        "unit_cost", "variant__cost", "menu_item__cost", Value(Decimal("0")),
+        output_field=MONEY,
+    )
+    lines = OrderLine.objects.filter(
+        order__tenant=tenant, order__created_at__lt=before
+    ).annotate(
+        bucket=Trunc("order__created_at", "hour"),
+        line_cost=ExpressionWrapper(F("quantity") * unit_cost, output_field=MONEY),
+    )
+    movements = CashMovement.objects.filter(
+        session__tenant=tenant, created_at__lt=before
+    ).annotate(bucket=Trunc("created_at", "hour"))
+
+    def line_rows(dimension, key, labels, default_label):
+        group = ["bucket"] + ([key] if key else [])
+        for row in (
+            lines.values(*group)
+            .annotate(
+                **{f"label_{i}": Max(lookup) for i, lookup in enumerate(labels)},
+                order_count=Count("order_id", distinct=True),
+                quantity=Sum("quantity"),
+                sales=Sum("line_total"),
+                cost=Sum("line_cost"),
+            )
+            .order_by()
+            .iterator()
+        ):
+            values = [row[f"label_{i}"] for i in range(len(labels))]
+            if dimension in LINE_LABELS:
+                row_label = LINE_LABELS[dimension](*values)
+            else:
+                row_label = values[0] if values else ""
+            yield SalesRollup(
+                tenant=tenant,
+                granularity="hour",
+                bucket=row["bucket"],
+                dimension=dimension,
+                key=(row[key] if key else None) or NO_KEY,
+                label=(row_label or default_label)[:255],
+                order_count=row["order_count"],
+                quantity=row["quantity"],
+                sales=row["sales"],
+                cost=row["cost"],
+            )
+
+    def cash_rows(dimension, key):
+        group = ["bucket"] + ([key] if key else [])
+        for row in (
+            movements.values(*group)
+            .annotate(
+                cash_in=Coalesce(Sum("amount", filter=Q(movement_type="in")), Value(Decimal("0")), output_field=MONEY),
+                cash_out=Coalesce(Sum("amount", filter=Q(movement_type="out")), Value(Decimal("0")), output_field=MONEY),
+            )
+            .order_by()
+            .iterator()
+        ):
+            yield SalesRollup(
+                tenant=tenant,
+                granularity="hour",
+                bucket=row["bucket"],
+                dimension=dimension,
+                key=(row[key] if key else None) or NO_KEY,
+                cash_in=row["cash_in"],
+                cash_out=row["cash_out"],
+            )
+
+    written = 0
+    with transaction.atomic():
+        SalesRollup.objects.filter(tenant=tenant, bucket__lt=before).delete()
+        for dimension, (key, labels, default_label) in LINE_DIMENSIONS.items():
+            rows = list(line_rows(dimension, key, labels, default_label))
+            SalesRollup.objects.bulk_create(rows, batch_size=config["BATCH_SIZE"])
+            written += len(rows)
+        for dimension, key in CASH_DIMENSIONS.items():
+            rows = list(cash_rows(dimension, key))
+            SalesRollup.objects.bulk_create(rows, batch_size=config["BATCH_SIZE"])
+            written += len(rows)
+    return written
+
+
+def compact_rollups(now=None):
+    """
+    Merge deltas of closed hours into hour rows, and hours older than the
+    retention into tenant-local day rows
+
+    Returns (delta rows merged, hour rows merged). Deltas are only ever
+    written for the current hour, so everything before the previous hour
+    is closed.
+    """
+    config = get_rollup_settings()
+    now = now or timezone.now()
+
+    merged_deltas = _merge(
+        SalesRollup.objects.filter(
+            granularity="delta", bucket__lt=hour_bucket(now) - timedelta(hours=1)
+        ),
+        "hour",
+        lambda rows: rows.annotate(target=F("bucket")),
+        config["BATCH_SIZE"],
+    )
+
+    old_hours = SalesRollup.objects.filter(
+        granularity="hour",
+        bucket__lt=hour_bucket(now) - timedelta(days=config["HOURLY_RETENTION_DAYS"]),
+    )
+    tenant_ids = set(old_hours.values_list("tenant_id", flat=True).distinct())
+    timezones = dict(
+        TenantSetting.objects.filter(tenant_id__in=tenant_ids).values_list(
+            "tenant_id", "timezone"
+        )
+    )
+    by_timezone = {}
+    for tenant_id in tenant_ids:
+        by_timezone.setdefault(timezones.get(tenant_id, "UTC"), []).append(tenant_id)
+
+    merged_hours = 0
+    for name, ids in by_timezone.items():
+        tz = tenant_timezone(name)
+        merged_hours += _merge(
+            old_hours.filter(tenant_id__in=ids),
+            "day",
+            lambda rows: rows.annotate(target=Trunc("bucket", "day", tzinfo=tz)),
+            config["BATCH_SIZE"],
+        )
+    return merged_deltas, merged_hours
+
+
+def _merge(queryset, granularity, with_target, batch_size):
+    """Replace the rows of a queryset by their sums per tenant, target bucket and key"""
+    with transaction.atomic():
+        merged = [
+            SalesRollup(
+                tenant_id=row["tenant_id"],
+                granularity=granularity,
+                bucket=row["target"],
+                dimension=row["dimension"],
+                key=row["key"],
+                label=row["label"],
+                **{measure: row[measure] for measure in MEASURES},
+            )
+            for row in with_target(queryset)
+            .values("tenant_id", "target", "dimension", "key")
+            .annotate(label=Max("label"), **{measure: Sum(measure) for measure in MEASURES})
+            .order_by()
+            .iterator()
+        ]
+        deleted, _ = queryset.delete()
+        SalesRollup.objects.bulk_create(merged, batch_size=batch_size)
+    return deleted
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.pos.models import CashMovement
+from .rollups import record_cash_movement
+
+
+@receiver(post_save, sender=CashMovement)
+def add_cash_movement_rollups(sender, instance, created, **kwargs):
+    if created:
+        record_cash_movement(instance)
+
+
+@receiver(post_delete, sender=CashMovement)
+def remove_cash_movement_rollups(sender, instance, origin=None, **kwargs):
+    # Only direct deletes: a movement removed with its session or tenant
+    # stays in the history, and a tenant's rollups are being deleted too
+    if isinstance(origin, CashMovement) or getattr(origin, "model", None) is CashMovement:
+        record_cash_movement(instance, sign=-1)
@@ -0,0 +1,225 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from apps.core.cache import tenant_membership_cache
+from apps.core.testing import QueryCountAssertionsMixin, jwt_client
+from apps.tenants.models import Tenant, TenantUser
+from apps.menu.models import Category, MenuItem
+from apps.pos.models import CashMovement, POSSession
+from apps.settings.counters.models import Counter
+from apps.staff.models import StaffProfile
+from .models import SalesRollup
+from apps.sales.models import OrderLine
+from .rollups import compact_rollups, rebuild_rollups
+
+User = get_user_model()
+
+
+class SalesRollupTestCase(QueryCountAssertionsMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        tenant_membership_cache.clear()
+
+        self.user = User.objects.create_user(
+            email="owner@example.com", password="password123"
+        )
+        self.tenant = Tenant.objects.create(
+            name="Test Restaurant", slug="test-restaurant", owner=self.user
+        )
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="owner")
+        StaffProfile.objects.create(
+            tenant=self.tenant,
+            user=self.user,
+            name="Ada Cashier",
+            position="cashier",
+            email="owner@example.com",
+            phone_number="123",
+        )
+        self.counter = Counter.objects.create(tenant=self.tenant, name="Front")
+        self.session = POSSession.objects.create(tenant=self.tenant, opened_by=self.user)
+        self.pizzas = Category.objects.create(tenant=self.tenant, name="Pizzas")
+        self.pizza = MenuItem.objects.create(
+            tenant=self.tenant,
+            category=self.pizzas,
+            name="Pizza",
+            price=Decimal("10.00"),
+            cost=Decimal("4.00"),
+        )
+        self.soda = MenuItem.objects.create(
+            tenant=self.tenant, name="Soda", price=Decimal("2.50"), cost=Decimal("0.50")
+        )
+        self.client = jwt_client(self.user)
+
+    def _checkout(self, lines):
+        response = self.client.post(
+            "/api/sales/orders/",
+            {
+                "session": str(self.session.id),
+                "counter": str(self.counter.id),
+                "lines": [
+                    {"menu_item": str(item.id), "quantity": quantity}
+                    for item, quantity in lines
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def _report(self, **params):
+        response = self.client.get("/api/reports/sales/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return {row["label"]: row for row in response.json()["rows"]}
+
+    def test_orders_are_rolled_up_per_dimension(self):
+        """Test that each dimension sums the checked out orders"""
+        self._checkout([(self.pizza, 2), (self.soda, 1)])
+        self._checkout([(self.pizza, 1)])
+
+        total = self._report()[""]
+        self.assertEqual(total["order_count"], 2)
+        self.assertEqual(total["quantity"], 4)
+        self.assertEqual(Decimal(total["sales"]), Decimal("32.50"))
+
+        items = self._report(dimension="item")
+        self.assertEqual(items["Pizza"]["order_count"], 2)
+        self.assertEqual(items["Pizza"]["quantity"], 3)
+        self.assertEqual(Decimal(items["Soda"]["sales"]), Decimal("2.50"))
+
+        categories = self._report(dimension="category")
+        self.assertEqual(Decimal(categories["Pizzas"]["sales"]), Decimal("30.00"))
+        self.assertIsNone(categories["Uncategorized"]["key"])
+        self.assertEqual(self._report(dimension="counter")["Front"]["order_count"], 2)
+        # Staff are named from their profiles
+        self.assertEqual(self._report(dimension="staff")["Ada Cashier"]["quantity"], 4)
+
+    def test_cash_movements_are_rolled_up(self):
+        """Test that created and deleted cash movements move the cash figures"""
+        movement = CashMovement.objects.create(
+            session=self.session, movement_type="in", amount=50, reason="float"
+        )
+        CashMovement.objects.create(
+            session=self.session, movement_type="out", amount=20, reason="petty_cash"
+        )
+        movement.delete()
+
+        total = self._report()[""]
+        self.assertEqual(Decimal(total["cash_in"]), Decimal("0"))
+        self.assertEqual(Decimal(total["cash_out"]), Decimal("20"))
+
+    def test_report_reads_only_rollups(self):
+        """Test that a report costs the same queries whatever the range"""
+        self._checkout([(self.pizza, 1)])
+        self.client.get("/api/reports/sales/")
+        with self.assertMaxQueries(2):
+            self._report(dimension="item", start="2020-01-01", period="day")
+        with self.assertMaxQueries(3):
+            self._report(dimension="staff")
+
+    def test_compaction_keeps_totals(self):
+        """Test that compacting deltas into hours and days keeps the sums"""
+        for _ in range(3):
+            self._checkout([(self.pizza, 1), (self.soda, 2)])
+        old = timezone.now() - timedelta(days=10)
+        SalesRollup.objects.update(bucket=old.replace(minute=0, second=0, microsecond=0))
+        before = self._report(dimension="item", start=f"{old:%Y-%m-%d}")
+        deltas = SalesRollup.objects.count()
+
+        merged_deltas, merged_hours = compact_rollups()
+        self.assertEqual(merged_deltas, deltas)
+        self.assertEqual(merged_hours, 0)
+        self.assertFalse(SalesRollup.objects.filter(granularity="delta").exists())
+
+        compact_rollups(now=timezone.now() + timedelta(days=60))
+        self.assertEqual(
+            set(SalesRollup.objects.values_list("granularity", flat=True)), {"day"}
+        )
+        # One row per dimension key: total, 2 items, 2 categories, counter,
+        # staff, session
+        self.assertEqual(SalesRollup.objects.count(), 8)
+        self.assertEqual(
+            self._report(dimension="item", start=f"{old:%Y-%m-%d}"), before
+        )
+
+    def test_invalid_parameters_are_rejected(self):
+        """Test that unknown dimensions, periods and dates are a 400"""
+        for params in (
+            {"dimension": "weather"},
+            {"period": "week"},
+            {"start": "yesterday"},
+            {"start": "2024-02-01", "end": "2024-01-01"},
+            {"period": "hour", "start": "2024-01-01", "end": "2024-06-01"},
+        ):
+            response = self.client.get("/api/reports/sales/", params)
+            self.assertEqual(response.status_code, 400, params)
+
+    def test_tenant_with_cash_movements_can_be_deleted(self):
+        """Test that rollups written by cascading deletes do not block them"""
+        CashMovement.objects.create(
+            session=self.session, movement_type="in", amount=50, reason="float"
+        )
+        self.tenant.delete()
+        self.assertFalse(SalesRollup.objects.exists())
+
+    def test_margins_per_item_and_category(self):
+        """Test that margins come from the costs recorded at checkout"""
+        self._checkout([(self.pizza, 3), (self.soda, 2)])
+        # Later cost changes do not rewrite what was sold
+        MenuItem.objects.filter(pk=self.pizza.pk).update(cost=Decimal("9.00"))
+
+        response = self.client.get("/api/reports/margins/", {"dimension": "item"})
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+        pizza, soda = data["rows"]
+        self.assertEqual(pizza["label"], "Pizza")
+        self.assertEqual(Decimal(pizza["cost"]), Decimal("12.00"))
+        self.assertEqual(Decimal(pizza["margin"]), Decimal("18.00"))
+        self.assertEqual(Decimal(pizza["margin_percent"]), Decimal("60.00"))
+        self.assertEqual(Decimal(soda["margin"]), Decimal("4.00"))
+        self.assertEqual(Decimal(data["totals"]["margin"]), Decimal("22.00"))
+
+        response = self.client.get("/api/reports/margins/", {"dimension": "category"})
+        labels = {row["label"]: row for row in response.json()["rows"]}
+        self.assertEqual(Decimal(labels["Pizzas"]["margin"]), Decimal("18.00"))
+
+    def test_margin_reports_are_cached(self):
+        """Test that a repeated report only looks up the tenant timezone"""
+        self._checkout([(self.pizza, 1)])
+        self.client.get("/api/reports/margins/")
+        with self.assertMaxQueries(1):
+            response = self.client.get("/api/reports/margins/")
+        self.assertEqual(Decimal(response.json()["rows"][0]["margin"]), Decimal("6.00"))
+
+    def test_rebuild_matches_incremental_rollups(self):
+        """Test that rebuilding from orders reproduces the live rollups"""
+        self._checkout([(self.pizza, 2), (self.soda, 1)])
+        self._checkout([(self.soda, 4)])
+        CashMovement.objects.create(
+            session=self.session, movement_type="in", amount=50, reason="float"
+        )
+        reports = {
+            dimension: self._report(dimension=dimension)
+            for dimension in ("total", "item", "category", "counter", "session")
+        }
+        # Lines sold before costs were recorded fall back to the menu cost
+        OrderLine.objects.filter(menu_item=self.soda).update(unit_cost=None)
+
+        rebuild_rollups(self.tenant, before=timezone.now() + timedelta(hours=1))
+        self.assertFalse(SalesRollup.objects.filter(granularity="delta").exists())
+        for dimension, report in reports.items():
+            self.assertEqual(self._report(dimension=dimension), report, dimension)
+
+    def test_rebuild_labels_staff_like_checkout(self):
+        """Test that staff without a profile keep the same label after a rebuild"""
+        StaffProfile.objects.filter(user=self.user).delete()
+        self.user.first_name = "Ada"
+        self.user.last_name = "Lovelace"
+        self.user.save()
+        self._checkout([(self.pizza, 1)])
+        report = self._report(dimension="staff")
+        self.assertIn("Ada Lovelace", report)
+
+        rebuild_rollups(self.tenant, before=timezone.now() + timedelta(hours=1))
+        self.assertEqual(self._report(dimension="staff"), report)
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import MarginReportView, SalesReportView
+
+urlpatterns = [
+    path("sales/", SalesReportView.as_view(), name="sales-report"),
+    path("margins/", MarginReportView.as_view(), name="margin-report"),
+]
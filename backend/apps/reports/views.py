@@ -0,0 +1,134 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.core.models import TenantSetting
+from apps.core.permissions import IsTenantManager
+from apps.core.timing import TimedViewMixin
+from . import margins
+from .models import SalesRollup
+from .rollups import PERIODS, sales_report, tenant_timezone
+
+DIMENSIONS = [dimension for dimension, _ in SalesRollup.DIMENSION_CHOICES]
+MAX_HOURLY_DAYS = 31
+
+
+class ReportView(TimedViewMixin, APIView):
+    """
+    Base of the report views: reads the inclusive start and end dates,
+    tenant-local, the last 7 days by default
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsTenantManager]
+    # Reports may read from a replica (see apps.core.replicas)
+    replica_actions = ("get",)
+
+    def get_range(self, request):
+        """(timezone, today, first day, last day) of the requested range"""
+        tz = tenant_timezone(
+            TenantSetting.objects.filter(tenant=request.tenant)
+            .values_list("timezone", flat=True)
+            .first()
+        )
+        today = timezone.now().astimezone(tz).date()
+        end = self._date(request.query_params, "end", today)
+        start = self._date(request.query_params, "start", end - timedelta(days=6))
+        if start > end:
+            raise ValidationError({"start": "Must not be after end."})
+        return tz, today, start, end
+
+    @staticmethod
+    def bounds(tz, start, end):
+        """Datetimes from the start of the first day to the end of the last"""
+        return (
+            datetime.combine(start, time.min, tzinfo=tz),
+            datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz),
+        )
+
+    @staticmethod
+    def choice(params, name, choices, default=None):
+        value = params.get(name) or default
+        if value is not None and value not in choices:
+            raise ValidationError({name: f"Choose one of: {', '.join(choices)}."})
+        return value
+
+    @staticmethod
+    def _date(params, name, default):
+        value = params.get(name)
+        if not value:
+            return default
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: "Use the YYYY-MM-DD format."})
+        return parsed
+
+
+class SalesReportView(ReportView):
+    """
+    Sales of a tenant by dimension, read from the pre-aggregated rollups
+
+    GET ?dimension=total|item|category|counter|staff|session
+        &start=YYYY-MM-DD&end=YYYY-MM-DD
+        &period=hour|day|month (optional; one row per key and period)
+    """
+
+    def get(self, request, *args, **kwargs):
+        dimension = self.choice(request.query_params, "dimension", DIMENSIONS, "total")
+        period = self.choice(request.query_params, "period", PERIODS)
+        tz, today, start, end = self.get_range(request)
+        if period == "hour" and (end - start).days >= MAX_HOURLY_DAYS:
+            raise ValidationError(
+                {"period": f"Hourly reports cover at most {MAX_HOURLY_DAYS} days."}
+            )
+
+        rows = sales_report(
+            request.tenant, dimension, *self.bounds(tz, start, end), period=period, tz=tz
+        )
+        return Response(
+            {
+                "dimension": dimension,
+                "start": start,
+                "end": end,
+                "period": period,
+                "timezone": str(tz),
+                "rows": rows,
+            }
+        )
+
+
+class MarginReportView(ReportView):
+    """
+    Menu margins (sales minus the cost of the goods sold) by dimension
+
+    GET ?dimension=item|category|counter&start=YYYY-MM-DD&end=YYYY-MM-DD
+    """
+
+    def get(self, request, *args, **kwargs):
+        dimension = self.choice(
+            request.query_params, "dimension", margins.DIMENSIONS, "item"
+        )
+        tz, today, start, end = self.get_range(request)
+        report = margins.cached_margin_report(
+            request.tenant,
+            dimension,
+            *self.bounds(tz, start, end),
+            today=today,
+            closed=end < today,
+        )
+        return Response(
+            {
+                "dimension": dimension,
+                "start": start,
+                "end": end,
+                "timezone": str(tz),
+                **report,
+            }
+        )
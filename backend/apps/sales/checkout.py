@@ -0,0 +1,205 @@
+"""
+Checkout write path
+
+An order is priced entirely in memory against a MenuSnapshot and written
+in one transaction: one INSERT for the order, one bulk INSERT for its lines
+and one for its payments, plus one locking SELECT and one UPDATE of the
+POS session, whatever the size of the ticket. One more bulk INSERT appends the order's
+sales rollups (apps.reports.rollups) and, with the kitchen display enabled,
+another creates its kitchen tickets (apps.kitchen.fanout).
+"""
+
+import uuid
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.kitchen.fanout import route_order
+from apps.pos.models import POSSession
+from apps.pos.totals import record_payments
+from apps.reports.rollups import record_order
+from .models import Order, OrderLine, Payment
+from .snapshot import MenuSnapshot
+
+CENT = Decimal("0.01")
+
+
+def to_money(value):
+    """Round a Decimal to cents"""
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def generate_order_number():
+    """Short, human readable order number that needs no counter query"""
+    return f"{timezone.now():%y%m%d}-{uuid.uuid4().hex[:6].upper()}"
+
+
+def price_lines(snapshot, lines_data):
+    """
+    Validate order lines against the snapshot and price them
+
+    Returns the unsaved OrderLine objects and the order subtotal. Errors are
+    collected for every line and raised together, keyed by line index.
+    """
+    lines = []
+    errors = {}
+    subtotal = Decimal("0")
+
+    for position, data in enumerate(lines_data):
+        item = snapshot.items.get(data["menu_item"])
+        if item is None:
+            errors[position] = ["Menu item is not available."]
+            continue
+
+        variant = None
+        base_price = item.price
+        base_cost = item.cost
+        if data.get("variant"):
+            variant = snapshot.variants.get(data["variant"])
+            if variant is None or variant.menu_item_id != item.id:
+                errors[position] = ["Variant is not available for this item."]
+                continue
+            base_price = variant.price
+            base_cost = variant.cost
+
+        addon_ids = data.get("addons", [])
+        missing = [str(addon_id) for addon_id in addon_ids if addon_id not in snapshot.addons]
+        if missing:
+            errors[position] = [f"Addons not available: {', '.join(missing)}."]
+            continue
+        addons = [snapshot.addons[addon_id] for addon_id in addon_ids]
+
+        unit_price = base_price + sum((addon.price for addon in addons), Decimal("0"))
+        expected = data.get("unit_price")
+        if expected is not None and to_money(expected) != to_money(unit_price):
+            errors[position] = [
+                f"Price changed from {expected} to {unit_price}; reload the menu."
+            ]
+            continue
+
+        line_total = to_money(unit_price * data["quantity"])
+        subtotal += line_total
+        lines.append(
+            OrderLine(
+                position=position,
+                menu_item_id=item.id,
+                variant_id=variant.id if variant else None,
+                name=item.name,
+                variant_name=variant.name if variant else "",
+                addons=[
+                    {"id": str(addon.id), "name": addon.name, "price": str(addon.price)}
+                    for addon in addons
+                ],
+                quantity=data["quantity"],
+                unit_price=unit_price,
+                unit_cost=base_cost + sum((addon.cost for addon in addons), Decimal("0")),
+                line_total=line_total,
+                notes=data.get("notes", ""),
+            )
+        )
+
+    if errors:
+        raise serializers.ValidationError({"lines": errors})
+    return lines, subtotal
+
+
+def apply_payments(payments_data, total):
+    """
+    Apply the tendered payments to an order total, in order
+
+    Returns (applied amount, change given) per payment and the amount paid.
+    Only cash may exceed what is still due: the order keeps the applied
+    amount and the rest is change. A payment after the order is covered,
+    or an overpaid card or other payment, is rejected.
+    """
+    applied = []
+    errors = {}
+    remaining = total
+
+    for position, payment in enumerate(payments_data):
+        tendered = payment["amount"]
+        if tendered > remaining:
+            if remaining <= 0:
+                errors[position] = ["The order is already paid in full."]
+                continue
+            if payment["method"] != "cash":
+                errors[position] = [f"Only {remaining} is due; only cash gives change."]
+                continue
+        amount = min(tendered, remaining)
+        applied.append((amount, tendered - amount))
+        remaining -= amount
+
+    if errors:
+        raise serializers.ValidationError({"payments": errors})
+    return applied, total - remaining
+
+
+def checkout(tenant, user, data, snapshot=None):
+    """
+    Price and save an order with its lines and payments
+
+    `data` is CheckoutSerializer.validated_data. The returned order carries
+    its lines and payments as prefetched results, so serializing it runs no
+    further queries.
+    """
+    if snapshot is None:
+        snapshot = MenuSnapshot.load(tenant)
+    lines, subtotal = price_lines(snapshot, data["lines"])
+
+    service_charge = to_money(subtotal * snapshot.service_charge_rate / 100)
+    tax_total = to_money(subtotal * snapshot.tax_rate / 100)
+    total = subtotal + service_charge + tax_total
+    applied, amount_paid = apply_payments(data.get("payments", []), total)
+
+    session = data.get("session")
+    order = Order(
+        tenant=tenant,
+        number=generate_order_number(),
+        session=session,
+        counter=data.get("counter"),
+        table=data.get("table"),
+        order_type=data.get("order_type", "dine_in"),
+        status="paid" if amount_paid >= total else "open",
+        subtotal=subtotal,
+        service_charge=service_charge,
+        tax_total=tax_total,
+        total=total,
+        amount_paid=amount_paid,
+        notes=data.get("notes", ""),
+        created_by=user,
+    )
+    payments = [
+        Payment(
+            order=order,
+            session=session,
+            method=payment["method"],
+            amount=amount,
+            change_given=change,
+            reference=payment.get("reference", ""),
+            created_by=user,
+        )
+        for payment, (amount, change) in zip(data.get("payments", []), applied)
+    ]
+
+    with transaction.atomic():
+        # The session was open when validated; lock it so that it cannot
+        # close before the payments reach its totals
+        if session is not None and not POSSession.objects.select_for_update().filter(
+            pk=session.pk, status="open"
+        ).exists():
+            raise serializers.ValidationError({"session": ["POS session is closed."]})
+        order.save(force_insert=True)
+        for line in lines:
+            line.order = order
+        OrderLine.objects.bulk_create(lines)
+        if payments:
+            Payment.objects.bulk_create(payments)
+            record_payments(session.pk if session else None, payments)
+        record_order(order, lines, snapshot)
+        if snapshot.kitchen_display:
+            route_order(order, lines)
+
+    order._prefetched_objects_cache = {"lines": lines, "payments": payments}
+    return order
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderline',
+            name='unit_cost',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Item or variant cost plus addons at checkout; null on older lines', max_digits=10, null=True),
+        ),
+    ]
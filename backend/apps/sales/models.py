@@ -0,0 +1,157 @@
+from django.db import models
+from apps.tenants.models import Tenant
+from apps.authentication.models import User
+from apps.menu.models import MenuItem, MenuItemVariant
+from apps.pos.models import POSSession
+from apps.settings.counters.models import Counter
+from apps.management.table.models import RestaurantTable
+import uuid
+
+
+class Order(models.Model):
+    """A customer ticket rung up at a POS counter"""
+
+    ORDER_TYPE_CHOICES = [
+        ("dine_in", "Dine In"),
+        ("takeaway", "Takeaway"),
+        ("delivery", "Delivery"),
+    ]
+
+    STATUS_CHOICES = [
+        ("open", "Open"),
+        ("paid", "Paid"),
+        ("cancelled", "Cancelled"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name="orders")
+    number = models.CharField(max_length=20)
+    session = models.ForeignKey(
+        POSSession, on_delete=models.SET_NULL, related_name="orders", null=True, blank=True
+    )
+    counter = models.ForeignKey(
+        Counter, on_delete=models.SET_NULL, related_name="orders", null=True, blank=True
+    )
+    table = models.ForeignKey(
+        RestaurantTable,
+        on_delete=models.SET_NULL,
+        related_name="orders",
+        null=True,
+        blank=True,
+    )
+    order_type = models.CharField(
+        max_length=10, choices=ORDER_TYPE_CHOICES, default="dine_in"
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="open")
+
+    subtotal = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    service_charge = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    tax_total = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    total = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    amount_paid = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+
+    notes = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, related_name="orders", null=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Order"
+        verbose_name_plural = "Orders"
+        ordering = ["-created_at"]
+        indexes = [
+            # Keyset pagination over the default ordering
+            models.Index(
+                fields=["tenant", "-created_at"], name="sales_order_tenant_created_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Order {self.number} ({self.tenant.name})"
+
+
+class OrderLine(models.Model):
+    """
+    A priced line of an order
+
+    Names, prices and costs are copied from the menu at checkout, so later menu
+    edits never change what was sold.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="lines")
+    position = models.PositiveIntegerField(default=0)
+    menu_item = models.ForeignKey(
+        MenuItem, on_delete=models.SET_NULL, related_name="order_lines", null=True
+    )
+    variant = models.ForeignKey(
+        MenuItemVariant,
+        on_delete=models.SET_NULL,
+        related_name="order_lines",
+        null=True,
+        blank=True,
+    )
+    name = models.CharField(max_length=100)
+    variant_name = models.CharField(max_length=50, blank=True)
+    # Selected addons as [{"id", "name", "price"}]
+    addons = models.JSONField(default=list, blank=True)
+    quantity = models.PositiveIntegerField(default=1)
+    unit_price = models.DecimalField(
+        max_digits=10, decimal_places=2, help_text="Item or variant price plus addons"
+    )
+    line_total = models.DecimalField(max_digits=10, decimal_places=2)
+    unit_cost = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Item or variant cost plus addons at checkout; null on older lines",
+    )
+    notes = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = "Order Line"
+        verbose_name_plural = "Order Lines"
+        ordering = ["position"]
+
+    def __str__(self):
+        return f"{self.quantity} x {self.name}"
+
+
+class Payment(models.Model):
+    """A payment taken against an order"""
+
+    METHOD_CHOICES = [
+        ("cash", "Cash"),
+        ("card", "Card"),
+        ("other", "Other"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="payments")
+    session = models.ForeignKey(
+        POSSession,
+        on_delete=models.SET_NULL,
+        related_name="payments",
+        null=True,
+        blank=True,
+    )
+    method = models.CharField(max_length=10, choices=METHOD_CHOICES)
+    # Amount applied to the order; cash handed over beyond it is change
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    change_given = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    reference = models.CharField(max_length=100, blank=True)
+    created_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, related_name="payments", null=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Payment"
+        verbose_name_plural = "Payments"
+        ordering = ["created_at"]
+
+    def __str__(self):
+        return f"{self.get_method_display()} - {self.amount}"
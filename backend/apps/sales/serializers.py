@@ -0,0 +1,137 @@
+from rest_framework import serializers
+from apps.management.table.models import RestaurantTable
+from apps.pos.models import POSSession
+from apps.settings.counters.models import Counter
+from .models import Order, OrderLine, Payment
+
+
+class OrderLineSerializer(serializers.ModelSerializer):
+    """Serializer for OrderLine model"""
+
+    class Meta:
+        model = OrderLine
+        fields = [
+            "id",
+            "position",
+            "menu_item",
+            "variant",
+            "name",
+            "variant_name",
+            "addons",
+            "quantity",
+            "unit_price",
+            "line_total",
+            "notes",
+        ]
+        read_only_fields = fields
+
+
+class PaymentSerializer(serializers.ModelSerializer):
+    """Serializer for Payment model"""
+
+    class Meta:
+        model = Payment
+        fields = ["id", "method", "amount", "change_given", "reference", "created_at"]
+        read_only_fields = fields
+
+
+class OrderSerializer(serializers.ModelSerializer):
+    """
+    Serializer for Order model with its lines and payments
+
+    Querysets should prefetch "lines" and "payments".
+    """
+
+    lines = OrderLineSerializer(many=True, read_only=True)
+    payments = PaymentSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Order
+        fields = [
+            "id",
+            "number",
+            "session",
+            "counter",
+            "table",
+            "order_type",
+            "status",
+            "subtotal",
+            "service_charge",
+            "tax_total",
+            "total",
+            "amount_paid",
+            "notes",
+            "lines",
+            "payments",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class CheckoutLineSerializer(serializers.Serializer):
+    """A line of a checkout request"""
+
+    menu_item = serializers.UUIDField()
+    variant = serializers.UUIDField(required=False, allow_null=True)
+    addons = serializers.ListField(
+        child=serializers.UUIDField(), required=False, default=list
+    )
+    quantity = serializers.IntegerField(min_value=1, max_value=999)
+    # Price the terminal displayed; rejected if the menu has changed since
+    unit_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, required=False, allow_null=True
+    )
+    notes = serializers.CharField(required=False, allow_blank=True, default="")
+
+
+class CheckoutPaymentSerializer(serializers.Serializer):
+    """A payment taken at checkout"""
+
+    method = serializers.ChoiceField(choices=Payment.METHOD_CHOICES)
+    # Amount tendered; cash above the amount due is given back as change
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    reference = serializers.CharField(
+        max_length=100, required=False, allow_blank=True, default=""
+    )
+
+
+class CheckoutSerializer(serializers.Serializer):
+    """
+    Input of the checkout endpoint
+
+    Menu references are plain ids, checked against the menu snapshot by
+    apps.sales.checkout; session, counter and table are restricted to the
+    request's tenant.
+    """
+
+    session = serializers.PrimaryKeyRelatedField(
+        queryset=POSSession.objects.none(), required=False, allow_null=True
+    )
+    counter = serializers.PrimaryKeyRelatedField(
+        queryset=Counter.objects.none(), required=False, allow_null=True
+    )
+    table = serializers.PrimaryKeyRelatedField(
+        queryset=RestaurantTable.objects.none(), required=False, allow_null=True
+    )
+    order_type = serializers.ChoiceField(
+        choices=Order.ORDER_TYPE_CHOICES, required=False, default="dine_in"
+    )
+    notes = serializers.CharField(required=False, allow_blank=True, default="")
+    lines = CheckoutLineSerializer(many=True, allow_empty=False)
+    payments = CheckoutPaymentSerializer(many=True, required=False, default=list)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        tenant = getattr(self.context.get("request"), "tenant", None)
+        if tenant is not None:
+            self.fields["session"].queryset = POSSession.objects.filter(tenant=tenant)
+            self.fields["counter"].queryset = Counter.objects.filter(tenant=tenant)
+            self.fields["table"].queryset = RestaurantTable.objects.filter(
+                tenant=tenant
+            )
+
+    def validate_session(self, session):
+        if session is not None and session.status != "open":
+            raise serializers.ValidationError("POS session is closed.")
+        return session
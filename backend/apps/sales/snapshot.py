@@ -0,0 +1,100 @@
+"""
+In-memory view of a tenant's sellable menu, used to price orders
+
+Checkout validates and prices every line against one snapshot instead of
+looking items, variants and addons up per line. The menu part comes from
+the cached menu catalog (apps.menu.catalog), so only the tax rates and the
+tenant settings are queried.
+"""
+
+import uuid
+from collections import namedtuple
+from decimal import Decimal
+
+from django.db.models import Sum
+
+from apps.core.models import TenantSetting
+from apps.menu.catalog import menu_catalog
+from apps.settings.vat.models import VatTax
+
+# A sellable item, variant or addon; menu_item_id is only set for variants,
+# the category only for items
+MenuEntry = namedtuple(
+    "MenuEntry",
+    "id name price menu_item_id category_id category_name cost",
+    defaults=(None, None, "", Decimal("0")),
+)
+
+
+class MenuSnapshot:
+    """
+    Active menu items, variants and addons of a tenant keyed by id, plus
+    the rates applied to order totals and whether orders go to the kitchen
+    display
+    """
+
+    def __init__(
+        self, items, variants, addons, tax_rate, service_charge_rate, kitchen_display=False
+    ):
+        self.items = items
+        self.variants = variants
+        self.addons = addons
+        self.tax_rate = tax_rate
+        self.service_charge_rate = service_charge_rate
+        self.kitchen_display = kitchen_display
+
+    @classmethod
+    def load(cls, tenant):
+        """Load the snapshot of a tenant from its catalog and two small queries"""
+        catalog = menu_catalog.get(tenant)
+
+        items = {}
+        variants = {}
+        for item in catalog["items"]:
+            if not item["is_active"]:
+                continue
+            item_id = uuid.UUID(str(item["id"]))
+            items[item_id] = MenuEntry(
+                item_id,
+                item["name"],
+                Decimal(item["price"]),
+                category_id=uuid.UUID(str(item["category"])) if item["category"] else None,
+                # Left out of the catalog for uncategorized items
+                category_name=item.get("category_name") or "",
+                cost=Decimal(item["cost"]),
+            )
+            # The catalog only carries active variants
+            for variant in item["variants"]:
+                variant_id = uuid.UUID(str(variant["id"]))
+                variants[variant_id] = MenuEntry(
+                    variant_id,
+                    variant["name"],
+                    Decimal(variant["price"]),
+                    item_id,
+                    cost=Decimal(variant["cost"]),
+                )
+        addons = {}
+        for addon in catalog["addons"]:
+            if addon["is_active"]:
+                addon_id = uuid.UUID(str(addon["id"]))
+                addons[addon_id] = MenuEntry(
+                    addon_id, addon["name"], Decimal(addon["price"]), cost=Decimal(addon["cost"])
+                )
+
+        tax_rate = VatTax.objects.filter(tenant=tenant, is_active=True).aggregate(
+            rate=Sum("rate")
+        )["rate"]
+        # Tenants without a settings row get the model defaults
+        service_charge_rate, kitchen_display = (
+            TenantSetting.objects.filter(tenant=tenant)
+            .values_list("service_charge_percentage", "enable_kitchen_display")
+            .first()
+        ) or (0, TenantSetting._meta.get_field("enable_kitchen_display").default)
+        return cls(
+            items,
+            variants,
+            addons,
+            tax_rate=Decimal(tax_rate or 0),
+            service_charge_rate=Decimal(service_charge_rate or 0),
+            kitchen_display=kitchen_display,
+        )
@@ -0,0 +1,215 @@
+from decimal import Decimal
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from apps.core.cache import tenant_membership_cache
+from apps.core.models import TenantSetting
+from apps.core.testing import QueryCountAssertionsMixin, jwt_client
+from apps.kitchen.fanout import kitchen_routes
+from apps.tenants.models import Tenant, TenantUser
+from apps.menu.models import MenuItem, MenuItemAddon, MenuItemVariant
+from apps.pos.models import POSSession
+from apps.settings.counters.models import Counter
+from apps.settings.vat.models import VatTax
+from . import checkout
+from .models import Order, OrderLine, Payment
+
+User = get_user_model()
+
+
+class CheckoutTestCase(QueryCountAssertionsMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        tenant_membership_cache.clear()
+
+        self.user = User.objects.create_user(
+            email="cashier@example.com", password="password123"
+        )
+        self.tenant = Tenant.objects.create(
+            name="Test Restaurant", slug="test-restaurant", owner=self.user
+        )
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="cashier")
+        TenantSetting.objects.create(tenant=self.tenant, service_charge_percentage=10)
+        VatTax.objects.create(tenant=self.tenant, name="VAT", rate=5)
+        self.counter = Counter.objects.create(tenant=self.tenant, name="Main Counter")
+        self.session = POSSession.objects.create(
+            tenant=self.tenant, opened_by=self.user
+        )
+
+        self.pizza = MenuItem.objects.create(
+            tenant=self.tenant, name="Pizza", price=Decimal("10.00")
+        )
+        self.large = MenuItemVariant.objects.create(
+            menu_item=self.pizza, name="Large", price=Decimal("14.00")
+        )
+        self.cheese = MenuItemAddon.objects.create(
+            tenant=self.tenant, name="Extra Cheese", price=Decimal("1.50")
+        )
+
+        self.client = jwt_client(self.user)
+        # Warm the token, tenant membership, menu catalog and kitchen caches
+        self.client.get("/api/sales/orders/")
+        self.client.get("/api/menu/items/")
+        kitchen_routes.get(self.tenant.pk)
+
+    def _checkout(self, lines, **extra):
+        payload = {
+            "session": str(self.session.id),
+            "counter": str(self.counter.id),
+            "lines": lines,
+            **extra,
+        }
+        return self.client.post("/api/sales/orders/", payload, format="json")
+
+    def test_checkout_prices_lines(self):
+        """Test that lines, totals and payments are computed server-side"""
+        response = self._checkout(
+            [
+                {"menu_item": str(self.pizza.id), "quantity": 2},
+                {
+                    "menu_item": str(self.pizza.id),
+                    "variant": str(self.large.id),
+                    "addons": [str(self.cheese.id)],
+                    "quantity": 1,
+                    "unit_price": "15.50",
+                },
+            ],
+            payments=[{"method": "cash", "amount": "40.00"}],
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        data = response.json()
+        self.assertEqual(data["subtotal"], "35.50")
+        self.assertEqual(data["service_charge"], "3.55")
+        self.assertEqual(data["tax_total"], "1.78")
+        self.assertEqual(data["total"], "40.83")
+        self.assertEqual(data["status"], "open")
+        self.assertEqual(
+            [line["line_total"] for line in data["lines"]], ["20.00", "15.50"]
+        )
+        self.assertEqual(data["lines"][1]["variant_name"], "Large")
+        self.assertEqual(data["lines"][1]["addons"][0]["name"], "Extra Cheese")
+        self.assertEqual(Payment.objects.get().session, self.session)
+
+    def test_checkout_query_count_is_constant(self):
+        """Test that a 30-line ticket costs a handful of statements"""
+        lines = [
+            {
+                "menu_item": str(self.pizza.id),
+                "variant": str(self.large.id),
+                "addons": [str(self.cheese.id)],
+                "quantity": 1,
+            }
+            for _ in range(30)
+        ]
+        # 11 (one locks the session), plus the INSERTs of the sales rollups
+        # and kitchen tickets
+        with self.assertMaxQueries(13):
+            response = self._checkout(
+                lines, payments=[{"method": "card", "amount": "534.75"}]
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["status"], "paid")
+        self.assertEqual(OrderLine.objects.count(), 30)
+
+    def test_cash_overpayment_gives_change(self):
+        """Test that only the amount due is applied and the rest is change"""
+        # 2 x 10.00 + 10% service + 5% VAT = 23.00
+        response = self._checkout(
+            [{"menu_item": str(self.pizza.id), "quantity": 2}],
+            payments=[
+                {"method": "card", "amount": "3.00"},
+                {"method": "cash", "amount": "50.00"},
+            ],
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        data = response.json()
+        self.assertEqual((data["status"], data["amount_paid"]), ("paid", "23.00"))
+        self.assertEqual(
+            [(p["method"], p["amount"], p["change_given"]) for p in data["payments"]],
+            [("card", "3.00", "0.00"), ("cash", "20.00", "30.00")],
+        )
+        payment = Payment.objects.get(method="cash")
+        self.assertEqual((payment.amount, payment.change_given), (20, 30))
+
+    def test_checkout_rejects_card_overpayment(self):
+        """Test that card payments and payments after the total are rejected"""
+        response = self._checkout(
+            [{"menu_item": str(self.pizza.id), "quantity": 2}],
+            payments=[{"method": "card", "amount": "30.00"}],
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("0", response.json()["payments"])
+
+        response = self._checkout(
+            [{"menu_item": str(self.pizza.id), "quantity": 2}],
+            payments=[
+                {"method": "cash", "amount": "23.00"},
+                {"method": "cash", "amount": "5.00"},
+            ],
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()["payments"]), {"1"})
+        self.assertFalse(Order.objects.exists())
+
+    def test_checkout_rejects_stale_price(self):
+        """Test that a price the terminal displayed must match the menu"""
+        response = self._checkout(
+            [{"menu_item": str(self.pizza.id), "quantity": 1, "unit_price": "9.00"}]
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("0", response.json()["lines"])
+        self.assertFalse(Order.objects.exists())
+
+    def test_checkout_rejects_inactive_item_and_foreign_variant(self):
+        """Test that unavailable items and mismatched variants are rejected"""
+        burger = MenuItem.objects.create(
+            tenant=self.tenant, name="Burger", price=8, is_active=False
+        )
+        double = MenuItemVariant.objects.create(menu_item=burger, name="Double", price=12)
+        response = self._checkout(
+            [
+                {"menu_item": str(burger.id), "quantity": 1},
+                {
+                    "menu_item": str(self.pizza.id),
+                    "variant": str(double.id),
+                    "quantity": 1,
+                },
+            ]
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()["lines"]), {"0", "1"})
+
+    def test_checkout_rejects_closed_session(self):
+        """Test that orders cannot be rung up on a closed session"""
+        self.session.status = "closed"
+        self.session.save()
+        response = self._checkout([{"menu_item": str(self.pizza.id), "quantity": 1}])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("session", response.json())
+
+    def test_checkout_rechecks_session_before_writing(self):
+        """Test that a session closed after validation takes no payments"""
+        apply_payments = checkout.apply_payments
+
+        def close_then_apply(*args):
+            POSSession.objects.filter(pk=self.session.pk).update(status="closed")
+            return apply_payments(*args)
+
+        with mock.patch.object(checkout, "apply_payments", close_then_apply):
+            response = self._checkout(
+                [{"menu_item": str(self.pizza.id), "quantity": 1}],
+                payments=[{"method": "cash", "amount": "5.00"}],
+            )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("session", response.json())
+        self.assertFalse(Order.objects.exists())
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.cash_sales, 0)
+
+    def test_order_list_queries(self):
+        """Test that orders load with their lines and payments in 3 queries"""
+        for _ in range(3):
+            self._checkout([{"menu_item": str(self.pizza.id), "quantity": 1}])
+        response = self.assertListQueries(self.client, "/api/sales/orders/", 3)
+        self.assertEqual(len(response.json()), 3)
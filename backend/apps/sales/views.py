@@ -0,0 +1,49 @@
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.response import Response
+
+from apps.core.mixins import RelatedDataMixin
+from apps.core.permissions import IsTenantUser
+from apps.core.timing import TimedViewMixin, timed
+from .checkout import checkout
+from .models import Order
+from .serializers import CheckoutSerializer, OrderSerializer
+
+
+class OrderViewSet(
+    TimedViewMixin,
+    RelatedDataMixin,
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    ViewSet for the current tenant's orders
+
+    - List: Get all orders, newest first
+    - Create: Check out a ticket (priced server-side, see apps.sales.checkout)
+    - Retrieve: Get an order with its lines and payments
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsTenantUser]
+
+    prefetch_related_lookups = ("lines", "payments")
+
+    @timed("queryset")
+    def get_queryset(self):
+        if hasattr(self.request, "tenant"):
+            return self.with_related_data(
+                Order.objects.filter(tenant=self.request.tenant)
+            )
+        return Order.objects.none()
+
+    def get_serializer_class(self):
+        if self.action == "create":
+            return CheckoutSerializer
+        return OrderSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        order = checkout(request.tenant, request.user, serializer.validated_data)
+        return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
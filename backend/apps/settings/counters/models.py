@@ -29,6 +29,12 @@ class Counter(models.Model):
         verbose_name_plural = "Counters"
         ordering = ["name"]
         unique_together = ["tenant", "name"]
+        indexes = [
+            # Delta sync (apps.sync)
+            models.Index(
+                fields=["tenant", "updated_at"], name="counter_tenant_updated_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.tenant.name})"
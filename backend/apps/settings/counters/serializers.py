@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 from .models import Counter
 from apps.menu.models import MenuItem
@@ -25,8 +26,19 @@ class MenuItemDetailSerializer(serializers.ModelSerializer):
         ]
 
 
+def counter_items_prefetch():
+    """Prefetch of a counter's menu items together with their categories"""
+    return Prefetch("items", queryset=MenuItem.objects.select_related("category"))
+
+
 class CounterSerializer(serializers.ModelSerializer):
-    """Serializer for Counter model"""
+    """
+    Serializer for Counter model
+
+    All counters of a tenant share the same VAT taxes; views pass them once
+    as context["vat_taxes"] instead of letting every row query them.
+    Querysets should prefetch items with counter_items_prefetch().
+    """
 
     # Keep items as a write-only field
     items = serializers.PrimaryKeyRelatedField(
@@ -41,8 +53,13 @@ class CounterSerializer(serializers.ModelSerializer):
 
     def get_vat_taxes(self, obj):
         """Get active VAT taxes for the counter's tenant"""
-        vat_taxes = VatTax.objects.filter(tenant=obj.tenant, is_active=True)
-        return VatTaxSerializer(vat_taxes, many=True).data
+        vat_taxes = self.context.get("vat_taxes")
+        if vat_taxes is None:
+            vat_taxes = VatTaxSerializer(
+                VatTax.objects.filter(tenant_id=obj.tenant_id, is_active=True),
+                many=True,
+            ).data
+        return vat_taxes
 
     class Meta:
         model = Counter
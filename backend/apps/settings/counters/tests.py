@@ -1,10 +1,15 @@
 from django.test import TestCase
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
 from apps.tenants.models import Tenant, TenantUser
 from apps.authentication.models import User
+from apps.core.cache import tenant_membership_cache
+from apps.core.testing import QueryCountAssertionsMixin, jwt_client
+from apps.menu.models import Category, MenuItem
+from apps.settings.vat.models import VatTax
 from .models import Counter
 
 
@@ -116,3 +121,56 @@ class CounterAPITest(APITestCase):
         response = self.client.delete(f"/api/settings/counters/{counter.id}/")
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Counter.objects.count(), 0)
+
+
+class CounterListQueryCountTest(QueryCountAssertionsMixin, TestCase):
+    """Counter listing must not query VAT taxes or items per counter"""
+
+    def setUp(self):
+        cache.clear()
+        tenant_membership_cache.clear()
+
+        self.user = User.objects.create_user(
+            email="test@example.com", password="password123"
+        )
+        self.tenant = Tenant.objects.create(
+            name="Test Restaurant", slug="test-restaurant", owner=self.user
+        )
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="owner")
+        VatTax.objects.create(tenant=self.tenant, name="Standard VAT", rate=15)
+        VatTax.objects.create(
+            tenant=self.tenant, name="Old VAT", rate=10, is_active=False
+        )
+        self.category = Category.objects.create(tenant=self.tenant, name="Drinks")
+
+        self.client = jwt_client(self.user)
+        # Warm the token and tenant membership caches
+        self.client.get("/api/settings/counters/")
+
+    def _add_counters(self, count, items_per_counter):
+        start = Counter.objects.count()
+        for index in range(start, start + count):
+            counter = Counter.objects.create(tenant=self.tenant, name=f"Counter {index}")
+            for item_index in range(items_per_counter):
+                counter.items.add(
+                    MenuItem.objects.create(
+                        tenant=self.tenant,
+                        category=self.category,
+                        name=f"Item {index}-{item_index}",
+                        price=5,
+                    )
+                )
+
+    def test_list_queries_are_constant(self):
+        """Test that counters, items and VAT taxes load in constant queries"""
+        self._add_counters(2, 2)
+        response = self.assertListQueries(self.client, "/api/settings/counters/", 3)
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(response.data[0]["item_details"][0]["category_name"], "Drinks")
+        self.assertEqual(
+            [tax["name"] for tax in response.data[0]["vat_taxes"]], ["Standard VAT"]
+        )
+
+        self._add_counters(5, 4)
+        response = self.assertListQueries(self.client, "/api/settings/counters/", 3)
+        self.assertEqual(len(response.data), 7)
@@ -1,12 +1,16 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from .models import Counter
-from .serializers import CounterSerializer
+from .serializers import CounterSerializer, counter_items_prefetch
 from apps.menu.models import MenuItem
+from apps.settings.vat.models import VatTax
+from apps.settings.vat.serializers import VatTaxSerializer
+from apps.core.mixins import RelatedDataMixin
 from apps.core.permissions import IsTenantUser, IsTenantAdmin, IsTenantOwner
+from apps.core.timing import TimedViewMixin, timed
 
 
-class CounterViewSet(viewsets.ModelViewSet):
+class CounterViewSet(TimedViewMixin, RelatedDataMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing restaurant counters (selling points)
 
@@ -23,18 +27,38 @@ class CounterViewSet(viewsets.ModelViewSet):
     serializer_class = CounterSerializer
     permission_classes = [permissions.IsAuthenticated, IsTenantUser]
 
+    # Lists may read from a replica (see apps.core.replicas)
+    replica_actions = ("list",)
+
+    # Related data read by CounterSerializer.item_details
+    prefetch_related_lookups = (counter_items_prefetch,)
+
+    @timed("queryset")
     def get_queryset(self):
         """
         Get counters for the current tenant
         """
         if hasattr(self.request, "tenant"):
-            # Use select_related to prefetch tenant to optimize serialization
-            # This helps when accessing the tenant's VAT taxes in the serializer
-            return Counter.objects.filter(tenant=self.request.tenant).select_related(
-                "tenant"
+            return self.with_related_data(
+                Counter.objects.filter(tenant=self.request.tenant)
             )
         return Counter.objects.none()
 
+    def get_serializer_context(self):
+        """
+        Share the tenant's active VAT taxes with every serialized counter,
+        loading them once per request
+        """
+        context = super().get_serializer_context()
+        if hasattr(self.request, "tenant"):
+            if not hasattr(self, "_vat_taxes"):
+                self._vat_taxes = VatTaxSerializer(
+                    VatTax.objects.filter(tenant=self.request.tenant, is_active=True),
+                    many=True,
+                ).data
+            context["vat_taxes"] = self._vat_taxes
+        return context
+
     def perform_create(self, serializer):
         """
         Create a new counter for the current tenant
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('settings', '0003_vattax'),
+        ('tenants', '0002_tenantuser_tenant_user_tenant_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vattax',
+            index=models.Index(fields=['tenant', 'name'], name='vat_tax_tenant_name_idx'),
+        ),
+    ]
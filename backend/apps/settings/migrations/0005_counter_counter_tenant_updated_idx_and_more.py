@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0005_category_menu_category_tenant_upd_idx_and_more'),
+        ('settings', '0004_vattax_vat_tax_tenant_name_idx'),
+        ('tenants', '0002_tenantuser_tenant_user_tenant_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='counter',
+            index=models.Index(fields=['tenant', 'updated_at'], name='counter_tenant_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vattax',
+            index=models.Index(fields=['tenant', 'updated_at'], name='vat_tax_tenant_updated_idx'),
+        ),
+    ]
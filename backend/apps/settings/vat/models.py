@@ -31,6 +31,14 @@ class VatTax(models.Model):
         ordering = ["name"]
         verbose_name = "VAT Tax"
         verbose_name_plural = "VAT Taxes"
+        indexes = [
+            # Keyset pagination over the default ordering
+            models.Index(fields=["tenant", "name"], name="vat_tax_tenant_name_idx"),
+            # Delta sync (apps.sync)
+            models.Index(
+                fields=["tenant", "updated_at"], name="vat_tax_tenant_updated_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.rate}%)"
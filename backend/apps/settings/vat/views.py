@@ -4,14 +4,16 @@ from rest_framework.response import Response
 from .models import VatTax
 from .serializers import VatTaxSerializer
 from apps.core.permissions import IsTenantUser, IsTenantAdmin, IsTenantOwner
+from apps.core.timing import TimedViewMixin, timed
 
 
-class VatTaxViewSet(viewsets.ModelViewSet):
+class VatTaxViewSet(TimedViewMixin, viewsets.ModelViewSet):
     """ViewSet for managing VAT tax data"""
 
     permission_classes = [permissions.IsAuthenticated, IsTenantUser]
     serializer_class = VatTaxSerializer
 
+    @timed("queryset")
     def get_queryset(self):
         """Return objects for the current authenticated tenant only"""
         if hasattr(self.request, "tenant"):
@@ -52,6 +52,10 @@ class StaffProfile(models.Model):
         verbose_name = 'Staff Profile'
         verbose_name_plural = 'Staff Profiles'
         unique_together = ('tenant', 'email')
+        indexes = [
+            # Keyset pagination of a tenant's staff
+            models.Index(fields=['tenant', 'name'], name='staff_profile_tenant_name_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.get_position_display()} at {self.tenant.name}"
@@ -6,9 +6,10 @@ from django.db import transaction
 from .models import StaffProfile
 from .serializers import StaffProfileSerializer
 from apps.core.permissions import IsTenantUser, IsTenantManager, IsTenantAdmin
+from apps.core.timing import TimedViewMixin, timed
 
 
-class StaffProfileViewSet(viewsets.ModelViewSet):
+class StaffProfileViewSet(TimedViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing staff profiles in a tenant context.
     
@@ -16,7 +17,10 @@ class StaffProfileViewSet(viewsets.ModelViewSet):
     """
     serializer_class = StaffProfileSerializer
     permission_classes = [permissions.IsAuthenticated, IsTenantManager]
+    # Cursor pagination order (see apps.core.pagination)
+    cursor_ordering = ("name",)
     
+    @timed("queryset")
     def get_queryset(self):
         """Return staff profiles for the current tenant only."""
         if hasattr(self.request, "tenant"):
@@ -0,0 +1,146 @@
+"""
+Delta sync of a tenant's menu and settings
+
+Clients send the version they last synced (`since`) and receive only the
+rows created, updated or deleted after it. A version is a timestamp in
+microseconds; every synced model has an index on (tenant, updated_at), so
+the work done scales with the number of changes, not with catalog size.
+
+Changes are upserts keyed by id, so a row delivered twice is harmless. This
+lets each sync look back OVERLAP_SECONDS before `since` to pick up rows
+whose transaction committed after a concurrent sync had read the tables.
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.management.table.models import RestaurantTable
+from apps.management.table.serializers import RestaurantTableSerializer
+from apps.menu.models import Category, MenuItem, MenuItemVariant
+from apps.menu.serializers import CategorySerializer
+from apps.pos.bootstrap import serialize_counters
+from apps.settings.counters.models import Counter
+from apps.settings.vat.models import VatTax
+from apps.settings.vat.serializers import VatTaxSerializer
+from .models import Tombstone
+from .serializers import SyncMenuItemSerializer, SyncVariantSerializer
+
+
+DEFAULTS = {
+    "OVERLAP_SECONDS": 5,
+    "TOMBSTONE_RETENTION_DAYS": 30,
+}
+
+# A synced model: `queryset(tenant)` selects the tenant's rows and
+# `serialize(queryset, context)` turns changed rows into payload dicts
+SyncSource = namedtuple("SyncSource", "name model queryset serialize")
+
+
+def _serializer(serializer_class):
+    return lambda queryset, context: serializer_class(
+        queryset, many=True, context=context
+    ).data
+
+
+SOURCES = [
+    SyncSource(
+        "categories",
+        Category,
+        lambda tenant: Category.objects.filter(tenant=tenant),
+        _serializer(CategorySerializer),
+    ),
+    SyncSource(
+        "items",
+        MenuItem,
+        lambda tenant: MenuItem.objects.filter(tenant=tenant).select_related("category"),
+        _serializer(SyncMenuItemSerializer),
+    ),
+    SyncSource(
+        "variants",
+        MenuItemVariant,
+        lambda tenant: MenuItemVariant.objects.filter(menu_item__tenant=tenant),
+        _serializer(SyncVariantSerializer),
+    ),
+    SyncSource(
+        "counters",
+        Counter,
+        lambda tenant: Counter.objects.filter(tenant=tenant),
+        lambda queryset, context: serialize_counters(queryset),
+    ),
+    SyncSource(
+        "vat_taxes",
+        VatTax,
+        lambda tenant: VatTax.objects.filter(tenant=tenant),
+        _serializer(VatTaxSerializer),
+    ),
+    SyncSource(
+        "tables",
+        RestaurantTable,
+        lambda tenant: RestaurantTable.objects.filter(tenant=tenant),
+        _serializer(RestaurantTableSerializer),
+    ),
+]
+
+SOURCE_NAMES = {source.model: source.name for source in SOURCES}
+
+
+def get_sync_settings():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "SYNC", {}))
+    return config
+
+
+def to_version(moment):
+    """Sync version of a datetime: microseconds since the epoch"""
+    return int(moment.timestamp() * 1_000_000)
+
+
+def from_version(version):
+    """Datetime of a sync version; ValueError if no datetime has it"""
+    try:
+        return datetime.fromtimestamp(version / 1_000_000, tz=dt_timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        raise ValueError(f"Sync version out of range: {version}")
+
+
+def get_changes(tenant, since=None, context=None):
+    """
+    Rows of a tenant changed or deleted after version `since`
+
+    Returns a full snapshot with "reset": true when `since` is missing or
+    older than the tombstone retention, since deletions before that point
+    are no longer known, or newer than the current version, which this
+    endpoint never handed out; clients then replace their local copy.
+    """
+    config = get_sync_settings()
+    context = context or {}
+    now = timezone.now()
+    # Taken before reading, so rows written meanwhile are sent again next time
+    version = to_version(now)
+
+    retention = timedelta(days=config["TOMBSTONE_RETENTION_DAYS"])
+    reset = (
+        since is None or since > version or from_version(since) < now - retention
+    )
+    changed_after = (
+        None if reset else from_version(since) - timedelta(seconds=config["OVERLAP_SECONDS"])
+    )
+
+    changes = {}
+    for source in SOURCES:
+        queryset = source.queryset(tenant)
+        if changed_after is not None:
+            queryset = queryset.filter(updated_at__gt=changed_after)
+        changes[source.name] = source.serialize(queryset, context)
+
+    deleted = {source.name: [] for source in SOURCES}
+    if changed_after is not None:
+        for name, object_id in Tombstone.objects.filter(
+            tenant=tenant, deleted_at__gt=changed_after
+        ).values_list("source", "object_id"):
+            deleted[name].append(str(object_id))
+
+    return {"version": version, "reset": reset, "changes": changes, "deleted": deleted}
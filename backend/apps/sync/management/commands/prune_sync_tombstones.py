@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.sync.changes import get_sync_settings
+from apps.sync.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = 'Deletes sync tombstones older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Retention in days (defaults to SYNC["TOMBSTONE_RETENTION_DAYS"])')
+
+    def handle(self, *args, **options):
+        days = options.get('days') or get_sync_settings()['TOMBSTONE_RETENTION_DAYS']
+        cutoff = timezone.now() - timedelta(days=days)
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} tombstone(s) older than {days} day(s)'))
@@ -0,0 +1,32 @@
+from django.db import models
+from django.utils import timezone
+from apps.tenants.models import Tenant
+import uuid
+
+
+class Tombstone(models.Model):
+    """
+    Marker left behind by a deleted row, so delta sync clients learn about
+    deletions as well as changes
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tenant = models.ForeignKey(
+        Tenant, on_delete=models.CASCADE, related_name="sync_tombstones"
+    )
+    # Sync source name, e.g. "items" (see apps.sync.changes.SOURCES)
+    source = models.CharField(max_length=30)
+    object_id = models.UUIDField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Tombstone"
+        verbose_name_plural = "Tombstones"
+        indexes = [
+            models.Index(
+                fields=["tenant", "deleted_at"], name="sync_tombstone_tenant_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.source} {self.object_id} deleted at {self.deleted_at}"
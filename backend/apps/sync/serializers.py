@@ -0,0 +1,19 @@
+from apps.menu.serializers import MenuItemSerializer, MenuItemVariantSerializer
+
+
+class SyncMenuItemSerializer(MenuItemSerializer):
+    """Menu item as sent by delta sync; variants are synced separately"""
+
+    variants = None
+
+    class Meta(MenuItemSerializer.Meta):
+        fields = [
+            field for field in MenuItemSerializer.Meta.fields if field != "variants"
+        ]
+
+
+class SyncVariantSerializer(MenuItemVariantSerializer):
+    """Menu item variant as sent by delta sync, with its parent item"""
+
+    class Meta(MenuItemVariantSerializer.Meta):
+        fields = ["menu_item"] + MenuItemVariantSerializer.Meta.fields
@@ -0,0 +1,70 @@
+from django.db.models.signals import m2m_changed, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.core.bulk import current_bulk_batch
+from apps.menu.signals import get_menu_tenant_id, get_menu_tenant_ids
+from apps.settings.counters.models import Counter
+from apps.tenants.models import Tenant
+from .changes import SOURCE_NAMES
+from .models import Tombstone
+
+
+def create_tombstones(deleted):
+    """Tombstones of many deleted (instance, pk) pairs in one insert"""
+    instances = [instance for instance, _ in deleted]
+    Tombstone.objects.bulk_create(
+        Tombstone(
+            tenant_id=tenant_id, source=SOURCE_NAMES[type(instance)], object_id=pk
+        )
+        for (instance, pk), tenant_id in zip(deleted, get_menu_tenant_ids(instances))
+        if tenant_id is not None
+    )
+
+
+def record_tombstone(sender, instance, origin=None, **kwargs):
+    """Remember a deleted synced row for clients that still hold it"""
+    if isinstance(origin, Tenant):
+        # The whole tenant is going, tombstones included
+        return
+    batch = current_bulk_batch()
+    if batch is not None:
+        # The collector clears instance.pk once the delete is done
+        batch.defer("sync-tombstones", create_tombstones, (instance, instance.pk))
+        return
+
+    tenant_id = get_menu_tenant_id(instance)
+    if tenant_id is None:
+        # Parent already deleted; clients drop children with their parent
+        return
+    Tombstone.objects.create(
+        tenant_id=tenant_id, source=SOURCE_NAMES[sender], object_id=instance.pk
+    )
+
+
+for model in SOURCE_NAMES:
+    post_delete.connect(
+        record_tombstone, sender=model, dispatch_uid=f"sync-tombstone-{model._meta.label}"
+    )
+
+
+@receiver(m2m_changed, sender=Counter.items.through)
+def touch_counters_on_item_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Counter item assignments changed: bump the counters' updated_at so delta
+    sync sends them again with their new item ids
+    """
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            Counter.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+        return
+
+    # Changed from the menu item side: pk_set holds counter ids, except on
+    # clear, where the counters are only known before the links go away
+    if action in ("post_add", "post_remove"):
+        counters = Counter.objects.filter(pk__in=pk_set)
+    elif action == "pre_clear":
+        counters = Counter.objects.filter(items=instance)
+    else:
+        return
+    counters.update(updated_at=timezone.now())
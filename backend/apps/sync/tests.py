@@ -0,0 +1,105 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from apps.core.cache import tenant_membership_cache
+from apps.core.testing import QueryCountAssertionsMixin, jwt_client
+from apps.tenants.models import Tenant, TenantUser
+from apps.menu.models import Category, MenuItem, MenuItemVariant
+from apps.management.table.models import RestaurantTable
+from apps.settings.counters.models import Counter
+from .changes import from_version, to_version
+
+User = get_user_model()
+
+
+class SyncChangesViewTestCase(QueryCountAssertionsMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        tenant_membership_cache.clear()
+
+        self.user = User.objects.create_user(
+            email="cashier@example.com", password="password123"
+        )
+        self.tenant = Tenant.objects.create(
+            name="Test Restaurant", slug="test-restaurant", owner=self.user
+        )
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="cashier")
+        self.category = Category.objects.create(tenant=self.tenant, name="Pizza")
+        self.items = [
+            MenuItem.objects.create(
+                tenant=self.tenant, category=self.category, name=f"Item {i}", price=10
+            )
+            for i in range(5)
+        ]
+        self.counter = Counter.objects.create(tenant=self.tenant, name="Main Counter")
+        self.table = RestaurantTable.objects.create(tenant=self.tenant, number="T1")
+
+        self.client = jwt_client(self.user)
+
+    def _sync(self, since=None):
+        url = "/api/sync/changes/"
+        if since is not None:
+            url += f"?since={since}"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def _age_rows(self):
+        """Move existing rows out of the overlap window"""
+        past = from_version(self._sync()["version"]) - timedelta(minutes=10)
+        for model in (Category, MenuItem, MenuItemVariant, Counter, RestaurantTable):
+            model.objects.update(updated_at=past)
+        return to_version(past + timedelta(minutes=1))
+
+    def test_first_sync_is_a_full_reset(self):
+        """Test that a client without a version receives everything"""
+        data = self._sync()
+        self.assertTrue(data["reset"])
+        self.assertEqual(len(data["changes"]["items"]), 5)
+        self.assertEqual(len(data["changes"]["tables"]), 1)
+
+    def test_only_changes_and_deletions_are_returned(self):
+        """Test that a delta contains changed rows and tombstones only"""
+        since = self._age_rows()
+
+        self.items[0].price = 12
+        self.items[0].save()
+        MenuItemVariant.objects.create(menu_item=self.items[1], name="Large", price=14)
+        deleted_id = str(self.items[2].id)
+        self.items[2].delete()
+        self.counter.items.add(self.items[3])
+
+        data = self._sync(since)
+        self.assertFalse(data["reset"])
+        changes = data["changes"]
+        self.assertEqual([i["id"] for i in changes["items"]], [str(self.items[0].id)])
+        self.assertEqual(changes["variants"][0]["menu_item"], str(self.items[1].id))
+        self.assertEqual(changes["counters"][0]["item_ids"], [str(self.items[3].id)])
+        self.assertEqual(changes["categories"], [])
+        self.assertEqual(changes["tables"], [])
+        self.assertEqual(data["deleted"]["items"], [deleted_id])
+        self.assertGreater(data["version"], since)
+
+    def test_delta_queries_do_not_grow_with_catalog(self):
+        """Test that an empty delta costs one query per source"""
+        since = self._age_rows()
+        with self.assertMaxQueries(8):
+            data = self._sync(since)
+        self.assertEqual(sum(len(rows) for rows in data["changes"].values()), 0)
+
+    def test_expired_version_resets(self):
+        """Test that a version older than tombstone retention forces a reset"""
+        old = to_version(from_version(self._sync()["version"]) - timedelta(days=365))
+        self.assertTrue(self._sync(old)["reset"])
+
+    def test_future_version_resets(self):
+        """Test that a version this endpoint has not handed out yet forces a reset"""
+        future = to_version(from_version(self._sync()["version"]) + timedelta(days=1))
+        self.assertTrue(self._sync(future)["reset"])
+
+    def test_invalid_version_is_rejected(self):
+        """Test that a malformed or out of range version is a 400"""
+        for since in ("yesterday", "99999999999999999999", "253402300800000000"):
+            response = self.client.get(f"/api/sync/changes/?since={since}")
+            self.assertEqual(response.status_code, 400, since)
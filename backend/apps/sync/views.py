@@ -0,0 +1,37 @@
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.core.permissions import IsTenantUser
+from apps.core.timing import TimedViewMixin
+from .changes import from_version, get_changes
+
+
+class SyncChangesView(TimedViewMixin, APIView):
+    """
+    Menu and settings rows changed since a client's last sync
+
+    GET ?since=<version> returns the categories, menu items, variants,
+    counters, VAT taxes and tables created or updated after that version,
+    plus the ids of deleted rows, and the version to send next time. Without
+    `since` (or with one past tombstone retention or in the future) the full
+    data set is returned with "reset": true.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsTenantUser]
+
+    def get(self, request, *args, **kwargs):
+        since = request.query_params.get("since")
+        if since in (None, ""):
+            since = None
+        else:
+            try:
+                since = int(since)
+                from_version(since)
+            except ValueError:
+                raise ValidationError({"since": "Must be a version returned by this endpoint."})
+            if since < 0:
+                raise ValidationError({"since": "Must be a version returned by this endpoint."})
+
+        return Response(get_changes(request.tenant, since, {"request": request}))
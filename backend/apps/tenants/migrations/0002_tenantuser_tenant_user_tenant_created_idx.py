@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tenantuser',
+            index=models.Index(fields=['tenant', 'created_at'], name='tenant_user_tenant_created_idx'),
+        ),
+    ]
@@ -69,6 +69,10 @@ class TenantUser(models.Model):
         verbose_name = 'Tenant User'
         verbose_name_plural = 'Tenant Users'
         unique_together = ('tenant', 'user')
+        indexes = [
+            # Keyset pagination of a tenant's users
+            models.Index(fields=['tenant', 'created_at'], name='tenant_user_tenant_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user} - {self.tenant} ({self.role})"
@@ -10,5 +10,5 @@ urlpatterns = [
     path('', TenantListView.as_view(), name='tenant-list'),
     path('<uuid:pk>/', TenantDetailView.as_view(), name='tenant-detail'),
     path('<uuid:tenant_id>/users/', TenantUserListView.as_view(), name='tenant-user-list'),
-    path('<uuid:tenant_id>/users/<uuid:pk>/', TenantUserDetailView.as_view(), name='tenant-user-detail'),
+    path('<uuid:tenant_id>/users/<int:pk>/', TenantUserDetailView.as_view(), name='tenant-user-detail'),
 ]
@@ -6,16 +6,18 @@ from django.utils.text import slugify
 from .models import Tenant, TenantUser
 from .serializers import TenantSerializer, TenantUserSerializer
 from apps.core.permissions import IsTenantOwner, IsTenantAdmin, IsTenantUser
+from apps.core.timing import TimedViewMixin, timed
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
 
-class TenantListView(generics.ListCreateAPIView):
+class TenantListView(TimedViewMixin, generics.ListCreateAPIView):
     """List all tenants or create a new tenant"""
     serializer_class = TenantSerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    @timed("queryset")
     def get_queryset(self):
         """Return only tenants that the user belongs to"""
         return Tenant.objects.filter(
@@ -38,11 +40,12 @@ class TenantListView(generics.ListCreateAPIView):
         )
 
 
-class TenantDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TenantDetailView(TimedViewMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a tenant"""
     serializer_class = TenantSerializer
     permission_classes = [permissions.IsAuthenticated, IsTenantOwner]
     
+    @timed("queryset")
     def get_queryset(self):
         """Return only tenants that the user belongs to"""
         return Tenant.objects.filter(
@@ -51,15 +54,18 @@ class TenantDetailView(generics.RetrieveUpdateDestroyAPIView):
         )
 
 
-class TenantUserListView(generics.ListCreateAPIView):
+class TenantUserListView(TimedViewMixin, generics.ListCreateAPIView):
     """List all users in a tenant or add a new user to tenant"""
     serializer_class = TenantUserSerializer
     permission_classes = [permissions.IsAuthenticated, IsTenantAdmin]
+    # Cursor pagination order (see apps.core.pagination)
+    cursor_ordering = ('created_at',)
     
+    @timed("queryset")
     def get_queryset(self):
         """Return only users of the specified tenant"""
         tenant_id = self.kwargs['tenant_id']
-        return TenantUser.objects.filter(tenant_id=tenant_id)
+        return TenantUser.objects.filter(tenant_id=tenant_id).select_related('user')
     
     def perform_create(self, serializer):
         """When adding a user to tenant, set tenant from URL"""
@@ -94,11 +100,12 @@ class TenantUserListView(generics.ListCreateAPIView):
             raise ValidationError({"user": "User email is required"})
 
 
-class TenantUserDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TenantUserDetailView(TimedViewMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or remove a user from tenant"""
     serializer_class = TenantUserSerializer
     permission_classes = [permissions.IsAuthenticated, IsTenantAdmin]
     
+    @timed("queryset")
     def get_queryset(self):
         """Return only users of the specified tenant"""
         tenant_id = self.kwargs['tenant_id']
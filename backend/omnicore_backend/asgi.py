@@ -2,6 +2,9 @@
 ASGI config for omnicore_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP requests go to Django; WebSocket connections (see routing.py) are
+authenticated by apps.core.websocket.TenantAuthMiddleware and served by
+Django Channels consumers.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -13,4 +16,17 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'omnicore_backend.settings')
 
-application = get_asgi_application()
+# Initialize Django before importing code that uses models
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+
+from apps.core.websocket import TenantAuthMiddleware  # noqa: E402
+from .routing import websocket_urlpatterns  # noqa: E402
+
+# Sockets authenticate with a bearer token, never cookies, so there is no
+# ambient credential to protect with an Origin check
+application = ProtocolTypeRouter({
+    'http': django_asgi_app,
+    'websocket': TenantAuthMiddleware(URLRouter(websocket_urlpatterns)),
+})
@@ -0,0 +1,11 @@
+"""
+WebSocket URL configuration for omnicore_backend project (see asgi.py)
+"""
+
+from apps.kitchen.routing import websocket_urlpatterns as kitchen_patterns
+from apps.management.table.routing import websocket_urlpatterns as table_patterns
+
+websocket_urlpatterns = [
+    *table_patterns,
+    *kitchen_patterns,
+]
@@ -22,6 +22,7 @@ from django.conf.urls.static import static
 from rest_framework import permissions
 from rest_framework_simplejwt.views import TokenVerifyView
 from django.views.generic import RedirectView
+from apps.core.views import ServerTimingMetricsView
 
 urlpatterns = [
     path("admin/", admin.site.urls),  # API endpoints
@@ -31,6 +32,18 @@ urlpatterns = [
     path("api/management/", include("apps.management.urls")),
     path("api/settings/", include("apps.settings.urls")),
     path("api/staff/", include("apps.staff.urls")),
+    path("api/pos/", include("apps.pos.urls")),
+    path("api/sales/", include("apps.sales.urls")),
+    path("api/sync/", include("apps.sync.urls")),
+    path("api/exports/", include("apps.exports.urls")),
+    path("api/kitchen/", include("apps.kitchen.urls")),
+    path("api/notifications/", include("apps.core.urls")),
+    path("api/reports/", include("apps.reports.urls")),
+    path(
+        "api/metrics/timing/",
+        ServerTimingMetricsView.as_view(),
+        name="server-timing-metrics",
+    ),
     # JWT token verify endpoint
     path("api/token/verify/", TokenVerifyView.as_view(), name="token_verify"),
     # Root URL redirects to admin